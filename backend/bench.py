@@ -0,0 +1,1039 @@
+#!/usr/bin/env python3
+"""
+DUCK-WOD – Backend micro-benchmarks (offline)
+
+Usage (from backend/):
+    python bench.py                 # run all
+    python bench.py rotation        # run one
+    python bench.py record          # download the pages below into bench_pages/ (once)
+
+Works on the committed data files (data/workouts.json, data/special_cache.json) and on
+pages recorded into backend/bench_pages/ (git-ignored). Only `record` touches the network.
+"""
+import contextlib
+import hashlib
+import io
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+except Exception:
+    pass
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+PAGES_DIR = Path(__file__).parent / 'bench_pages'
+
+# Recorded pages: file name → URL (fetched by `python bench.py record`)
+PAGES = {
+    'heroes.html':       'https://www.crossfit.com/heroes',
+    'crossfit_com.html': 'https://www.crossfit.com/{yymmdd}',
+    'myleo.html':        'https://myleo.de/en/wods/{iso}/',
+    'restoration.html':  'https://crossfitrestoration.com/wod-{month}-{day}-{year}/',
+    'tonbridge.html':    'https://crossfittonbridge.co.uk/wod/',
+    'cf1013.html':       'https://www.crossfit1013.com/wod',
+}
+
+
+def _load_json(name, default):
+    try:
+        with open(DATA_DIR / name, encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+
+def _timeit(fn, repeat=5):
+    """Best-of-`repeat` wall time in ms."""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        dt = (time.perf_counter() - t0) * 1000
+        best = dt if best is None else min(best, dt)
+    return best
+
+
+def _pages():
+    """{name: bytes} of the recorded pages that exist."""
+    if not PAGES_DIR.exists():
+        return {}
+    return {p.name: p.read_bytes() for p in sorted(PAGES_DIR.glob('*.html'))}
+
+
+def _page_lines(raw):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(raw, 'html.parser')
+    for tag in soup.find_all(['script', 'style']):
+        tag.decompose()
+    return [l.strip() for l in soup.get_text(separator='\n').split('\n') if l.strip()]
+
+
+def _corpus_lines():
+    """Every line of the 14-day data + warehouses + recorded pages."""
+    lines = []
+    for wods in (_load_json('workouts.json', {}).get('workouts') or {}).values():
+        for w in wods:
+            for sec in w.get('sections') or []:
+                lines.append(sec.get('title') or '')
+                lines.extend(l for l in sec.get('lines') or [] if l)
+    special = _load_json('special_cache.json', {})
+    for key in ('heroes', 'benchmarks', 'open'):
+        for it in special.get(key) or []:
+            lines.append(it.get('name') or '')
+            lines.extend(it.get('lines') or [])
+            lines.extend((it.get('hero_story') or '').split('\n'))
+    for raw in _pages().values():
+        lines.extend(_page_lines(raw))
+    return [l for l in lines if l]
+
+
+def record():
+    import requests
+    now = datetime.now() - timedelta(days=1)
+    fields = {
+        'yymmdd': now.strftime('%y%m%d'), 'iso': now.strftime('%Y-%m-%d'),
+        'month': now.strftime('%B').lower(), 'day': now.day, 'year': now.year,
+    }
+    PAGES_DIR.mkdir(exist_ok=True)
+    for name, url in PAGES.items():
+        url = url.format(**fields)
+        try:
+            r = requests.get(url, timeout=20, headers={'User-Agent': 'Mozilla/5.0'})
+            (PAGES_DIR / name).write_bytes(r.content)
+            print(f"  ✅ {name}: {url} ({len(r.content) // 1024} KB, HTTP {r.status_code})")
+        except Exception as e:
+            print(f"  ❌ {name}: {url} ({e})")
+
+
+# ── rotation ──────────────────────────────────────────────────────────────────
+
+def _legacy_pick(entries, date):
+    """Old per-date selector (heroes/open): 14 past-date hashes + linear probe."""
+    date_str = date.strftime('%Y-%m-%d')
+    date_hash = int(hashlib.md5(date_str.encode()).hexdigest(), 16)
+    excluded = set()
+    for days_ago in range(1, 15):
+        past_str = (date - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+        excluded.add(int(hashlib.md5(past_str.encode()).hexdigest(), 16) % len(entries))
+    idx = date_hash % len(entries)
+    attempts = 0
+    while idx in excluded and attempts < len(entries):
+        idx = (idx + 1) % len(entries)
+        attempts += 1
+    return idx
+
+
+def _max_repeat_gap_violations(entries, picks, window):
+    ids = [entries[i]['name'] for i in picks]
+    return sum(1 for i, eid in enumerate(ids) if eid in ids[max(0, i - window):i])
+
+
+def bench_rotation():
+    from scrapers.rotation import select_window, WINDOW
+    special = _load_json('special_cache.json', {})
+    start = datetime(2026, 1, 1)
+    print("📐 rotation: legacy per-date probe vs single-pass window selector")
+    for key in ('heroes', 'benchmarks', 'open'):
+        entries = special.get(key) or []
+        if not entries:
+            print(f"  {key}: empty warehouse – skipped")
+            continue
+        print(f"  {key} ({len(entries)} entries)")
+        for days in (14, 30, 90, 180, 365):
+            dates = [start + timedelta(days=i) for i in range(days)]
+            legacy_ms = _timeit(lambda: [_legacy_pick(entries, d) for d in dates])
+            window_ms = _timeit(lambda: select_window(entries, dates))
+            legacy = [_legacy_pick(entries, d) for d in dates]
+            window = select_window(entries, dates)
+            print(f"    {days:>3} days: legacy {legacy_ms:7.2f} ms ({15 * days} hashes, "
+                  f"{_max_repeat_gap_violations(entries, legacy, WINDOW)} repeats) | "
+                  f"window {window_ms:6.2f} ms ({days} hashes, "
+                  f"{_max_repeat_gap_violations(entries, window, WINDOW)} repeats)")
+
+
+# ── keywords ──────────────────────────────────────────────────────────────────
+
+def bench_keywords():
+    from scrapers.crossfit_com import LINE_FILTER, SKIP_WORDS, STOP_WORDS
+    from scrapers.heroes import HERO_LINE_KEYWORDS
+    lowered = [l.lower() for l in _corpus_lines()]
+    print(f"🔎 keywords: any(kw in lo) vs precompiled KeywordSets over {len(lowered)} lines "
+          f"({len(_pages())} recorded pages)")
+
+    def legacy_cf(lo):
+        if any(k in lo for k in STOP_WORDS):
+            return 'stop'
+        if any(k in lo for k in SKIP_WORDS):
+            return 'skip'
+        return None
+
+    def legacy_hero(lo):
+        for name, words in HERO_LINE_KEYWORDS.words.items():
+            if any(k in lo for k in words):
+                return name
+        return None
+
+    for label, legacy, fast in (
+        ('crossfit_com stop/skip', legacy_cf, LINE_FILTER.first),
+        ('heroes junk/memorial/footer', legacy_hero, HERO_LINE_KEYWORDS.first),
+    ):
+        same = all(legacy(lo) == fast(lo) for lo in lowered)
+        legacy_ms = _timeit(lambda: [legacy(lo) for lo in lowered])
+        fast_ms = _timeit(lambda: [fast(lo) for lo in lowered])
+        print(f"  {label:<28} legacy {legacy_ms:7.2f} ms | compiled {fast_ms:7.2f} ms "
+              f"(x{legacy_ms / max(fast_ms, 1e-6):.1f}) | identical: {same}")
+
+
+# ── heroes ────────────────────────────────────────────────────────────────────
+
+def _legacy_is_title(line):
+    return (len(line) < 30 and len(line) > 2 and ':' not in line and not line.islower()
+            and (line.isupper() or line.istitle()) and not any(c.isdigit() for c in line[:3]))
+
+
+def _legacy_heroes(text):
+    """Old heroes._scrape_all_heroes loop (title heuristic evaluated in three places)."""
+    from scrapers.heroes import HERO_LINE_KEYWORDS as kw
+    lines = [l.strip() for l in text.split('\n') if l.strip()]
+    heroes = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if kw.has('junk', line.lower()):
+            i += 1
+            continue
+        if not _legacy_is_title(line):
+            i += 1
+            continue
+        name, workout_lines, hero_story = line, [], None
+        i += 1
+        while i < len(lines):
+            next_line = lines[i]
+            if kw.has('memorial', next_line.lower()):
+                story = [next_line]
+                i += 1
+                while i < len(lines):
+                    stop_line = lines[i]
+                    if kw.has('footer', stop_line.lower()):
+                        i += 1
+                        break
+                    if _legacy_is_title(stop_line):
+                        break
+                    story.append(stop_line)
+                    i += 1
+                    if len(story) >= 30:
+                        break
+                hero_story = '\n'.join(story).strip()
+                break
+            if _legacy_is_title(next_line):
+                break
+            if kw.has('footer', next_line.lower()):
+                break
+            workout_lines.append(next_line)
+            i += 1
+            if len(workout_lines) >= 25:
+                break
+        if len(workout_lines) >= 3:
+            entry = {'name': name, 'lines': workout_lines[:25]}
+            if hero_story:
+                entry['hero_story'] = hero_story
+            heroes.append(entry)
+    return heroes
+
+
+def _heroes_page_text():
+    """Recorded /heroes page text, else a page rebuilt from the current warehouse."""
+    raw = _pages().get('heroes.html')
+    if raw:
+        from bs4 import BeautifulSoup
+        from scrapers.net import fix_mojibake
+        soup = BeautifulSoup(raw, 'html.parser')
+        for tag in soup.find_all(['script', 'style', 'img', 'picture']):
+            tag.decompose()
+        return 'recorded heroes.html', fix_mojibake(soup.get_text(separator='\n'))
+    parts = ['Skip to content', 'Find a Gym', 'Newsletter']
+    for hero in _load_json('special_cache.json', {}).get('heroes') or []:
+        parts.append(hero['name'])
+        parts.extend(hero.get('lines') or [])
+        if hero.get('hero_story'):
+            parts.append(hero['hero_story'])
+            parts.append('Share This')
+    parts.extend(['Privacy Policy', 'Copyright © CrossFit'])
+    return 'page rebuilt from special_cache.json', '\n\n'.join(parts)
+
+
+def bench_heroes():
+    from scrapers.heroes import _parse_hero_lines, _tokenize
+    label, text = _heroes_page_text()
+    warehouse = _load_json('special_cache.json', {}).get('heroes') or []
+    legacy = _legacy_heroes(text)
+    new = _parse_hero_lines(_tokenize(text))
+    print(f"🦸 heroes: legacy nested loops vs tokenizer + state machine ({label}, {len(text) // 1024} KB)")
+    legacy_ms = _timeit(lambda: _legacy_heroes(text))
+    new_ms = _timeit(lambda: _parse_hero_lines(_tokenize(text)))
+    print(f"  legacy {legacy_ms:7.2f} ms | state machine {new_ms:7.2f} ms (x{legacy_ms / max(new_ms, 1e-6):.1f}) | "
+          f"{len(new)} heroes | identical to legacy: {new == legacy} | identical to warehouse: {new == warehouse}")
+
+
+# ── open ──────────────────────────────────────────────────────────────────────
+
+def _legacy_open_block(text, name_hint):
+    """Old open_wods._extract_workout_block_from_text (re-splits the page per call)."""
+    import re
+    from scrapers.open_wods import BLOCK_START_RE, BLOCK_STOP_RE
+    lines = [l.strip() for l in text.split('\n') if l.strip()]
+    if not lines:
+        return []
+    start_idx = 0
+    pattern = re.escape(name_hint.split()[-1])
+    for i, l in enumerate(lines):
+        if re.search(pattern, l):
+            start_idx = i
+            break
+    for i in range(start_idx, len(lines)):
+        if BLOCK_START_RE.search(lines[i].lower()):
+            start_idx = i
+            break
+    block = []
+    for l in lines[start_idx:start_idx + 40]:
+        if BLOCK_STOP_RE.search(l.lower()):
+            break
+        block.append(l)
+        if len(block) >= 25:
+            break
+    return [l for l in block if len(l) <= 160]
+
+
+def _legacy_open_year(text, year):
+    lines = [l.strip() for l in text.split('\n') if l.strip()]
+    workouts = []
+    for n in range(1, 6):
+        code = f"{str(year)[-2:]}.{n}"
+        joined = "\n".join(lines)
+        if code not in joined:
+            continue
+        block = _legacy_open_block(text, code)
+        if len(block) >= 2:
+            workouts.append({'name': f"Open {code}", 'lines': block, 'year': year, 'code': code})
+    return workouts
+
+
+def _open_year_pages():
+    """{year: page text} rebuilt from the 2011–2016 warehouse entries, padded like the real pages."""
+    pages = {}
+    filler = ['Leaderboard', 'Athletes', 'Affiliates', 'Scaled and Masters divisions available'] * 40
+    for w in _load_json('special_cache.json', {}).get('open') or []:
+        if w.get('year', 9999) > 2016:
+            continue
+        parts = pages.setdefault(w['year'], list(filler))
+        parts.append(f"Workout {w['code']}")
+        parts.extend(w['lines'])
+        parts.extend(['Movement Standards'] + ['Each rep must be completed to standard.'] * 60)
+    return {year: '\n'.join(parts + filler) for year, parts in pages.items()}
+
+
+def bench_open():
+    from contextlib import redirect_stdout
+    import io
+    from scrapers.open_wods import _parse_year_page
+    pages = _open_year_pages()
+    if not pages:
+        print("📅 open: no 2011–2016 entries in special_cache.json – skipped")
+        return
+
+    def parse_all():
+        with redirect_stdout(io.StringIO()):
+            return [w for year, text in pages.items() for w in _parse_year_page(text, year)]
+
+    legacy = [w for year, text in pages.items() for w in _legacy_open_year(text, year)]
+    new = parse_all()
+    print(f"📅 open: per-code re-split vs one index per year page ({len(pages)} pages, "
+          f"{sum(len(t) for t in pages.values()) // 1024} KB)")
+    legacy_ms = _timeit(lambda: [_legacy_open_year(text, year) for year, text in pages.items()])
+    new_ms = _timeit(parse_all)
+    print(f"  legacy {legacy_ms:7.2f} ms | indexed {new_ms:7.2f} ms (x{legacy_ms / max(new_ms, 1e-6):.1f}) | "
+          f"{len(new)} workouts | identical: {new == legacy}")
+
+
+# ── loads ─────────────────────────────────────────────────────────────────────
+
+_LEGACY_LOAD_RES = None
+
+
+def _legacy_loads(line):
+    """One regex per load form, the way each scraper / the client matched them separately."""
+    import re
+    global _LEGACY_LOAD_RES
+    if _LEGACY_LOAD_RES is None:
+        _LEGACY_LOAD_RES = [re.compile(p, re.I) for p in (
+            r'(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)\s*(?:kg|lb)s?\b',   # 95/65 lb
+            r'(\d+(?:\.\d+)?)\s*(?:kg)s?\b',                              # 24 kg
+            r'(\d+(?:\.\d+)?)\s*-?\s*(?:lb)s?\b',                          # 135 lb
+            r'(\d+(?:\.\d+)?)\s*#',                                        # 55#
+            r'(\d+(?:\.\d+)?)\s*pood\b',                                  # 1.5 pood
+        )]
+    return [m.group(0) for rx in _LEGACY_LOAD_RES for m in rx.finditer(line)]
+
+
+def bench_loads():
+    from scrapers.loads import parse_loads
+    lines = _corpus_lines()
+    found = [l for line in lines for l in parse_loads(line)]
+    units = {}
+    for load in found:
+        unit = 'pair' if len(load['kg']) == 2 else 'single'
+        units[unit] = units.get(unit, 0) + 1
+    print(f"🏋️ loads: per-form regexes vs one precompiled pass over {len(lines)} lines "
+          f"(warehouse + 14 days{' + recorded pages' if _pages() else ''})")
+    legacy_ms = _timeit(lambda: [_legacy_loads(l) for l in lines])
+    new_ms = _timeit(lambda: [parse_loads(l) for l in lines])
+    print(f"  legacy {legacy_ms:7.2f} ms (raw strings only) | normalized {new_ms:7.2f} ms "
+          f"(kg + lb numbers) | {len(found)} loads ({units.get('pair', 0)} m/f pairs)")
+
+
+# ── eq ────────────────────────────────────────────────────────────────────────
+
+def bench_eq():
+    from scrapers.taxonomy import EQ, EQ_BITS, eq_mask, wod_text, warehouse_wod
+    wods = [w for ws in (_load_json('workouts.json', {}).get('workouts') or {}).values() for w in ws]
+    special = _load_json('special_cache.json', {})
+    for src_id, key in (('hero', 'heroes'), ('benchmark', 'benchmarks'), ('open', 'open')):
+        wods.extend(warehouse_wod(src_id, e) for e in special.get(key) or [])
+    masks = [eq_mask(w) for w in wods]
+    query = ['BARBELL', 'PULLUP BAR', 'ROW']
+    q = sum(EQ_BITS[k] for k in query)
+
+    def scan():
+        out = []
+        for w in wods:
+            txt = wod_text(w)
+            found = [key for key, kws in EQ.items() if any(kw in txt for kw in kws)]
+            out.append((sum(k in query for k in found), sum(k not in query for k in found)))
+        return out
+
+    def bits():
+        return [(bin(m & q).count('1'), bin(m & ~q).count('1')) for m in masks]
+
+    print(f"🧰 eq: per-query text scan vs ingest-time eq_mask ({len(wods)} workouts + warehouse entries)")
+    scan_ms = _timeit(scan)
+    bits_ms = _timeit(bits)
+    print(f"  text scan {scan_ms:7.2f} ms | bitmask {bits_ms:6.2f} ms (x{scan_ms / max(bits_ms, 1e-6):.0f}) | "
+          f"identical: {scan() == bits()}")
+
+
+# ── duration ──────────────────────────────────────────────────────────────────
+
+# (WOD section lines, expected (min, max)) – the estimator must give exactly these bounds
+DURATION_FIXTURES = [
+    (['AMRAP 20 min:', '5 pull-ups', '10 push-ups', '15 air squats'], (20, 20)),
+    (['EMOM 12:', '5 power cleans', '10 burpees'], (12, 12)),
+    (['Every 2 min for 20 min:', '5 power cleans', '10 burpees'], (20, 20)),
+    (['Every 3 minutes for 24 minutes:', '400m run', '15 wall balls'], (24, 24)),
+    (['Every 1:30 for 15 minutes:', '3 front squats'], (15, 15)),
+    (['Every 1:30 x 8 rounds:', '3 front squats'], (12, 12)),
+    (['For time:', '30 clean-and-jerks (135/95 lb)'], (2, 4)),
+    (['For time (15 min cap):', '50 wall balls', '40 box jumps'], (9, 15)),
+]
+
+
+def bench_duration():
+    from scrapers.duration import TEXT_MINUTES_RE, estimate_duration
+    from scrapers.structure import workout_structure
+    from scrapers.taxonomy import wod_text
+    wods = [w for ws in (_load_json('workouts.json', {}).get('workouts') or {}).values() for w in ws]
+    structures = [workout_structure(w) for w in wods]
+    durations = [estimate_duration(w, st) for w, st in zip(wods, structures)]
+
+    def scan():
+        return [TEXT_MINUTES_RE.search(wod_text(w)) for w in wods]
+
+    def stored():
+        return [d and (d['min'], d['max']) for d in durations]
+
+    failed = []
+    for lines, expected in DURATION_FIXTURES:
+        w = {'source': 'bench', 'sections': [{'title': 'WOD', 'lines': lines, 'role': 'wod'}]}
+        d = estimate_duration(w, workout_structure(w))
+        if not d or (d['min'], d['max']) != expected:
+            failed.append(f"{lines[0]!r} → {d and (d['min'], d['max'])} (want {expected})")
+    print(f"⏱  duration: per-search text scan vs ingest-time estimate ({len(wods)} workouts)")
+    scan_ms = _timeit(scan)
+    stored_ms = _timeit(stored)
+    print(f"  text scan {scan_ms:7.2f} ms | stored range {stored_ms:6.2f} ms | "
+          f"{sum(1 for d in durations if d)} estimated | fixtures {len(DURATION_FIXTURES) - len(failed)}"
+          f"/{len(DURATION_FIXTURES)}")
+    for line in failed:
+        print(f"    ❌ {line}")
+
+
+# ── extract ───────────────────────────────────────────────────────────────────
+
+def _legacy_largest_div(soup):
+    """Old crossfit_com fallback: get_text() on every <div> (nested text rebuilt per ancestor)."""
+    best, best_len = None, 0
+    for div in soup.find_all('div'):
+        t = div.get_text(strip=True)
+        if len(t) > best_len and len(t) < 5000:
+            best_len = len(t)
+            best = div
+    return best
+
+
+def _extract_pages():
+    """Recorded pages, else page-builder-style pages (every line ~6 divs deep, ~20 wrappers, menus) from workouts.json."""
+    pages = _pages()
+    if pages:
+        return 'recorded pages', pages
+    nav = '<nav><ul>' + ''.join(f'<li><a href="/p{i}">Programs {i}</a></li>' for i in range(30)) + '</ul></nav>'
+    related = '<div class="related">' + ''.join(f'<div><a href="/wod/{i}">Older WOD {i}</a></div>' for i in range(20)) + '</div>'
+    widget = '<div class="e-con"><div class="e-col"><div class="e-wrap"><div class="e-widget"><div class="e-inner">{}</div></div></div></div></div>'
+    pages = {}
+    for date_str, wods in sorted((_load_json('workouts.json', {}).get('workouts') or {}).items())[-3:]:
+        for w in wods:
+            body = ''.join(
+                widget.format(f"<h3>{sec.get('title', '')}</h3>")
+                + ''.join(widget.format(f'<p>{l}</p>') for l in sec.get('lines') or [] if isinstance(l, str))
+                for sec in w.get('sections') or [])
+            inner = f'<div class="entry">{body}</div>'
+            for depth in range(20):
+                inner = f'<div class="wrap-{depth}">{inner}{related if depth == 10 else ""}</div>'
+            pages[f"{date_str}/{w['source']}"] = f'<html><body>{nav}{inner}<footer>{nav}</footer></body></html>'.encode()
+    return 'synthetic pages from workouts.json', pages
+
+
+def _link_share(block):
+    text = len(block.get_text(strip=True)) if block else 0
+    links = sum(len(a.get_text(strip=True)) for a in block.find_all('a')) if block else 0
+    return links / text if text else 0
+
+
+def bench_extract():
+    from bs4 import BeautifulSoup
+    from scrapers.extract import best_block
+    label, pages = _extract_pages()
+    soups = [BeautifulSoup(raw, 'html.parser') for raw in pages.values()]
+    legacy = [_legacy_largest_div(s) for s in soups]
+    new = [best_block(s, tags=('div',)) for s in soups]
+    same_cf = sum(a is best_block(s, tags=('div',), max_link_density=None) for a, s in zip(legacy, soups))
+    print(f"📰 extract: get_text() per <div> vs one-pass content density ({label}, {len(soups)} pages, "
+          f"{sum(map(len, pages.values())) // 1024} KB)")
+    legacy_ms = _timeit(lambda: [_legacy_largest_div(s) for s in soups], repeat=3)
+    new_ms = _timeit(lambda: [best_block(s, tags=('div',)) for s in soups], repeat=3)
+    cf_ms = _timeit(lambda: [best_block(s, tags=('div',), max_link_density=None) for s in soups], repeat=3)
+    print(f"  legacy {legacy_ms:7.2f} ms | one pass {new_ms:7.2f} ms (x{legacy_ms / max(new_ms, 1e-6):.1f}) | "
+          f"same block: {sum(a is b for a, b in zip(legacy, new))}/{len(soups)} | link text in pick: "
+          f"legacy {sum(map(_link_share, legacy)) / len(soups):.0%}, density {sum(map(_link_share, new)) / len(soups):.0%}")
+    print(f"  crossfit.com (max_link_density=None) {cf_ms:7.2f} ms (x{legacy_ms / max(cf_ms, 1e-6):.1f}) | "
+          f"same block: {same_cf}/{len(soups)}")
+
+
+# ── cleanup ───────────────────────────────────────────────────────────────────
+
+def _legacy_restoration_cleanup(soup):
+    """Old restoration cleanup: five find_all() passes over the whole tree."""
+    from scrapers.cleanup import NAV_FOOTER_RE, SAFE_JUNK_RE
+    for tag in soup.find_all(['script', 'style', 'iframe', 'noscript', 'form']):
+        tag.decompose()
+    for img in soup.find_all(['img', 'picture', 'figure']):
+        img.decompose()
+    for tag in soup.find_all(class_=NAV_FOOTER_RE):
+        tag.decompose()
+    for tag in soup.find_all(id=NAV_FOOTER_RE):
+        tag.decompose()
+    for tag in soup.find_all(class_=SAFE_JUNK_RE):
+        tag.decompose()
+
+
+def bench_cleanup():
+    from bs4 import BeautifulSoup
+    from scrapers.cleanup import clean
+    from scrapers.restoration import CLEANUP
+    label, pages = _extract_pages()
+    chrome = ('<header class="site-header"><script>var a=1;</script><a href="/">Home</a></header>'
+              '<div id="primary-navigation"><a href="/wod">WOD</a></div><style>p{}</style>')
+    tail = ('<aside class="sidebar widget-area"><form><input></form><img src="a.png"></aside>'
+            '<div class="comment-list"><p>Nice!</p></div><div id="page-footer"><noscript>x</noscript></div>')
+    pages = [raw.replace(b'<body>', b'<body>' + chrome.encode()).replace(b'</body>', tail.encode() + b'</body>')
+             for raw in pages.values()]
+    soups = lambda: [BeautifulSoup(raw, 'html.parser') for raw in pages]
+    legacy_soups, new_soups = soups(), soups()
+    for soup in legacy_soups:
+        _legacy_restoration_cleanup(soup)
+    stats = [clean(soup, CLEANUP) for soup in new_soups]
+    identical = all(str(a) == str(b) for a, b in zip(legacy_soups, new_soups))
+
+    def run(fn):
+        fresh = soups()
+        t0 = time.perf_counter()
+        for soup in fresh:
+            fn(soup)
+        return (time.perf_counter() - t0) * 1000
+
+    legacy_ms = min(run(_legacy_restoration_cleanup) for _ in range(3))
+    new_ms = min(run(lambda soup: clean(soup, CLEANUP)) for _ in range(3))
+    print(f"🧹 cleanup: restoration's 5 find_all() passes vs one rule walk ({label}, {len(pages)} pages)")
+    print(f"  legacy {legacy_ms:7.2f} ms | one walk {new_ms:7.2f} ms (x{legacy_ms / max(new_ms, 1e-6):.1f}) | "
+          f"{sum(s.removed for s in stats)} removed | identical tree: {identical}")
+
+
+# ── lines ─────────────────────────────────────────────────────────────────────
+
+def _legacy_restoration_lines(body):
+    """Old restoration extraction: rewrite bold/subheader tags to string markers, get_text() the body, then filter."""
+    import re
+    from bs4 import NavigableString
+    from scrapers.restoration import DATE_HDR, NAV_WORDS, STOP_PREFIX_RE
+    for tag in body.find_all(class_=lambda c: c and 'soswodify_component_name' in c):
+        for bold_tag in tag.find_all(['strong', 'b']):
+            txt = bold_tag.get_text(" ", strip=True)
+            if txt:
+                bold_tag.replace_with(NavigableString("\n__BOLD__" + txt + "\n"))
+        lines = [l.strip() for l in tag.get_text(separator='\n').split('\n') if l.strip()]
+        first = lines[0]
+        if ' (' in first:
+            first = (first.split(' (')[0].strip() or first)
+        tag.replace_with(NavigableString("\n__SUBHEADER__" + first + "\n" + "\n".join(lines[1:]) + "\n"))
+    for tag in body.find_all(['strong', 'b']):
+        txt = tag.get_text(" ", strip=True)
+        if txt:
+            tag.replace_with("\n__BOLD__" + txt + "\n")
+    raw_lines = [l.strip() for l in body.get_text(separator='\n').split('\n') if l.strip() and len(l.strip()) > 1]
+    start_idx = next((i + 1 for i, l in enumerate(raw_lines) if DATE_HDR.search(l)), 0)
+    out = []
+    for line in raw_lines[start_idx:]:
+        lo = line.lower().strip()
+        if lo == 'intermediate' or lo.startswith('intermediate ') or lo in ('prev', 'previous') or STOP_PREFIX_RE.match(lo):
+            break
+        if lo in NAV_WORDS or re.match(r'^wod[-–]', lo) or len(line) > 200:
+            continue
+        out.append(line)
+    return out[:60]
+
+
+def _marked_to_tokens(lines):
+    from scrapers.lines import Line
+    tokens = []
+    for l in lines:
+        sub = l.startswith('__SUBHEADER__')
+        l = l.replace('__SUBHEADER__', '', 1).strip()
+        bold = l.startswith('__BOLD__')
+        tokens.append(Line(l.replace('__BOLD__', '', 1).strip(), bold=bold, subheader=sub))
+    return tokens
+
+
+def _restoration_pages():
+    """Restoration-style post pages from the stored restoration workouts: bold titles, one Wodify block, long comment thread."""
+    from html import escape
+    comments = ''.join(f'<li><p>Great workout #{i}, finished in {i % 20 + 8}:{i % 60:02d}</p><p>Scaled the load</p></li>'
+                       for i in range(400))
+    pages = []
+    for date_str, wods in sorted((_load_json('workouts.json', {}).get('workouts') or {}).items()):
+        for w in wods:
+            if w.get('source') != 'restoration':
+                continue
+            parts = ['<header><a href="/">Home</a><a href="/wod">WOD</a></header>', f'<h1>WOD {date_str}</h1>',
+                     '<p>CrossFit – Mon</p>']
+            for i, sec in enumerate(w.get('sections') or []):
+                lines = ''.join(f'<p>{escape(l)}</p>' for l in sec.get('lines') or [] if isinstance(l, str))
+                if i == 1:
+                    parts.append(f'<div class="soswodify_component_name">{escape(sec.get("title", ""))} (Time)<br>{lines}</div>')
+                else:
+                    parts.append(f'<p><strong>{escape(sec.get("title", ""))}</strong></p>{lines}')
+            parts.append(f'<p>Intermediate</p><p>Scaled version…</p><h3>Leave a Reply</h3><ol>{comments}</ol><p>Prev</p>')
+            pages.append(('<html><body>' + ''.join(parts) + '</body></html>').encode())
+    return pages
+
+
+def bench_lines():
+    from bs4 import BeautifulSoup
+    from contextlib import redirect_stdout
+    import io
+    from scrapers.restoration import extract_workout_lines, parse_sections
+    pages = _restoration_pages()
+    if not pages:
+        print("📜 lines: no restoration workouts in workouts.json – skipped")
+        return
+    bodies = lambda: [BeautifulSoup(raw, 'html.parser').body for raw in pages]
+
+    legacy = [parse_sections(_marked_to_tokens(_legacy_restoration_lines(b))) for b in bodies()]
+    with redirect_stdout(io.StringIO()):
+        new = [parse_sections(extract_workout_lines(b)) for b in bodies()]
+
+    def run(fn):
+        fresh = bodies()
+        t0 = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            for body in fresh:
+                fn(body)
+        return (time.perf_counter() - t0) * 1000
+
+    legacy_ms = min(run(_legacy_restoration_lines) for _ in range(3))
+    new_ms = min(run(extract_workout_lines) for _ in range(3))
+    print(f"📜 lines: marker rewrite + get_text() vs streamed Line tokens ({len(pages)} restoration-style pages "
+          f"with a 400-comment thread)")
+    print(f"  legacy {legacy_ms:7.2f} ms | streaming {new_ms:7.2f} ms (x{legacy_ms / max(new_ms, 1e-6):.1f}) | "
+          f"identical sections: {legacy == new}")
+
+
+# ── sections ──────────────────────────────────────────────────────────────────
+
+def _legacy_flat_sections(lines):
+    """Old postal / panda parse_sections (isupper + keyword any() + uncompiled re.search per line)."""
+    import re
+    from scrapers.others import SECTION_HINTS
+    sections, cur = [], {'title': 'WORKOUT', 'lines': []}
+    for line in lines:
+        lo = line.lower()
+        is_hdr = (line.isupper() and 3 <= len(line) <= 60 and not re.search(r'\d', line)) or (
+            any(h in lo for h in SECTION_HINTS) and len(line) < 60
+            and not re.search(r'\d+\s*(min|rep|round|x\b)', lo))
+        if is_hdr:
+            if cur['lines']:
+                sections.append(cur)
+            cur = {'title': line.upper(), 'lines': []}
+        else:
+            cur['lines'].append(line)
+    if cur['lines']:
+        sections.append(cur)
+    return sections or [{'title': 'WORKOUT', 'lines': lines}]
+
+
+def _legacy_tonbridge_sections(lines):
+    """Old tonbridge parse_sections: header scan per line (once per inner loop), note regexes per line."""
+    import re
+    from scrapers.tonbridge import FIRST_LEVEL_HEADERS, _normalize_section_title
+
+    def is_header(line):
+        s = (line or '').strip()
+        if not s or len(s) > 70:
+            return False
+        lo = s.lower()
+        return any(lo == h or lo.startswith(h + ':') or lo.startswith(h + ' ') for h in FIRST_LEVEL_HEADERS)
+
+    def is_note(line):
+        s = (line or '').strip()
+        if not s or len(s) > 120:
+            return False
+        lo = s.lower()
+        return bool(re.search(r'\d+/\d+\s*kg', lo) or re.search(r'\d+\s*kg\b', lo)
+                    or ' so do' in lo or 'option:' in lo or 'rx+' in lo or 'rx:' in lo)
+
+    sections, i = [], 0
+    while i < len(lines):
+        if not is_header(lines[i]):
+            if not sections:
+                block = []
+                while i < len(lines) and not is_header(lines[i]):
+                    block.append(lines[i])
+                    i += 1
+                if block:
+                    sections.append({'title': 'WORKOUT', 'lines': block})
+                continue
+            i += 1
+            continue
+        title = _normalize_section_title(lines[i])
+        i += 1
+        block, sub = [], None
+        while i < len(lines) and not is_header(lines[i]):
+            block.append(lines[i])
+            i += 1
+        if title in ('METCON', 'WOD') and block:
+            sub, block = block[0].strip(), block[1:]
+        block = [('* ' + ln.strip()) if is_note(ln) else ln for ln in block]
+        sections.append({'title': title, 'sub_title': sub, 'lines': block} if sub is not None
+                        else {'title': title, 'lines': block})
+    return sections or [{'title': 'WORKOUT', 'lines': lines}]
+
+
+def _legacy_myleo_sections(lines):
+    """Old myleo loop, helpers re-defined on every call (as inside fetch_workout)."""
+    import re
+    from scrapers.myleo import SKIP_WORDS
+
+    def is_block_header(txt):
+        if not txt or len(txt) < 2:
+            return False
+        t = txt.strip().lower()
+        return (t.endswith(':') or t in ('for time', 'amrap', 'emom', 'buy-in', 'cash-out')
+                or bool(re.match(r'^\d+\s*(rounds?|min(?:ute)?s?)', t)))
+
+    def is_sub_title_line(txt):
+        if not txt or len(txt) < 2:
+            return False
+        lo = txt.strip().lower()
+        return lo.startswith('amrap') or lo.startswith('for time') or 'rounds' in lo
+
+    def is_note_line(txt):
+        if not txt or len(txt) > 200:
+            return False
+        lo = txt.strip().lower()
+        return ('score:' in lo or 'aerobic power' in lo or 'vo2 max' in lo or 'muscular endurance' in lo
+                or bool(re.search(r'barbell\s*:', lo)) or 'rx+' in lo or 'rx:' in lo
+                or 'remaining time' in lo or 'pick up where' in lo or bool(re.search(r'rest\s+\d+.*between', lo)))
+
+    score_zone, sections, cur = False, [], None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or len(stripped) < 2:
+            if cur is not None:
+                cur['lines'].append('')
+            continue
+        lower = stripped.lower()
+        if any(w in lower for w in SKIP_WORDS):
+            continue
+        if 'score:' in lower:
+            score_zone = True
+        out = ('* ' + stripped) if score_zone or is_note_line(stripped) else stripped
+        match = re.match(r'^([a-z])\)\s*(.+)', stripped, re.IGNORECASE)
+        if match:
+            if cur and (cur['lines'] or cur.get('sub_title')):
+                sections.append(cur)
+            cur = {'title': match.group(2).strip().upper(), 'lines': []}
+        elif cur is not None:
+            if is_sub_title_line(stripped) and cur.get('sub_title') is None:
+                cur['sub_title'] = stripped
+                continue
+            if cur['lines'] and is_block_header(cur['lines'][-1]):
+                cur['lines'].append('')
+            cur['lines'].append(out)
+        else:
+            cur = {'title': 'WORKOUT', 'lines': []}
+            if is_sub_title_line(stripped):
+                cur['sub_title'] = stripped
+            else:
+                cur['lines'].append(out)
+    if cur and cur['lines']:
+        sections.append(cur)
+    return sections
+
+
+def _section_inputs():
+    """Per stored workout: its lines flattened back (titles, sub-titles, lines) – what a scraper hands the sectionizer."""
+    inputs = []
+    for wods in (_load_json('workouts.json', {}).get('workouts') or {}).values():
+        for w in wods:
+            lines = []
+            for sec in w.get('sections') or []:
+                lines.append(sec.get('title') or '')
+                if sec.get('sub_title'):
+                    lines.append(sec['sub_title'])
+                lines.extend(l for l in sec.get('lines') or [] if isinstance(l, str))
+            inputs.append([l for l in lines if l])
+    return inputs
+
+
+def bench_sections():
+    from scrapers.myleo import parse_sections as myleo
+    from scrapers.others import parse_sections as postal
+    from scrapers.tonbridge import parse_sections as tonbridge
+    inputs = _section_inputs()
+    if not inputs:
+        print("🧱 sections: no workouts in workouts.json – skipped")
+        return
+    print(f"🧱 sections: per-source parse_sections vs compiled Sectionizer ({len(inputs)} stored workouts, "
+          f"{sum(map(len, inputs))} lines, x20)")
+    for label, legacy, fast in (
+        ('postal / panda', _legacy_flat_sections, postal),
+        ('tonbridge', _legacy_tonbridge_sections, tonbridge),
+        ('myleo', _legacy_myleo_sections, myleo),
+    ):
+        same = json.dumps([legacy(l) for l in inputs]) == json.dumps([fast(l) for l in inputs])
+        legacy_ms = _timeit(lambda: [legacy(l) for _ in range(20) for l in inputs])
+        fast_ms = _timeit(lambda: [fast(l) for _ in range(20) for l in inputs])
+        print(f"  {label:<16} legacy {legacy_ms:7.2f} ms | compiled {fast_ms:7.2f} ms "
+              f"(x{legacy_ms / max(fast_ms, 1e-6):.1f}) | identical: {same}")
+
+
+# ── embedded ──────────────────────────────────────────────────────────────────
+
+class _Page:
+    """Minimal response for the engine helpers (content + headers)."""
+    status_code = 200
+    headers = {'Content-Type': 'text/html; charset=utf-8'}
+
+    def __init__(self, content):
+        self.content = content
+
+
+def _next_pages():
+    """Recorded crossfit.com page, else Next.js-style pages (workout in __NEXT_DATA__ + rendered DOM) from workouts.json."""
+    raw = _pages().get('crossfit_com.html')
+    if raw:
+        return 'recorded crossfit_com.html', [raw]
+    nav = '<nav><ul>' + ''.join(f'<li><a href="/p{i}">Programs {i}</a></li>' for i in range(60)) + '</ul></nav>'
+    footer = '<footer>' + ''.join(f'<div><a href="/f{i}">Footer link {i}</a></div>' for i in range(40)) + '</footer>'
+    pages = []
+    for wods in (_load_json('workouts.json', {}).get('workouts') or {}).values():
+        for w in wods:
+            body = ''.join(f"<p>{sec.get('title', '')}</p>" + ''.join(
+                f'<p>{l}</p>' for l in sec.get('lines') or [] if isinstance(l, str)) for sec in w.get('sections') or [])
+            payload = json.dumps({'props': {'pageProps': {'wod': {'title': w.get('date'), 'wodBody': body}}}})
+            pages.append((f'<html><head><script id="__NEXT_DATA__" type="application/json">{payload}</script></head>'
+                          f'<body>{nav}<main><article>{body}</article></main>{footer}</body></html>').encode())
+    return 'synthetic Next.js pages from workouts.json', pages
+
+
+def bench_embedded():
+    from scrapers import engine
+    from scrapers.crossfit_com import SPEC
+    label, pages = _next_pages()
+    if not pages:
+        print("🧬 embedded: no pages – skipped")
+        return
+    responses = [_Page(raw) for raw in pages]
+
+    def dom(r):
+        soup = engine.make_soup(r, SPEC.parser)
+        engine.clean(soup, SPEC.cleanup)
+        content, _ = engine.find_container(SPEC, soup)
+        return engine._workout(SPEC, content, '', '') if content is not None else None
+
+    def embedded(r):
+        return engine._from_embedded(SPEC, r, '', '')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        same = sum(dom(r) == embedded(r) for r in responses)
+        hits = sum(embedded(r) is not None for r in responses)
+        dom_ms = _timeit(lambda: [dom(r) for r in responses], repeat=3)
+        embedded_ms = _timeit(lambda: [embedded(r) for r in responses], repeat=3)
+    print(f"🧬 embedded: page DOM + container search vs __NEXT_DATA__ payload ({label}, {len(pages)} pages, "
+          f"{sum(map(len, pages)) // 1024} KB)")
+    print(f"  DOM {dom_ms:7.2f} ms | payload {embedded_ms:7.2f} ms (x{dom_ms / max(embedded_ms, 1e-6):.1f}) | "
+          f"payload hits: {hits}/{len(pages)} | identical to DOM: {same}/{len(pages)}")
+
+
+# ── strategy ──────────────────────────────────────────────────────────────────
+
+def bench_strategy():
+    from bs4 import BeautifulSoup
+    from scrapers import engine, state
+    from scrapers.crossfit_com import SPEC
+    label, pages = _extract_pages()
+    # Content in a late selector's container (the 7th: div[class*="content"]) – the density fallback is never remembered
+    soups = [BeautifulSoup(raw.replace(b'class="entry"', b'class="x-content"'), 'html.parser') for raw in pages.values()]
+
+    def in_order(soup):
+        for name, find in engine._selectors(SPEC):
+            node = find(soup)
+            if node is not None:
+                return node, name
+        return engine.best_block(soup, tags=SPEC.density_fallback), 'content-density'
+
+
+    def memo(soup):
+        return engine.find_container(SPEC, soup)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        state.reset(SPEC.id)
+        memo(soups[0])
+        same = sum(in_order(s)[0] is memo(s)[0] for s in soups)
+        order_ms = _timeit(lambda: [in_order(s) for s in soups], repeat=3)
+        memo_ms = _timeit(lambda: [memo(s) for s in soups], repeat=3)
+        state.reset(SPEC.id)
+    print(f"🧭 strategy: crossfit.com container lookups in order vs remembered selector on same-shape pages ({label}, {len(soups)} pages)")
+    print(f"  in order {order_ms:7.2f} ms | remembered {memo_ms:7.2f} ms (x{order_ms / max(memo_ms, 1e-6):.1f}) | "
+          f"same container: {same}/{len(soups)}")
+
+
+# ── stream ────────────────────────────────────────────────────────────────────
+
+def _tonbridge_page():
+    """Recorded Ton Bridge WOD page, else a year of newest-first posts built from workouts.json lines."""
+    from html import escape
+    raw = _pages().get('tonbridge.html')
+    if raw:
+        return 'recorded tonbridge.html', raw
+    lines = [l for l in _corpus_lines() if len(l) < 80][:2000] or ['Run 400m']
+    today = datetime.now()
+    posts = []
+    for i in range(365):
+        d = today - timedelta(days=i)
+        body = ''.join(f'<p>{escape(lines[(i * 7 + k) % len(lines)])}</p>' for k in range(8))
+        posts.append(f'<article class="fusion-post-medium"><h2 class="blog-shortcode-post-title">'
+                     f'<a href="#">{d:%A} {d.day} {d:%B}</a></h2><div class="fusion-post-content-container">{body}</div></article>')
+    return 'a year of synthetic posts', f'<html><body><main>{"".join(posts)}</main></body></html>'.encode()
+
+
+def bench_stream():
+    from bs4 import BeautifulSoup
+    from scrapers.listing import ListingIndex, parse_date
+    from scrapers.stream import CHUNK_SIZE, iter_elements, to_html
+    from scrapers.tonbridge import _article_title
+    label, raw = _tonbridge_page()
+    until = (datetime.now() - timedelta(days=13)).strftime('%Y-%m-%d')
+    chunks = [raw[i:i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE)]
+
+    def window(index):
+        return {d: str(a) for d, a in index.articles.items() if d >= until}
+
+    def full():
+        index = ListingIndex('tonbridge', _article_title)
+        index.add_page(BeautifulSoup(raw, 'lxml').find_all('article', class_='fusion-post-medium'))
+        return index
+
+    def streamed():
+        articles = []
+
+        def on_article(el):
+            if 'fusion-post-medium' not in (el.get('class') or '').split():
+                return False
+            articles.append(BeautifulSoup(to_html(el), 'lxml').article)
+            d = parse_date(_article_title(articles[-1]))
+            return d is not None and d < until
+
+        stats = iter_elements(iter(chunks), 'article', on_article)
+        index = ListingIndex('tonbridge', _article_title)
+        index.add_page(articles)
+        return index, stats
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        same = window(full()) == window(streamed()[0])
+        _, stats = streamed()
+        full_ms = _timeit(full, repeat=3)
+        stream_ms = _timeit(streamed, repeat=3)
+    print(f"🌊 stream: whole Ton Bridge page vs streamed until the 14-day window ({label}, {len(raw) // 1024} KB)")
+    print(f"  whole page {full_ms:7.2f} ms | streamed {stream_ms:7.2f} ms (x{full_ms / max(stream_ms, 1e-6):.1f}) | "
+          f"read {stats.bytes // 1024}/{len(raw) // 1024} KB | same window articles: {same}")
+
+
+BENCHES = {
+    'rotation': bench_rotation,
+    'keywords': bench_keywords,
+    'heroes': bench_heroes,
+    'open': bench_open,
+    'loads': bench_loads,
+    'eq': bench_eq,
+    'duration': bench_duration,
+    'extract': bench_extract,
+    'cleanup': bench_cleanup,
+    'lines': bench_lines,
+    'sections': bench_sections,
+    'embedded': bench_embedded,
+    'strategy': bench_strategy,
+    'stream': bench_stream,
+}
+
+
+def main(argv):
+    if argv[:1] == ['record']:
+        record()
+        return 0
+    names = argv or list(BENCHES)
+    for name in names:
+        fn = BENCHES.get(name)
+        if not fn:
+            print(f"❌ Unknown benchmark: {name} (available: {', '.join(BENCHES)})")
+            return 1
+        fn()
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv[1:]))
@@ -9,6 +9,7 @@ Sources with archive=False → fetch TODAY only, skip all other days
 """
 import json, sys
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
 
 def today_israel():
@@ -33,19 +34,44 @@ from scrapers.myleo        import fetch_workout as fetch_myleo
 from scrapers.crossfit_com  import fetch_workout as fetch_crossfit_com
 from scrapers.restoration   import fetch_workout as fetch_restoration
 from scrapers.cf1013        import fetch_workout as fetch_cf1013
+from scrapers.cf1013        import advance_watermark as advance_cf1013_watermark
+from scrapers.cf1013        import reset_watermark as reset_cf1013_watermark, watermark as cf1013_watermark
 from scrapers.tonbridge     import fetch_workout as fetch_tonbridge
-from scrapers.heroes        import fetch_hero
-from scrapers.benchmarks    import fetch_benchmark
-from scrapers.open_wods     import fetch_open
-from scrapers.heroes        import fetch_all_heroes
-from scrapers.benchmarks    import fetch_all_benchmarks, fetch_benchmarks_for_days
-from scrapers.open_wods     import fetch_all_open
+from scrapers.special_calendar import SPECIALS, calendar_ref, calendar_wod, ensure_calendar, fallback_calendar, published_id
+from scrapers.structure      import STRUCTURE_VERSION, postprocess
+from scrapers.duration       import DURATION_VERSION
+from scrapers.scheduler      import Job, run_jobs
+from scrapers.sitemap        import discover, remember
+from scrapers                import myleo, restoration
+from scrapers                import state as scraper_state
+from scrapers.search_index   import SEARCH_INDEX, save_index
+from scrapers.taxonomy       import EQ_SIG
 
 DATA_DIR  = Path(__file__).parent.parent / 'data'
 DATA_FILE = DATA_DIR / 'workouts.json'
 DAYS      = 14
-# Re-fetch these sources every run so scraper fixes (hero_story, sub_title, MYLEO, etc.) apply
-FORCE_REFRESH_SOURCES = {'myleo', 'cf1013', 'tonbridge', 'benchmark', 'hero'}
+# Re-fetch these sources every run so scraper fixes (sub_title, MYLEO, etc.) apply
+# (cf1013 only until it has a pagination watermark, myleo days whose sitemap <lastmod> is
+# unchanged stay – see main()).
+# Specials (hero/benchmark/open) come from the rotation calendar and are re-serialized
+# only when their warehouse changes.
+FORCE_REFRESH_SOURCES = {'myleo', 'cf1013', 'tonbridge'}
+# How special days are stored in workouts.json:
+#   'inline' – full copy of the warehouse workout (hero_story, lines…) in every day
+#   'ref'    – warehouse id + rotation metadata only; the app merges in the finished workout from
+#              special_cache.json "resolved" (window picks only – LOAD_DISPLAY not applied)
+# Both files are downloaded on every load. Measured on the Aug 2026 data (43 special days):
+# inline 187 KB + 166 KB cache, ref 119 KB + 166 KB cache + 65 KB resolved – 354 vs 350 KB
+# (39.2 vs 38.7 KB gzipped), so 'inline' stays the default.
+SPECIAL_STORAGE = 'inline'
+# Optional rewrite of loads in display lines of freshly fetched workouts (scrapers/loads.py):
+#   None – keep the source text; 'kg' / 'lb' – convert; 'both' – append kg to pound loads
+# Canonical kg/lb numbers are stored in `structure` either way.
+LOAD_DISPLAY = None
+
+# Date-URL sources checked against their sitemap before fetching (scrapers/sitemap.py):
+# days not listed are not requested, days whose <lastmod> is unchanged keep the stored workout.
+SITEMAP_SOURCES = {'myleo': myleo, 'restoration': restoration}
 
 SCRAPERS = [
     # (id, display_name, fetch_fn, has_archive)
@@ -54,10 +80,25 @@ SCRAPERS = [
     ('restoration',  'CrossFit Restoration',          fetch_restoration,  True),
     ('cf1013',       'CrossFit 1013',                 fetch_cf1013,       True),
     ('tonbridge',    'CrossFit Ton Bridge',           fetch_tonbridge,    True),
-    ('hero',         'CrossFit Hero Workouts',        fetch_hero,         True),
-    ('benchmark',    'CrossFit Benchmark Workouts',   fetch_benchmark,    True),
-    ('open',         'CrossFit Open Workouts',        fetch_open,         True),
 ]
+# Specials have no fetch function: every day is the rotation calendar's pick (fetch_one)
+SPECIAL_SOURCES = [
+    # (id, display_name)
+    ('hero',         'CrossFit Hero Workouts'),
+    ('benchmark',    'CrossFit Benchmark Workouts'),
+    ('open',         'CrossFit Open Workouts'),
+]
+SOURCES = SCRAPERS + [(src_id, name, None, True) for src_id, name in SPECIAL_SOURCES]
+
+
+def published_picks(data, src_id):
+    """{date_str: warehouse entry id} of special workouts already in workouts.json."""
+    picks = {}
+    for date_str, wods in (data.get('workouts') or {}).items():
+        for w in wods:
+            if w.get('source') == src_id and published_id(w):
+                picks[date_str] = published_id(w)
+    return picks
 
 
 def load():
@@ -101,78 +142,187 @@ def save(data):
     print(f"\n💾 Saved to {DATA_FILE}")
     print(f"   (absolute: {abspath})")
 
+    # Find Workout inverted index over the same corpus (+ warehouses)
+    try:
+        index = save_index(data)
+        print(f"🔎 Search index: {len(index['docs'])} docs, {len(index['postings'])} tokens → {SEARCH_INDEX.name}")
+    except Exception as e:
+        print(f"⚠️  Search index failed: {e}")
+
+
+def fetch_one(src_id, fetch_fn, date, date_str, calendar):
+    """One (day, source) fetch – runs on a scheduler worker thread."""
+    if src_id in SPECIALS:
+        if SPECIAL_STORAGE == 'ref':
+            wod = calendar_ref(src_id, date_str, calendar)
+        else:
+            wod = calendar_wod(src_id, date_str, calendar)
+    else:
+        wod = fetch_fn(date)
+    postprocess(wod, load_display=LOAD_DISPLAY)
+    return wod
+
 
 def main():
     print("🦆 DUCK-WOD Phase 1 Fetcher")
     print("=" * 50)
     data  = load()
-    # Remove MYLEO / CF1013 / Benchmark so they are re-fetched with current scraper logic
+    pinned = {src_id: published_picks(data, src_id) for src_id in SPECIALS}
+    # CF1013 is incremental once a watermark exists (data/scraper_state.json): stored days stay,
+    # the walk stops at the first known article. Without one (or without stored days) → full refresh.
+    force_refresh = set(FORCE_REFRESH_SOURCES)
+    has_cf1013 = any(w.get('source') == 'cf1013' for wods in data['workouts'].values() for w in wods)
+    if cf1013_watermark() and has_cf1013:
+        force_refresh.discard('cf1013')
+        print(f"🔖 CF1013 incremental (watermark {cf1013_watermark()})")
+    else:
+        reset_cf1013_watermark()
+    # Use Israel timezone so "today" and date keys match the app (user in Israel)
+    try:
+        from zoneinfo import ZoneInfo
+        now_i = datetime.now(ZoneInfo('Asia/Jerusalem'))
+    except Exception:
+        now_i = datetime.now()
+    dates_14 = [now_i - timedelta(days=i) for i in range(DAYS)]
+
+    # One sitemap read per date-URL source: which days exist / changed since they were fetched
+    print("\n🗺  Sitemap discovery...")
+    discovered = {}
+    for src_id, module in SITEMAP_SOURCES.items():
+        try:
+            status = discover(src_id, module.SITEMAPS, module.make_url, dates_14, version=module.PARSER_VERSION)
+        except Exception as e:
+            print(f"    ⚠️  {src_id} sitemap failed: {e}")
+            status = None
+        if status:
+            discovered[src_id] = status
+            counts = {}
+            for st, _ in status.values():
+                counts[st] = counts.get(st, 0) + 1
+            print(f"    → {src_id}: " + ', '.join(f"{n} {st}" for st, n in sorted(counts.items())))
+
+    def refetch(src_id, date_str):
+        st = discovered.get(src_id, {}).get(date_str, (None,))[0]
+        if st in ('unchanged', 'changed'):
+            return st == 'changed'
+        return src_id in force_refresh
+
+    # Remove MYLEO / CF1013 / Ton Bridge (and days whose sitemap lastmod changed) so they are
+    # re-fetched with current scraper logic; myleo days with an unchanged lastmod stay
     for date_str in list(data['workouts'].keys()):
         data['workouts'][date_str] = [
             w for w in data['workouts'][date_str]
-            if w.get('source') not in FORCE_REFRESH_SOURCES
+            if not refetch(w.get('source'), date_str)
         ]
     today = today_israel()
-    stats = {'ok': 0, 'fail': 0, 'cached': 0, 'skipped': 0}
+    stats = {'ok': 0, 'fail': 0, 'cached': 0, 'skipped': 0, 'unlisted': 0}
 
-    # Warm up / refresh special warehouses (monthly)
+    # Special warehouses (refreshed monthly, tagged when stale) + rotation calendar (date → warehouse id):
+    # one read of special_cache.json; a no-op unless a refresh is due, a warehouse changed or it runs short.
     # This ensures data/special_cache.json exists and is committed by the workflow.
+    print("\n📦 Special warehouses + rotation calendar...")
+    calendar, changed = {}, set()
     try:
-        print("\n📦 Refreshing special warehouses (monthly logic)...")
-        fetch_all_heroes()
-        fetch_all_benchmarks()
-        fetch_all_open()
+        calendar, changed = ensure_calendar(today, pinned=pinned, resolve=SPECIAL_STORAGE == 'ref')
         print("    ✅ Special warehouses ready")
     except Exception as e:
-        print(f"    ⚠️  Special warehouse refresh failed: {e}")
-
-    # Use Israel timezone so "today" and date keys match the app (user in Israel)
-    try:
-        from zoneinfo import ZoneInfo
-        now_i = datetime.now(ZoneInfo('Asia/Jerusalem'))
-    except Exception:
-        now_i = datetime.now()
-    dates_14 = [now_i - timedelta(days=i) for i in range(DAYS)]
-    # Request 15 unique benchmarks so none repeats in a 15-day window; use first 14 for display
-    dates_benchmark = [now_i - timedelta(days=i) for i in range(15)]
-    benchmark_wods = None
+        print(f"    ⚠️  Special warehouse / rotation calendar failed: {e}")
+    # No stored calendar for a source → the picks a fresh calendar would make (same days, same pins)
+    if any(not calendar.get(src_id) for src_id in SPECIALS):
+        try:
+            fallback = fallback_calendar(today, pinned=pinned)
+            for src_id in SPECIALS:
+                if not calendar.get(src_id) and fallback.get(src_id):
+                    calendar[src_id] = fallback[src_id]
+            calendar.setdefault('window', fallback['window'])
+        except Exception as e:
+            print(f"    ⚠️  Fallback rotation failed: {e}")
+    # Drop special days whose pick (or warehouse contents) no longer match the calendar
+    for date_str in list(data['workouts'].keys()):
+        data['workouts'][date_str] = [
+            w for w in data['workouts'][date_str]
+            if w.get('source') not in SPECIALS or not calendar.get(w['source']) or (
+                w.get('source') not in changed
+                and bool(w.get('ref')) == (SPECIAL_STORAGE == 'ref')
+                and (calendar.get(w['source']) or {}).get(date_str) == published_id(w)
+            )
+        ]
 
-    for i in range(DAYS):
-        date     = dates_14[i]
+    # One job per (day, source) still missing. Sources fetch concurrently (scheduler.py), each
+    # source's days in order; logs and results are applied below in the sequential order.
+    plan, jobs = [], []
+    for date in dates_14:
         date_str = date.strftime('%Y-%m-%d')
-        print(f"\n📅 {date_str}")
-        if date_str not in data['workouts']:
-            data['workouts'][date_str] = []
-
-        for src_id, src_name, fetch_fn, has_archive in SCRAPERS:
+        day = data['workouts'].setdefault(date_str, [])
+        for src_id, src_name, fetch_fn, has_archive in SOURCES:
             if not has_archive and date_str != today:
                 stats['skipped'] += 1
                 continue
+            cached = any(w['source'] == src_id for w in day)
+            missing = not cached and discovered.get(src_id, {}).get(date_str, (None,))[0] == 'missing'
+            plan.append((date_str, src_id, src_name, 'cached' if cached else 'missing' if missing else 'fetch'))
+            if not cached and not missing:
+                jobs.append(Job(key=(date_str, src_id), source=src_id,
+                                fn=partial(fetch_one, src_id, fetch_fn, date, date_str, calendar)))
+    print()
+    results = run_jobs(jobs)
 
-            already = any(w['source'] == src_id for w in data['workouts'][date_str])
-            if already:
-                print(f"  ✓ {src_name} (cached)")
-                stats['cached'] += 1
-                continue
+    last_day = None
+    for date_str, src_id, src_name, mode in plan:
+        if date_str != last_day:
+            print(f"\n📅 {date_str}")
+            last_day = date_str
+        if mode == 'cached':
+            print(f"  ✓ {src_name} (cached)")
+            stats['cached'] += 1
+            continue
+        if mode == 'missing':
+            print(f"  ⏭  {src_name} (not in sitemap)")
+            stats['unlisted'] += 1
+            continue
 
-            print(f"  ⬇ {src_name}...")
-            try:
-                if src_id == 'benchmark':
-                    if benchmark_wods is None:
-                        benchmark_wods = fetch_benchmarks_for_days(dates_benchmark)
-                    wod = benchmark_wods[i] if benchmark_wods and i < len(benchmark_wods) else None
-                else:
-                    wod = fetch_fn(date)
-                if wod and wod.get('sections') and any(s.get('lines') for s in wod['sections']):
-                    data['workouts'][date_str].append(wod)
-                    print(f"    ✅ Success!" + (" " + wod['sections'][0]['title'] if src_id == 'benchmark' else ""))
-                    stats['ok'] += 1
-                else:
-                    print(f"    ❌ No workout returned")
-                    stats['fail'] += 1
-            except Exception as e:
-                print(f"    ❌ Exception: {e}")
-                stats['fail'] += 1
+        print(f"  ⬇ {src_name}...")
+        wod, log, error = results[(date_str, src_id)]
+        print(log, end='')
+        if error:
+            print(f"    ❌ Exception: {error}")
+            stats['fail'] += 1
+        elif wod and wod.get('ref'):
+            data['workouts'][date_str].append(wod)
+            print(f"    ✅ Success! → {wod['ref']}")
+            stats['ok'] += 1
+        elif wod and wod.get('sections') and any(s.get('lines') for s in wod['sections']):
+            data['workouts'][date_str].append(wod)
+            print(f"    ✅ Success!" + (" " + wod['sections'][0]['title'] if src_id in SPECIALS else ""))
+            stats['ok'] += 1
+        else:
+            print(f"    ❌ No workout returned")
+            stats['fail'] += 1
+
+    # CF1013 watermark only up to days actually stored (a failed day is walked again next run)
+    advance_cf1013_watermark({d for d, wods in data['workouts'].items() if any(w['source'] == 'cf1013' for w in wods)})
+
+    # Lastmods of the days now stored → next run's unchanged / changed
+    for src_id, status in discovered.items():
+        remember(src_id, {
+            date_str: lastmod for date_str, (_, lastmod) in status.items()
+            if lastmod and any(w['source'] == src_id for w in data['workouts'].get(date_str, []))
+        }, version=SITEMAP_SOURCES[src_id].PARSER_VERSION)
+
+    # Structured model + eq_mask + duration for cached days too (once; again only when the parser, EQ or duration rules change)
+    stale = (data.get('structure_version') != STRUCTURE_VERSION or data.get('eq_sig') != EQ_SIG
+             or data.get('duration_version') != DURATION_VERSION)
+    restructured = 0
+    for wods in data['workouts'].values():
+        for w in wods:
+            if w.get('sections') and (stale or 'structure' not in w):
+                postprocess(w)
+                restructured += 1
+    data['structure_version'] = STRUCTURE_VERSION
+    data['eq_sig'] = EQ_SIG
+    data['duration_version'] = DURATION_VERSION
+    if restructured:
+        print(f"\n🧩 Structured {restructured} cached workouts (v{STRUCTURE_VERSION})")
 
     # Prune old days (cutoff based on Israel today)
     cutoff = (now_i - timedelta(days=DAYS)).strftime('%Y-%m-%d')
@@ -183,6 +333,8 @@ def main():
         print(f"\n🧹 Removed {len(removed)} old days")
 
     save(data)
+    if scraper_state.save():
+        print(f"🔖 Scraper state → {scraper_state.STATE_FILE.name}")
 
     total      = sum(len(v) for v in data['workouts'].values())
     days_with  = sum(1 for v in data['workouts'].values() if v)
@@ -191,7 +343,7 @@ def main():
         for w in wods:
             counts[w['source']] = counts.get(w['source'], 0) + 1
 
-    labels = {s[0]: s[1] for s in SCRAPERS}
+    labels = {s[0]: s[1] for s in SOURCES}
     print("\n" + "=" * 50)
     print(f"📊 Total workouts: {total}")
     print(f"📆 Days with data: {days_with}")
@@ -199,6 +351,7 @@ def main():
     print(f"❌ Failed: {stats['fail']}")
     print(f"💾 Cached: {stats['cached']}")
     print(f"⏭  Skipped (not today): {stats['skipped']}")
+    print(f"🗺  Not in sitemap: {stats['unlisted']}")
     print("\n📦 Per source:")
     for sid, cnt in sorted(counts.items()):
         print(f"  {labels.get(sid, sid)}: {cnt}")
@@ -13,15 +13,8 @@ import re
 from datetime import datetime
 
 import requests
-from bs4 import BeautifulSoup
-
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    )
-}
+
+from scrapers.net import http_get, make_soup
 
 DAY_MAP = {
     0: ("MONTAG", "Monday"),
@@ -159,12 +152,12 @@ def fetch_workout(date):
 
     try:
         print(f"    → Fetching {url}")
-        r = requests.get(url, timeout=15, headers=HEADERS)
+        r = http_get(url)
         if r.status_code != 200:
             print(f"    → HTTP {r.status_code}")
             return None
 
-        soup = BeautifulSoup(r.text, "html.parser")
+        soup = make_soup(r)
 
         body = soup.find("body") or soup
 
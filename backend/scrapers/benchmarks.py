@@ -8,21 +8,14 @@ Now also uses a local warehouse in data/special_cache.json
 """
 import json
 import re
-import hashlib
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
-HEADERS = {
-    'User-Agent': (
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-        'AppleWebKit/537.36 (KHTML, like Gecko) '
-        'Chrome/120.0.0.0 Safari/537.36'
-    ),
-}
+from scrapers.cleanup import CleanupRules, clean
+from scrapers.net import http_get, make_soup
 
 _BENCHMARK_CACHE = None
+CLEANUP = CleanupRules(tags=frozenset({'script', 'style', 'img', 'picture', 'video', 'iframe'}))
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR.parent / 'data'
@@ -59,15 +52,14 @@ def _scrape_all_benchmarks():
                 url += f'?page={page}'
 
             print(f"    → Fetching page {page}: {url}")
-            r = requests.get(url, timeout=15, headers=HEADERS)
+            r = http_get(url)
             if r.status_code != 200:
                 print(f"    → Page {page} HTTP {r.status_code}")
                 continue
 
-            soup = BeautifulSoup(r.text, 'html.parser')
+            soup = make_soup(r)
 
-            for tag in soup.find_all(['script', 'style', 'img', 'picture', 'video', 'iframe']):
-                tag.decompose()
+            clean(soup, CLEANUP)
 
             boxes = soup.find_all('li', class_='box')
             print(f"    -> Found {len(boxes)} boxes on page {page}")
@@ -204,59 +196,12 @@ def _make_benchmark_wod(selected, date_str):
     }
 
 
-def fetch_benchmarks_for_days(dates):
-    """
-    Returns one benchmark workout per date, with no duplicate workout names
-    across the given days (e.g. 15 days for 15-day window; use first 14 for display).
-    """
-    benchmarks = fetch_all_benchmarks()
-    if not benchmarks:
-        return []
-    n = len(benchmarks)
-    used_names = set()
-    result = []
-    for date in dates:
-        date_str = date.strftime('%Y-%m-%d') if hasattr(date, 'strftime') else str(date)[:10]
-        date_hash = int(hashlib.md5(date_str.encode()).hexdigest(), 16)
-        base_idx = date_hash % n
-        chosen_idx = base_idx
-        attempts = 0
-        while attempts < n:
-            name = benchmarks[chosen_idx]['name']
-            if name not in used_names:
-                break
-            chosen_idx = (chosen_idx + 1) % n
-            attempts += 1
-        selected = benchmarks[chosen_idx]
-        used_names.add(selected['name'])
-        result.append(_make_benchmark_wod(selected, date_str))
-    return result
-
-
-def fetch_benchmark(date):
-    """
-    בוחר אימון Benchmark יומי מהמחסן, עם רנדומציה דטרמיניסטית וחלון אי-חזרה של 14 יום.
-    (לשימוש בודד; ל־14 ימים עדיף fetch_benchmarks_for_days כדי למנוע כפילויות.)
-    """
-    benchmarks = fetch_all_benchmarks()
-    if not benchmarks:
-        print("    → No benchmarks available")
-        return None
-
-    date_str = date.strftime('%Y-%m-%d')
-    print(f"  ⬇ CrossFit Benchmark Workouts...")
-
-    date_hash = int(hashlib.md5(date_str.encode()).hexdigest(), 16)
-    chosen_idx = date_hash % len(benchmarks)
-    selected = benchmarks[chosen_idx]
-    print(f"    → Selected: {selected['name']} (#{chosen_idx + 1}/{len(benchmarks)})")
-
-    return _make_benchmark_wod(selected, date_str)
-
-
 if __name__ == '__main__':
-    # Test
-    result = fetch_benchmark(datetime.now())
+    # Test: today's pick from the rotation calendar (the same path fetch_all takes)
+    from scrapers.special_calendar import calendar_wod, ensure_calendar
+    today = datetime.now().strftime('%Y-%m-%d')
+    calendar, _ = ensure_calendar(today)
+    result = calendar_wod('benchmark', today, calendar)
     if result:
         print(f"\n✅ Success!")
         print(f"Title: {result['sections'][0]['title']}")
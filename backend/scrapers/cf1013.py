@@ -6,48 +6,34 @@ Structure on site:
 - Weekdays: <p> with <strong>Strength</strong> then <br/> and lines; <p> with <strong>WOD</strong>, then first line = sub-subheading (e.g. "Keepy Uppy"), rest = body
 - Saturday: single <p> with no strong – first line = title, rest = body
 - Pagination: next page = /wod?offset=... or /wod?offset=...&reversePaginate=true
+- Squarespace also serves the list as JSON (?format=json: items with title + body HTML) –
+  used first, the HTML page is the fallback
+- Watermark: newest article date up to which every indexed day is stored in workouts.json
+  (data/scraper_state.json, set by advance_watermark after the run); the next run stops there
 """
 import re
+from datetime import datetime, timedelta
+from html import escape
+
 import requests
 from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
 
-HEADERS = {
-    'User-Agent': (
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-        'AppleWebKit/537.36 (KHTML, like Gecko) '
-        'Chrome/120.0.0.0 Safari/537.36'
-    ),
-    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-}
+from scrapers import state
+from scrapers.cleanup import MEDIA_TAGS, NOISE_TAGS, CleanupRules, clean
+from scrapers.listing import ListingIndex, parse_date
+from scrapers.loads import LB_PER_KG
+from scrapers.net import http_get, make_soup
 
 BASE_URL = 'https://www.crossfit1013.com'
 WOD_URL = BASE_URL + '/wod'
-
-# h1 format: "Wednesday 03/04/2026" -> MM/DD/YYYY
-H1_DATE_RE = re.compile(r'\d{1,2}/\d{1,2}/\d{2,4}')
+HASH_LB_RE = re.compile(r'(\d+(?:\.\d+)?)\s*#')   # "55#", "135 #" – pounds on this site
 
 SKIP_LINES = {
     'norberto olalde', 'comment', 'leave a comment', 'crossfit 1013', 'crossfit1013',
 }
 
-
-def _h1_to_date_str(h1_text):
-    """Parse 'Wednesday 03/04/2026' -> '2026-03-04'."""
-    m = H1_DATE_RE.search(h1_text or '')
-    if not m:
-        return None
-    part = m.group(0)
-    parts = part.replace('-', '/').split('/')
-    if len(parts) != 3:
-        return None
-    try:
-        mo, day, year = int(parts[0]), int(parts[1]), int(parts[2])
-        if year < 100:
-            year += 2000
-        return f'{year}-{mo:02d}-{day:02d}'
-    except (ValueError, IndexError):
-        return None
+# Tag names only – removing by class can drop the main content container (e.g. navigation wraps content)
+CLEANUP = CleanupRules(tags=NOISE_TAGS | MEDIA_TAGS | {'video'})
 
 
 def _parens_as_note(line):
@@ -75,16 +61,10 @@ def _time_cap_as_note(line):
 
 
 def _convert_lbs_hash(line):
-    """In this source, # means pounds: 55#/35# → 25kg/16kg."""
+    """In this source, # means pounds: 55#/35# → 25kg/16kg, "(135 #)" → "(61kg)" – the rest of the line as is."""
     if not line or '#' not in line:
         return line
-
-    def repl(m):
-        lbs = float(m.group(1))
-        kg = round(lbs * 0.453592)
-        return str(kg) + 'kg'
-
-    return re.sub(r'(\d+(?:\.\d+)?)\s*#', repl, line)
+    return HASH_LB_RE.sub(lambda m: f"{round(float(m.group(1)) / LB_PER_KG)}kg", line)
 
 
 def _is_format_line(line):
@@ -137,15 +117,17 @@ def _parse_paragraph_with_strong(p, strong_text):
     return lines
 
 
+def _h1_text(article):
+    h1 = article.find('h1', class_='entry-title')
+    return h1.get_text() if h1 else None
+
+
 def parse_article(article):
     """
     Parse one <article>: date from h1.entry-title, sections from <p>.
     Returns (date_str, sections) or (None, None) if no date.
     """
-    h1 = article.find('h1', class_='entry-title')
-    if not h1:
-        return None, None
-    date_str = _h1_to_date_str(h1.get_text())
+    date_str = parse_date(_h1_text(article))  # "Wednesday 03/04/2026" -> MM/DD/YYYY
     if not date_str:
         return None, None
 
@@ -228,58 +210,190 @@ def _get_next_page_url(soup):
 
 def _fetch_page(url):
     """Fetch one WOD page; return (soup, next_page_url or None)."""
-    r = requests.get(url, timeout=15, headers=HEADERS)
+    r = http_get(url)
     if r.status_code != 200:
         return None, None
-    soup = BeautifulSoup(r.text, 'html.parser')
-    for tag in soup.find_all(['script', 'style', 'iframe', 'noscript', 'form', 'video']):
-        tag.decompose()
-    for tag in soup.find_all(['img', 'picture', 'figure']):
-        tag.decompose()
-    # Do not remove by class – it can remove the main content container (e.g. navigation wraps content)
+    soup = make_soup(r)
+    clean(soup, CLEANUP)
     next_url = _get_next_page_url(soup)
     return soup, next_url
 
 
-# Cache: date_str -> workout dict. Filled by ensure_cache().
+def _item_article(item):
+    """Squarespace JSON item → the <article> parse_article expects (h1.entry-title + body)."""
+    soup = BeautifulSoup(f'<article><h1 class="entry-title">{escape(item.get("title") or "")}</h1>'
+                         f'{item.get("body") or ""}</article>', 'html.parser')
+    clean(soup, CLEANUP)
+    return soup.article
+
+
+def _fetch_json_page(url):
+    """
+    Squarespace collection JSON (same URL + format=json): items with title + body HTML and the
+    next page offset. (articles, next_url); NOT_JSON when the site answered 200 with something
+    else (it does not serve the listing); None on a transient failure (timeout, 5xx …).
+    """
+    try:
+        r = http_get(url, params={'format': 'json'})
+    except requests.RequestException as e:
+        print(f"    -> JSON listing failed: {e}")
+        return None
+    if r.status_code != 200:
+        return None
+    if 'json' not in (r.headers.get('Content-Type') or ''):
+        return NOT_JSON
+    try:
+        payload = r.json()
+    except ValueError:
+        return NOT_JSON
+    items = payload.get('items') if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        return NOT_JSON
+    next_url = (payload.get('pagination') or {}).get('nextPageUrl')
+    if next_url and next_url.startswith('/'):
+        next_url = BASE_URL + next_url
+    return [_item_article(it) for it in items if isinstance(it, dict)], next_url or None
+
+
+def _fetch_listing(url):
+    """One listing page → (articles, next_url): JSON listing first, HTML page as fallback. (None, None) on failure."""
+    global _cf1013_json
+    if _cf1013_json:
+        print(f"    -> Fetching {url} (JSON)")
+        page = _fetch_json_page(url)
+        if page and page is not NOT_JSON:
+            if not state.get(STATE_KEY).get('json_listing', True):
+                state.update(STATE_KEY, json_listing=True)   # answered again after JSON_RETRY_DAYS
+            return page
+        _cf1013_json = False
+        if page is NOT_JSON:  # a definitive answer: later runs go straight to HTML (for a while)
+            state.update(STATE_KEY, json_listing=False, json_checked=datetime.now().strftime('%Y-%m-%d'))
+        print(f"    -> No JSON listing – parsing the HTML page")
+    else:
+        print(f"    -> Fetching {url}")
+    soup, next_url = _fetch_page(url)
+    if not soup:
+        return None, None
+    return soup.find_all('article'), next_url
+
+
+# Cache: date_str -> workout dict, parsed on demand from the article index (listing.py).
+# One walk from page 1 covers the whole window; it stops early at the watermark – the newest
+# article an earlier run indexed and stored, with every indexed day before it (advance_watermark,
+# data/scraper_state.json) – so a cron run that finds everything older already stored fetches
+# page 1 only.
 _cf1013_cache = {}
+_cf1013_index = None
+_cf1013_next_url = WOD_URL
 _cf1013_pages_fetched = 0
+_cf1013_json = True       # off once the site answers format=json with something else (remembered JSON_RETRY_DAYS)
+_cf1013_known = None      # watermark at the start of the run
+_cf1013_window = None     # oldest date the first walk covers
 MAX_PAGES = 5  # enough for 2 weeks (4 workouts per page)
+WINDOW_DAYS = 14  # fetch_all.DAYS
+STATE_KEY = 'cf1013'
+PARSER_VERSION = 1  # bump when parse_article changes: the watermark is dropped and the window re-walked
+JSON_RETRY_DAYS = 30   # a "not JSON" answer is trusted this long, then format=json is tried again
+NOT_JSON = object()
+
+
+def _json_listing():
+    """Try format=json this run? Yes, unless the site said "not JSON" in the last JSON_RETRY_DAYS."""
+    st = state.get(STATE_KEY)
+    if st.get('json_listing', True):
+        return True
+    try:
+        checked = datetime.strptime(st.get('json_checked') or '', '%Y-%m-%d')
+    except ValueError:
+        return True
+    return datetime.now() - checked >= timedelta(days=JSON_RETRY_DAYS)
+
+
+def watermark():
+    """Newest article date an earlier run (this parser version) stored with every day before it, else None."""
+    st = state.get(STATE_KEY)
+    return st.get('newest') if st.get('version') == PARSER_VERSION else None
+
+
+def reset_watermark():
+    """Walk the whole window this run (fetch_all: when the stored cf1013 days are being re-fetched)."""
+    global _cf1013_known
+    state.reset(STATE_KEY)
+    _cf1013_known = None
+
+
+def _walk(until):
+    """
+    Index listing pages, continuing where the last walk stopped, until the list is older than
+    `until`, reaches the watermark, runs out of pages or hits MAX_PAGES.
+    """
+    global _cf1013_index, _cf1013_next_url, _cf1013_pages_fetched
+    if _cf1013_index is None:
+        _cf1013_index = ListingIndex('cf1013', _h1_text)
+    index = _cf1013_index
+    while _cf1013_next_url and _cf1013_pages_fetched < MAX_PAGES:
+        if index.oldest and index.oldest < until:
+            break
+        if _cf1013_known and index.oldest and index.oldest <= _cf1013_known:
+            print(f"    -> Reached watermark {_cf1013_known} – older days are already stored")
+            break
+        url = _cf1013_next_url
+        articles, next_url = _fetch_listing(url)
+        if articles is None:
+            _cf1013_next_url = None
+            break
+        _cf1013_pages_fetched += 1
+        index.add_page(articles)
+        _cf1013_next_url = next_url if next_url != url else None
+
+
+def advance_watermark(stored):
+    """
+    After the run (fetch_all): move the watermark up to the newest indexed article such that
+    every indexed day of the window after the old watermark is in `stored` (dates with a cf1013
+    workout in workouts.json). A day that failed to parse keeps the watermark before it, so the
+    next run walks back to it again.
+    """
+    if _cf1013_index is None or _cf1013_window is None:
+        return
+    newest = _cf1013_known
+    for d in sorted(_cf1013_index.articles):
+        if d < _cf1013_window or (_cf1013_known and d <= _cf1013_known):
+            continue
+        if d not in stored:
+            print(f"    -> cf1013 {d} indexed but not stored – watermark stays at {newest}")
+            break
+        newest = d
+    if newest and newest != _cf1013_known:
+        state.update(STATE_KEY, newest=newest, version=PARSER_VERSION)
 
 
 def ensure_cache_for_date(target_date):
-    """Fetch WOD pages until we have target_date in cache or we've done MAX_PAGES."""
-    global _cf1013_cache, _cf1013_pages_fetched
+    """
+    First call: index the whole window (WINDOW_DAYS back from target_date) in one pass.
+    Later calls only walk on for dates older than that; then parse only that date's article.
+    """
+    global _cf1013_known, _cf1013_window, _cf1013_json
     date_str = target_date.strftime('%Y-%m-%d')
     if date_str in _cf1013_cache:
         return
-    url = WOD_URL
-    pages_done = 0
-    while pages_done < MAX_PAGES:
-        print(f"    -> Fetching {url}")
-        soup, next_url = _fetch_page(url)
-        if not soup:
-            break
-        pages_done += 1
-        _cf1013_pages_fetched += 1
-        for article in soup.find_all('article'):
-            d, sections = parse_article(article)
-            if not d:
-                continue
-            if d not in _cf1013_cache:
-                _cf1013_cache[d] = {
-                    'date': d,
-                    'source': 'cf1013',
-                    'source_name': 'CrossFit 1013',
-                    'url': WOD_URL,
-                    'sections': sections,
-                }
-        if date_str in _cf1013_cache:
-            return
-        if not next_url or next_url == url:
-            break
-        url = next_url
-    return
+    if _cf1013_window is None:
+        _cf1013_known = watermark()
+        _cf1013_json = _json_listing()
+        _cf1013_window = (target_date - timedelta(days=WINDOW_DAYS - 1)).strftime('%Y-%m-%d')
+    _walk(min(date_str, _cf1013_window))
+
+    article = _cf1013_index.get(date_str)
+    if article is None:
+        return
+    _, sections = parse_article(article)
+    _cf1013_cache[date_str] = {
+        'date': date_str,
+        'source': 'cf1013',
+        'source_name': 'CrossFit 1013',
+        'url': WOD_URL,
+        'sections': sections,
+    }
 
 
 def fetch_workout(date):
@@ -290,6 +404,8 @@ def fetch_workout(date):
     if w:
         total = sum(len(s.get('lines', [])) for s in w.get('sections', []))
         print(f"    -> SUCCESS: {len(w['sections'])} sections, {total} lines")
+    elif _cf1013_known and date_str <= _cf1013_known:
+        print(f"    -> Date {date_str} not found (at or before watermark {_cf1013_known}: no post that day)")
     else:
         print(f"    -> Date {date_str} not found (checked {_cf1013_pages_fetched} pages)")
     return w
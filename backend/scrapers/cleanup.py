@@ -0,0 +1,95 @@
+"""
+DOM cleanup in one tree walk – a declarative rule set per source instead of one
+soup.find_all(...).decompose() pass per kind of noise.
+
+    RULES = CleanupRules(
+        tags=NOISE_TAGS | MEDIA_TAGS,        # tag names removed with their subtree
+        class_re=NAV_FOOTER_RE,              # any class token (or the whole class string, like find_all(class_=re))
+        id_re=NAV_FOOTER_RE,
+        keep_re=re.compile(r'entry-'),       # class/id that is never removed (its children are still checked)
+    )
+    stats = clean(soup, RULES)               # → "12 removed (tag 9, class 3) of 840 tags in 1.4 ms"
+
+The walk collects the nodes to drop (without descending into them) and decomposes them
+at the end, so the result is the same tree the old sequential passes produced.
+"""
+import re
+import time
+from dataclasses import dataclass, field
+
+from bs4 import Tag
+
+NOISE_TAGS = frozenset({'script', 'style', 'iframe', 'noscript', 'form'})
+MEDIA_TAGS = frozenset({'img', 'picture', 'figure'})
+# Page-level header / nav / footer only – content often sits in <header class="entry-header">
+NAV_FOOTER_RE = re.compile(
+    r'site-header|page-header|main-header|site-navigation|'
+    r'primary-navigation|site-footer|page-footer|main-footer', re.I
+)
+# Only OBVIOUS junk containers (anchored: "widget-area", not "elementor-widget")
+SAFE_JUNK_RE = re.compile(
+    r'^(sidebar|comment-|widget-|share-buttons|social-share|'
+    r'breadcrumb|cookie-notice|popup-|modal-)', re.I
+)
+
+
+@dataclass(frozen=True)
+class CleanupRules:
+    tags: frozenset = frozenset()
+    classes: frozenset = frozenset()   # exact class tokens (find_all(class_=[...]))
+    class_re: re.Pattern | None = None
+    id_re: re.Pattern | None = None
+    keep_re: re.Pattern | None = None
+
+    def match(self, tag):
+        """Name of the rule that removes `tag` ('tag' / 'class' / 'id'), or None."""
+        classes = tag.get('class') or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+        tag_id = tag.get('id')
+        if self.keep_re and (any(self.keep_re.search(c) for c in classes)
+                             or (tag_id and self.keep_re.search(tag_id))):
+            return None
+        if tag.name in self.tags:
+            return 'tag'
+        if classes and (self.classes and not self.classes.isdisjoint(classes) or self.class_re and (
+                any(self.class_re.search(c) for c in classes)
+                or len(classes) > 1 and self.class_re.search(' '.join(classes)))):
+            return 'class'
+        if tag_id and self.id_re and self.id_re.search(tag_id):
+            return 'id'
+        return None
+
+
+@dataclass
+class CleanupStats:
+    removed: int = 0
+    visited: int = 0
+    ms: float = 0.0
+    by_rule: dict = field(default_factory=dict)
+
+    def __str__(self):
+        rules = ', '.join(f"{k} {v}" for k, v in self.by_rule.items())
+        return f"{self.removed} removed ({rules or 'none'}) of {self.visited} tags in {self.ms:.1f} ms"
+
+
+def clean(root, rules):
+    """Remove every tag under `root` that matches `rules` (with its subtree) in one walk → CleanupStats."""
+    t0 = time.perf_counter()
+    stats = CleanupStats()
+    doomed = []
+    stack = [c for c in reversed(root.contents) if isinstance(c, Tag)]
+    while stack:
+        tag = stack.pop()
+        stats.visited += 1
+        rule = rules.match(tag)
+        if rule:
+            doomed.append(tag)
+            stats.by_rule[rule] = stats.by_rule.get(rule, 0) + 1
+            continue
+        stack.extend(c for c in reversed(tag.contents) if isinstance(c, Tag))
+    for tag in doomed:
+        tag.decompose()
+    stats.removed = len(doomed)
+    stats.ms = (time.perf_counter() - t0) * 1000
+    return stats
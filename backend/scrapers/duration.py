@@ -0,0 +1,169 @@
+"""
+Workout duration estimate – numeric bounds in minutes, computed once at ingest.
+
+    "duration": {"min": 12, "max": 15, "basis": "time_cap"}
+
+Per WOD section (same sections as taxonomy.wod_text / getWodOnlyText in the app), from
+the title and the parsed `structure`:
+  header        – "CONDITIONING 35MIN" / "16 MIN CLOCK": the coach's own length for the section
+  amrap / emom  – the stated length
+  target        – the coach's "Target Score: 14-18 minutes" ("<10:00" reads as a cap)
+  time_cap      – For Time with a cap ("TC: 15 min" too): between ~60% of the cap and the cap
+  volume        – For Time / rounds without a cap: rounds × movement volume at a work rate
+                  (barbell lifts and loaded movements at the slower LIFT rate)
+  text          – no structure: the first "X min" in the WOD text (the app's old heuristic),
+                  never the interval of an "every 2 min" clock
+Sequential sections are summed; a target after a workout split over several sections
+replaces them. Scaled options (Rx / Intermediate / Beginner …) in a row are
+alternatives – one of them is done – so the group counts as its longest option; a bare
+"10 minute time cap" note after a part caps that part instead of adding to it.
+No estimate → no field; the app then scores time as before.
+Bump DURATION_VERSION when the rules change (stored days and warehouse entries are re-derived).
+"""
+import re
+
+from scrapers.taxonomy import wod_section_indices, wod_text
+
+DURATION_VERSION = 3
+
+CAP_FLOOR = 0.6          # fraction of a time cap a typical athlete needs at least
+VOLUME_SPREAD = 0.25     # ± around the volume estimate
+SECONDS_PER = {          # work rate per unit of a movement line
+    'rep': 3.0,
+    'cal': 4.0,
+    'm': 0.3,            # ~2:00 per 400 m run / 500 m row
+    'km': 300.0,
+    'ft': 0.5,
+    'mi': 540.0,
+    'lift': 6.0,         # barbell cycling / loaded reps
+}
+TEXT_MINUTES_RE = re.compile(r'(?<!every )(\d+)\s*(min|minute)', re.I)   # not an EMOM interval
+HEADER_MINUTES_RE = re.compile(r'(\d+)\s*[-\s]?\s*min(?:ute)?s?\b', re.I)
+CAP_WORD_RE = re.compile(r'\bcap', re.I)
+OPTION_RE = re.compile(
+    r'^(?:rx\b|rx\+|scaled|intermediate|beginner|advanced|foundations?|masters?|level\s*\d|option\s*\w\b|'
+    r'competitor|performance|fitness)', re.I)
+LIFT_RE = re.compile(r'clean|jerk|snatch|deadlift|thruster|(?:back|front|overhead)\s*squat|press', re.I)
+NOTE_NAME_RE = re.compile(r'^(?:men|women|male|female)\b', re.I)   # "*Men use 95 lb.*" under 21-15-9
+TARGET_RE = re.compile(
+    r'^target(?: score)?\s*:?\s*(<\s*|sub\s*)?(\d+)(?::\d\d)?(?:\s*[-–]\s*(\d+)(?::\d\d)?)?\s*(?:min|$)', re.I)
+TC_RE = re.compile(r'\btc\s*[:\-]?\s*(\d+)', re.I)
+
+
+def _volume_seconds(st):
+    """Rounds × (sum of movement volume) at SECONDS_PER – None when nothing is countable."""
+    movements = st.get('movements') or []
+    scheme = st.get('rep_scheme') or []
+    per_round = 0.0
+    for mv in movements:
+        if NOTE_NAME_RE.match(mv.get('name') or ''):
+            continue
+        unit = mv.get('unit') or 'rep'
+        reps = mv.get('reps')
+        if reps is None:
+            reps = sum(scheme)  # bare movement under a 21-15-9 scheme
+        if reps:
+            if unit == 'rep' and LIFT_RE.search(mv.get('name') or ''):
+                unit = 'lift'
+            per_round += reps * SECONDS_PER.get(unit, SECONDS_PER['rep'])
+    if not per_round:
+        return None
+    return per_round * (st.get('rounds') or 1)
+
+
+def _header_minutes(sec):
+    """"CONDITIONING 35MIN" → 35; None for titles without a length (or with a time cap)."""
+    title = str(sec.get('title') or '')
+    m = HEADER_MINUTES_RE.search(title)
+    return int(m.group(1)) if m and not CAP_WORD_RE.search(title) and int(m.group(1)) else None
+
+
+def _cap_bounds(cap, basis='time_cap'):
+    return max(1, round(cap * CAP_FLOOR)), cap, basis
+
+
+def _target(lines):
+    """(lo, hi, 'target') from a "Target Score: 28 minutes" line, else None."""
+    for line in lines or []:
+        m = TARGET_RE.match(str(line).strip())
+        if m:
+            lo, hi = int(m.group(2)), int(m.group(3) or m.group(2))
+            return _cap_bounds(hi, 'target') if m.group(1) else (lo, hi, 'target')
+    return None
+
+
+def _section_bounds(st, sec=None):
+    fmt = st.get('format')
+    lines = (sec or {}).get('lines')
+    if fmt in ('AMRAP', 'EMOM') and st.get('minutes'):
+        return st['minutes'], st['minutes'], fmt.lower()
+    target = _target(lines)
+    if target:
+        return target
+    if st.get('time_cap'):
+        return _cap_bounds(st['time_cap'])
+    m = TC_RE.search(' '.join(str(l) for l in lines or []))
+    if m and int(m.group(1)):
+        return _cap_bounds(int(m.group(1)))
+    if fmt == 'For Time' or st.get('rounds') or st.get('rep_scheme'):
+        seconds = _volume_seconds(st)
+        if seconds:
+            minutes = seconds / 60
+            return (max(1, round(minutes * (1 - VOLUME_SPREAD))),
+                    max(1, round(minutes * (1 + VOLUME_SPREAD))), 'volume')
+    return None
+
+
+def _is_cap_note(st):
+    """A section that only states a time cap ("10 minute time cap on Rx and Intermediate")."""
+    return bool(st.get('time_cap')) and not st.get('movements') and not st.get('format')
+
+
+def _parts(wod, structure):
+    """[[lo, hi, basis, is_option_group]] – the sequential parts of the WOD sections."""
+    secs = wod.get('sections') or []
+    parts = []
+    piece = None   # index of the part where the last "For Time" / AMRAP … section started
+    for i in wod_section_indices(wod):
+        sec = secs[i] or {}
+        st = (structure[i] if i < len(structure) else {}) or {}
+        option = bool(OPTION_RE.match(str(sec.get('title') or '').strip()))
+        minutes = _header_minutes(sec)
+        bounds = (minutes, minutes, 'header') if minutes else _section_bounds(st, sec)
+        if not bounds:
+            continue
+        prev = parts[-1] if parts else None
+        if prev and _is_cap_note(st) and not minutes:
+            if prev[3]:            # cap on the options: one more alternative
+                prev[0], prev[1] = max(prev[0], bounds[0]), max(prev[1], bounds[1])
+            elif prev[2] == 'volume':
+                prev[:3] = bounds  # the cap bounds that part
+            continue
+        if option and prev and prev[3]:
+            prev[0], prev[1] = max(prev[0], bounds[0]), max(prev[1], bounds[1])
+            if bounds[2] not in prev[2].split('|'):
+                prev[2] += '|' + bounds[2]
+            continue
+        if bounds[2] == 'target' and not st.get('format') and piece is not None:
+            del parts[piece:]      # the target closes a workout split over several sections
+        if st.get('format'):
+            piece = len(parts)
+        parts.append([bounds[0], bounds[1], bounds[2], option])
+    return parts
+
+
+def estimate_duration(wod, structure):
+    """{'min', 'max', 'basis'} for the WOD sections of `wod` (structure aligned with sections), or None."""
+    parts = _parts(wod, structure)
+    if parts:
+        bases = []
+        for part in parts:
+            for basis in part[2].split('|'):
+                if basis not in bases:
+                    bases.append(basis)
+        return {'min': sum(p[0] for p in parts), 'max': sum(p[1] for p in parts), 'basis': '+'.join(bases)}
+    m = TEXT_MINUTES_RE.search(wod_text(wod))
+    if m:
+        x = int(m.group(1))
+        return {'min': x, 'max': x, 'basis': 'text'}
+    return None
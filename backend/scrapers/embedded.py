@@ -0,0 +1,127 @@
+"""
+Embedded page data – the JSON a Next.js page already carries, read without building its DOM.
+
+crossfit.com is a Next.js app: every page ships its props as
+<script id="__NEXT_DATA__" type="application/json"> (and an Article as JSON-LD), which the
+cleanup used to decompose before guessing a content container. Here the two scripts are cut
+out of the raw page text with one regex each and searched as JSON:
+
+    found, html = find_body(text, ('wodBody', 'articleBody', 'content'))
+    # → ('__NEXT_DATA__', '<p>Back squat 5-5-5</p>…') – first key (in order) with a long enough string
+    found, records = find_records(text, ('title', 'name'), ('content', 'workout'))
+    # → ('__NEXT_DATA__', [(title, html), …]) – the largest list of {title, body} objects
+
+Keys match case-insensitively; __NEXT_DATA__ is searched before JSON-LD. Nothing found →
+(None, None) and the caller uses its DOM path.
+"""
+import json
+import re
+from html import escape
+
+from bs4 import BeautifulSoup
+
+NEXT_DATA_RE = re.compile(r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S | re.I)
+JSON_LD_RE = re.compile(r'<script[^>]*\btype=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+TAG_RE = re.compile(r'<(?:[a-z][a-z0-9]*|/[a-z])[\s>/]', re.I)
+MIN_BODY = 40   # shorter strings are labels / meta descriptions, not a workout
+
+
+def _loads(raw):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def payloads(text):
+    """[(name, JSON object)] – the page's __NEXT_DATA__, then each JSON-LD block."""
+    found = []
+    m = NEXT_DATA_RE.search(text)
+    if m:
+        data = _loads(m.group(1))
+        if data is not None:
+            found.append(('__NEXT_DATA__', data))
+    for m in JSON_LD_RE.finditer(text):
+        data = _loads(m.group(1))
+        if data is not None:
+            found.append(('JSON-LD', data))
+    return found
+
+
+def _nodes(obj):
+    """Every dict and list in the object, depth-first (no recursion limit on deep props)."""
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(v for v in node.values() if isinstance(v, (dict, list)))
+        elif isinstance(node, list):
+            yield node
+            stack.extend(v for v in node if isinstance(v, (dict, list)))
+
+
+def _field(node, keys):
+    """First string value of `node` under one of `keys` (lowercased)."""
+    for k, v in node.items():
+        if isinstance(v, str) and k.lower() in keys:
+            return v
+    return None
+
+
+def as_html(value):
+    """A payload string as an HTML fragment (plain text → one <p> per line)."""
+    if TAG_RE.search(value):
+        return value
+    return ''.join(f'<p>{escape(line)}</p>' for line in value.split('\n') if line.strip())
+
+
+def fragment_text(value):
+    """Text of a payload string, one line per block (what get_text('\\n') gives on the page)."""
+    if not TAG_RE.search(value):
+        return value
+    return BeautifulSoup(value, 'html.parser').get_text(separator='\n')
+
+
+def find_body(text, keys, min_len=MIN_BODY):
+    """
+    (payload name, HTML fragment) for the first of `keys` (in order) that holds a string of
+    at least min_len chars – the longest one under that key – else (None, None).
+    """
+    rank = {k.lower(): i for i, k in enumerate(keys)}
+    for name, data in payloads(text):
+        best, best_rank = None, len(rank)
+        for node in _nodes(data):
+            if not isinstance(node, dict):
+                continue
+            for k, v in node.items():
+                i = rank.get(k.lower())
+                if i is None or not isinstance(v, str) or len(v.strip()) < min_len:
+                    continue
+                if i < best_rank or (i == best_rank and len(v) > len(best)):
+                    best, best_rank = v, i
+        if best is not None:
+            return name, as_html(best)
+    return None, None
+
+
+def find_records(text, title_keys, body_keys, min_items=2):
+    """(payload name, [(title, body)]) from the largest list of objects having both fields, else (None, None)."""
+    title_keys = {k.lower() for k in title_keys}
+    body_keys = {k.lower() for k in body_keys}
+    for name, data in payloads(text):
+        best = []
+        for node in _nodes(data):
+            if not isinstance(node, list) or len(node) <= len(best):
+                continue
+            records = []
+            for item in node:
+                if isinstance(item, dict):
+                    title, body = _field(item, title_keys), _field(item, body_keys)
+                    if title and body:
+                        records.append((title.strip(), body))
+            if len(records) > len(best):
+                best = records
+        if len(best) >= min_items:
+            return name, best
+    return None, None
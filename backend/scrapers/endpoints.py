@@ -0,0 +1,185 @@
+"""
+Structured endpoints – a whole date window of posts in one request instead of one themed
+HTML page per day (most of whose parse time went into removing nav / footers).
+
+A source declares what it has, tried in order; the HTML scraper stays the fallback:
+
+    ENDPOINTS = (
+        Endpoint('wp', 'https://crossfitrestoration.com', key='slug'),   # WP REST /wp-json/wp/v2/posts?after=…
+        Endpoint('feed', 'https://crossfitrestoration.com/feed/', key='slug'),  # RSS 2.0 / Atom
+    )
+    posts = window_posts('restoration', ENDPOINTS, date)   # {iso date: Post}, or None → scrape HTML
+    post = posts.get('2026-02-16')                          # Post(title, link, published, html)
+
+`key` says which field carries the WOD date: 'slug' (wod-february-16-2026), 'title'
+("Monday 16th February") or 'published' (the post date). The first call for a source
+fetches the WINDOW_DAYS up to that date (plus LEAD_DAYS for posts published ahead) and the
+result is reused for every other day of the run; an endpoint that errors, is not JSON/XML
+or has no dated posts in the window is skipped, and when none answers the source uses HTML for
+the rest of the run.
+"""
+import html
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from scrapers.listing import parse_date
+from scrapers.net import http_get
+
+WINDOW_DAYS = 14   # fetch_all.DAYS
+LEAD_DAYS = 3      # posts can go up a few days before the WOD date
+WP_PER_PAGE = 100
+WP_MAX_PAGES = 3
+WP_FIELDS = 'date,link,slug,title,content'
+
+NS = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+}
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    kind: str              # 'wp' (WordPress REST) / 'feed' (RSS 2.0 or Atom)
+    url: str               # site root for 'wp', the feed URL for 'feed'
+    key: str = 'title'     # 'slug' / 'title' / 'published' – where the WOD date is
+    numeric: str = 'mdy'   # listing.parse_date order for numeric dates in titles
+
+
+@dataclass(frozen=True)
+class Post:
+    title: str
+    link: str
+    published: str         # ISO date the post went up
+    html: str              # post content only (no theme)
+
+
+def _iso(value):
+    """WP / Atom ISO timestamp or RSS RFC 822 date → 'YYYY-MM-DD' (None if unparsable)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).date().isoformat()
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).date().isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _wp_posts(endpoint, after, before):
+    url = endpoint.url.rstrip('/') + '/wp-json/wp/v2/posts'
+    params = {'after': f'{after}T00:00:00', 'before': f'{before}T23:59:59', 'per_page': WP_PER_PAGE,
+              'orderby': 'date', '_fields': WP_FIELDS}
+    posts = []
+    for page in range(1, WP_MAX_PAGES + 1):
+        r = http_get(url, params={**params, 'page': page})
+        if r.status_code != 200 or 'json' not in (r.headers.get('Content-Type') or ''):
+            return None if page == 1 else posts
+        items = r.json()
+        if not isinstance(items, list):
+            return None
+        for it in items:
+            posts.append(Post(
+                title=html.unescape((it.get('title') or {}).get('rendered') or ''),
+                link=it.get('link') or '',
+                published=_iso(it.get('date')),
+                html=(it.get('content') or {}).get('rendered') or '',
+            ))
+        if page >= int(r.headers.get('X-WP-TotalPages') or 1):
+            break
+    return posts
+
+
+def _text(node, path):
+    found = node.find(path, NS)
+    return (found.text or '') if found is not None else ''
+
+
+def _feed_posts(endpoint, after, before):
+    r = http_get(endpoint.url)
+    if r.status_code != 200:
+        return None
+    root = ET.fromstring(r.content)
+    posts = []
+    for item in root.iter('item'):                                   # RSS 2.0
+        posts.append(Post(
+            title=_text(item, 'title'), link=_text(item, 'link'),
+            published=_iso(_text(item, 'pubDate')),
+            html=_text(item, 'content:encoded') or _text(item, 'description'),
+        ))
+    for entry in root.iter(f"{{{NS['atom']}}}entry"):               # Atom
+        link = entry.find('atom:link', NS)
+        posts.append(Post(
+            title=_text(entry, 'atom:title'), link=link.get('href', '') if link is not None else '',
+            published=_iso(_text(entry, 'atom:published') or _text(entry, 'atom:updated')),
+            html=_text(entry, 'atom:content') or _text(entry, 'atom:summary'),
+        ))
+    return [p for p in posts if p.published and after <= p.published <= before]
+
+
+ADAPTERS = {'wp': _wp_posts, 'feed': _feed_posts}
+
+
+def post_date(endpoint, post):
+    """The WOD date a post is for, per endpoint.key."""
+    if endpoint.key == 'published':
+        return post.published
+    if endpoint.key == 'slug':
+        slug = urlparse(post.link).path.rstrip('/').rsplit('/', 1)[-1]
+        return parse_date(slug.replace('-', ' '), endpoint.numeric)
+    return parse_date(post.title, endpoint.numeric)
+
+
+def fetch_window(endpoints, after, before):
+    """
+    {iso date: Post} from the first endpoint with posts between `after` and `before`,
+    or None when none answers. First post per date wins (newest first).
+    """
+    for endpoint in endpoints:
+        try:
+            posts = ADAPTERS[endpoint.kind](endpoint, after, before)
+        except Exception as e:
+            print(f"    → {endpoint.kind} endpoint failed: {e}")
+            continue
+        if not posts:
+            print(f"    → {endpoint.kind} endpoint: no posts")
+            continue
+        by_date = {}
+        for post in sorted(posts, key=lambda p: p.published or '', reverse=True):
+            d = post_date(endpoint, post)
+            if d and d not in by_date:
+                by_date[d] = post
+        if not by_date:
+            print(f"    → {endpoint.kind} endpoint: {len(posts)} posts, none dated by {endpoint.key}")
+            continue
+        print(f"    → {endpoint.kind} endpoint: {len(posts)} posts, {len(by_date)} dated ({endpoint.url})")
+        return by_date
+    return None
+
+
+_lock = threading.Lock()
+_windows = {}   # source → (first date, last date, {iso date: Post} or None)
+
+
+def window_posts(source, endpoints, date, days=WINDOW_DAYS):
+    """
+    {iso date: Post} covering `date` for `source` – fetched once per run for the `days` up to the
+    first requested date – or None when no endpoint answers (the caller scrapes HTML).
+    """
+    date_str = date.strftime('%Y-%m-%d')
+    with _lock:
+        cached = _windows.get(source)
+    if cached and (cached[2] is None or cached[0] <= date_str <= cached[1]):
+        return cached[2]
+    first = (date - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+    after = (date - timedelta(days=days - 1 + LEAD_DAYS)).strftime('%Y-%m-%d')
+    posts = fetch_window(endpoints, after, date_str)
+    with _lock:
+        _windows[source] = (first, date_str, posts)
+    return posts
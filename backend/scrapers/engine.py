@@ -0,0 +1,255 @@
+"""
+Generic scraper engine – one declarative SourceSpec per site instead of a bespoke module.
+
+crossfit.com, Restoration and Postal were near-copies of the same pipeline: fetch, clean up,
+find the content container, stream the lines, skip to a date marker, filter nav / stop
+lines, cap, sectionize. fetch() is that pipeline once; a site is the data that differed:
+
+    SPEC = SourceSpec(
+        id='restoration', name='CrossFit Restoration',
+        url=make_url,                           # callable(date) or a strftime template
+        cleanup=CLEANUP,                        # cleanup.CleanupRules
+        sectionize=parse_sections,              # [lines] → sections
+        start_re=DATE_HDR,                      # skip to the first matching line (whole page if none)
+        stop=(INTERMEDIATE_RE, STOP_PREFIX_RE), # .search() hit → end of the workout
+        skip_words=NAV_WORDS, skip=(WOD_LINK_RE,),
+        max_len=200, max_lines=60,
+    )
+    fetch_workout = make_fetcher(SPEC)
+
+Adding a gym is one spec plus one SCRAPERS row in fetch_all.py. A spec with `endpoints`
+(WP REST / RSS / Atom, see endpoints.py) reads the whole date window from one request and
+only scrapes HTML pages when no endpoint answers; a spec with `embedded` keys reads the workout
+from the page's __NEXT_DATA__ / JSON-LD (embedded.py) before building the DOM. Requests go through the
+shared client (net.http_get), and fetch_all runs the sources through scheduler.py. Sites
+that need a listing walk or a JSON API (myleo, cf1013, tonbridge, panda) stay bespoke.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+import requests
+from bs4 import BeautifulSoup
+
+from scrapers.cleanup import CleanupRules, clean
+from scrapers.embedded import find_body
+from scrapers.endpoints import window_posts
+from scrapers.extract import MAX_LINK_DENSITY, best_block
+from scrapers.lines import iter_lines
+from scrapers.net import http_get, make_soup, response_text
+from scrapers.strategy import pick
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    id: str
+    name: str
+    url: str | Callable                  # strftime template ('https://x.com/%y%m%d') or callable(date) → url
+    sectionize: Callable                 # [str] (or [lines.Line] with line_tokens) → sections
+    cleanup: CleanupRules | None = None
+    containers: tuple = ()               # CSS selectors tried in order; none → <body>
+    density_fallback: tuple = ()         # extract.best_block tags when no container matched
+    density_links: float | None = MAX_LINK_DENSITY  # best_block max_link_density (None = plain largest block)
+    start_re: object = None              # date marker: lines before it are dropped (kept if it never shows)
+    stop: tuple = ()                     # patterns searched in the lowercased line → stop
+    skip: tuple = ()                     # patterns searched in the lowercased line → drop the line
+    skip_words: frozenset = frozenset()  # exact lowercased lines to drop (nav links)
+    filter: object = None                # keywords.KeywordSets – .first(lo) → 'stop' / 'skip' / None
+    min_len: int = 2
+    max_len: int = 0                     # longer lines are dropped (0 = no limit)
+    max_lines: int = 60
+    bold_tags: frozenset = frozenset()   # lines.iter_lines bold tags
+    blocks: Callable | None = None       # lines.iter_lines block hook
+    formatted_exempt: bool = False       # bold / subheader lines skip the stop / skip rules
+    line_tokens: bool = False            # sectionize gets lines.Line tokens, not text
+    skip_weekdays: frozenset = frozenset()  # date.weekday() values with no workout (6 = Sunday)
+    today_only: bool = False
+    parser: str = 'html.parser'
+    endpoints: tuple = ()                # endpoints.Endpoint – WP REST / feed first, the HTML page as fallback
+    embedded: tuple = ()                 # __NEXT_DATA__ / JSON-LD keys holding the workout (embedded.py) – DOM as fallback
+
+    def make_url(self, date):
+        return self.url(date) if callable(self.url) else date.strftime(self.url)
+
+
+def _stop_or_skip(spec, lo):
+    if spec.filter:
+        hit = spec.filter.first(lo)
+        if hit:
+            return hit
+    for rx in spec.stop:
+        if rx.search(lo):
+            return 'stop'
+    if lo in spec.skip_words:
+        return 'skip'
+    for rx in spec.skip:
+        if rx.search(lo):
+            return 'skip'
+    return None
+
+
+def _selectors(spec):
+    """[(name, find(soup))] – the spec's container selectors in order."""
+    return [(selector, lambda soup, selector=selector: soup.select_one(selector)) for selector in spec.containers]
+
+
+def find_container(spec, soup):
+    """
+    (content root, how it was found) – the selector that worked last time on a page of the same
+    shape (strategy.py), else the selectors in order, then the densest block; <body> when the
+    spec has neither.
+    """
+    if not spec.containers and not spec.density_fallback:
+        return soup.find('body') or soup, 'body'
+    fallback = None
+    if spec.density_fallback:
+        fallback = ('content-density', lambda soup: best_block(
+            soup, tags=spec.density_fallback, max_link_density=spec.density_links))
+    return pick(spec.id, soup, _selectors(spec), fallback)
+
+
+def extract_lines(spec, root):
+    """
+    Stream the root's lines through the spec's rules: start marker, stop / skip, max_len, max_lines.
+    Lines shorter than min_len are dropped before anything else (bold / subheader ones kept).
+    """
+    stream = (t for t in iter_lines(root, bold_tags=spec.bold_tags, blocks=spec.blocks)
+              if len(t.text) >= spec.min_len or t.bold or t.subheader)
+
+    if spec.start_re:
+        before = []
+        for line in stream:
+            if spec.start_re.search(line.text):
+                print(f"    → Date marker at line {len(before)}: '{line.text}'")
+                break
+            before.append(line)
+        else:
+            print(f"    → No date marker – using full page")
+            stream = iter(before)
+
+    lines = []
+    for line in stream:
+        if not (spec.formatted_exempt and (line.bold or line.subheader)):
+            hit = _stop_or_skip(spec, line.text.lower())
+            if hit == 'stop':
+                print(f"    → Stopped at: '{line.text[:60]}'")
+                break
+            if hit == 'skip':
+                continue
+        if spec.max_len and len(line.text) > spec.max_len:
+            continue
+        lines.append(line)
+        if len(lines) >= spec.max_lines:
+            print(f"    → Stopped at {spec.max_lines} lines")
+            break
+    return lines
+
+
+def _workout(spec, content, date_str, url):
+    lines = extract_lines(spec, content)
+    if not lines:
+        print(f"    → No workout lines after filtering")
+        return None
+
+    sections = spec.sectionize(lines if spec.line_tokens else [t.text for t in lines])
+    total = sum(len(s['lines']) for s in sections)
+    print(f"    → SUCCESS: {len(sections)} sections, {total} lines")
+
+    return {
+        'date':        date_str,
+        'source':      spec.id,
+        'source_name': spec.name,
+        'url':         url,
+        'sections':    sections,
+    }
+
+
+def _from_post(spec, post, date_str):
+    """Workout from a structured-endpoint post (content HTML only – no container search)."""
+    if post is None:
+        print(f"    → No post for {date_str}")
+        return None
+    print(f"    → Post: '{post.title[:60]}' ({post.link})")
+    soup = BeautifulSoup(post.html, spec.parser)
+    if spec.cleanup:
+        clean(soup, spec.cleanup)
+    return _workout(spec, soup, date_str, post.link or spec.make_url(datetime.strptime(date_str, '%Y-%m-%d')))
+
+
+def _from_embedded(spec, r, date_str, url):
+    """Workout from the page's __NEXT_DATA__ / JSON-LD payload (only that fragment is parsed), or None."""
+    found, fragment = find_body(response_text(r), spec.embedded)
+    if fragment is None:
+        print(f"    → No embedded workout data – using the DOM")
+        return None
+    print(f"    → Found via {found} (embedded data, no page DOM)")
+    soup = BeautifulSoup(fragment, spec.parser)
+    if spec.cleanup:
+        clean(soup, spec.cleanup)
+    result = _workout(spec, soup, date_str, url)
+    if result is None:
+        print(f"    → Embedded data gave no workout – using the DOM")
+    return result
+
+
+def fetch(spec, date, today=None):
+    """
+    Run the pipeline for one source and day → workout dict, or None.
+    `today` (YYYY-MM-DD) defaults to now in the date's own timezone – fetch_all's dates carry
+    Asia/Jerusalem, so a today-only source agrees with fetch_all.today_israel() on a UTC runner.
+    """
+    date_str = date.strftime('%Y-%m-%d')
+    if spec.today_only and date_str != (today or datetime.now(date.tzinfo).strftime('%Y-%m-%d')):
+        return None
+    if date.weekday() in spec.skip_weekdays:
+        return None
+    url = spec.make_url(date)
+
+    try:
+        # One request per run for the whole window when the site has a structured endpoint
+        if spec.endpoints:
+            posts = window_posts(spec.id, spec.endpoints, date)
+            if posts is not None:
+                return _from_post(spec, posts.get(date_str), date_str)
+
+        print(f"    → Fetching {url}")
+        r = http_get(url)
+
+        if r.status_code == 404:
+            print(f"    → 404 – no WOD for {date_str}")
+            return None
+        if r.status_code != 200:
+            print(f"    → HTTP {r.status_code}")
+            return None
+
+        if spec.embedded:
+            result = _from_embedded(spec, r, date_str, url)
+            if result is not None:
+                return result
+
+        soup = make_soup(r, spec.parser)
+        if spec.cleanup:
+            print(f"    → Cleanup: {clean(soup, spec.cleanup)}")
+
+        content, found = find_container(spec, soup)
+        if content is None:
+            print(f"    → No content found")
+            return None
+        print(f"    → Found via {found}")
+        return _workout(spec, content, date_str, url)
+
+    except requests.Timeout:
+        print(f"    → Timeout")
+        return None
+    except Exception as e:
+        print(f"    → Error: {e}")
+        return None
+
+
+def make_fetcher(spec):
+    """fetch_fn(date) for fetch_all.SCRAPERS."""
+    def fetch_fn(date, today=None):
+        return fetch(spec, date, today)
+    fetch_fn.__name__ = f'fetch_{spec.id}'
+    fetch_fn.spec = spec
+    return fetch_fn
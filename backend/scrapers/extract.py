@@ -0,0 +1,68 @@
+"""
+Main-content extraction in one pass – the "largest block" fallback shared by the scrapers.
+
+The old fallback called div.get_text() on every <div>: with nested divs the same text is
+rebuilt once per ancestor, quadratic in page size. block_stats() walks the tree once,
+post-order, adding each node's text length and link-text length into its parent, and
+best_block() picks the candidate with the most non-link text:
+
+    text < max_chars          – skips the page wrapper (the 5000 cap of the old crossfit.com fallback)
+    link density ≤ 0.5        – skips menus, tag clouds, "related posts" lists
+    ties → first in document order (the outermost of nested equals), as the old scan did
+
+max_link_density=None is the old crossfit.com largest-div pick exactly: most text, links
+included, no density limit – same block, one pass.
+"""
+from bs4 import CData, NavigableString, Tag
+
+TEXT_TYPES = (NavigableString, CData)  # exactly what get_text() counts (no comments / doctype)
+CANDIDATE_TAGS = ('div', 'article', 'section', 'main', 'td')
+MAX_CHARS = 5000
+MAX_LINK_DENSITY = 0.5
+
+
+def block_stats(root):
+    """
+    [(tag, text_len, link_len, order)] for every tag under `root`, post-order; `order` is the
+    tag's position in document order (pre-order, root = 0).
+    text_len == len(tag.get_text(strip=True)); <script>/<style> text counts as 0, as it does inside a parent.
+    """
+    stats = []
+    seen = 0
+    stack = [(root, iter(root.children), [0, 0, 0])]
+    while stack:
+        node, children, acc = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            stats.append((node, acc[0], acc[1], acc[2]))
+            if stack:
+                parent = stack[-1][2]
+                parent[0] += acc[0]
+                parent[1] += acc[0] if node.name == 'a' else acc[1]
+        elif isinstance(child, Tag):
+            seen += 1
+            stack.append((child, iter(child.children), [0, 0, seen]))
+        elif type(child) in TEXT_TYPES:
+            acc[0] += len(child.strip())
+    return stats
+
+
+def best_block(root, tags=CANDIDATE_TAGS, max_chars=MAX_CHARS, max_link_density=MAX_LINK_DENSITY, min_chars=1):
+    """
+    The content block under `root` with the most non-link text (see module docstring), or None.
+    max_link_density=None → the most text, links included (the old largest-div scan).
+    """
+    best, best_score, best_order = None, 0, 0
+    for tag, text_len, link_len, order in block_stats(root):
+        if tag.name not in tags or not min_chars <= text_len < max_chars:
+            continue
+        if max_link_density is None:
+            score = text_len
+        elif link_len > text_len * max_link_density:
+            continue
+        else:
+            score = text_len - link_len
+        if score > best_score or (score == best_score and best is not None and order < best_order):
+            best, best_score, best_order = tag, score, order
+    return best
@@ -3,21 +3,39 @@ CrossFit Hero Workouts Scraper - FIXED
 Fetches from https://www.crossfit.com/heroes
 Better parsing to avoid cutting workouts short
 Now also uses a local warehouse in data/special_cache.json
+Hero list read from the page's __NEXT_DATA__ / JSON-LD when present (no DOM), page text otherwise
 """
 import json
 import re
-import hashlib
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-}
+from scrapers.cleanup import CleanupRules, clean
+from scrapers.embedded import find_records, fragment_text
+from scrapers.keywords import KeywordSets
+from scrapers.net import fix_mojibake, http_get, make_soup, response_text
 
 _HERO_CACHE = None
 
+# End-of-entry markers, memorial (hero_story) start, and navigation/footer junk.
+# One kind per line (first() – declaration order is the priority): a footer line ends a
+# story even if it names the fallen; junk only matters for would-be titles.
+HERO_LINE_KEYWORDS = KeywordSets(
+    footer=['share this', 'posted by', 'learn more about'],
+    memorial=['in honor', 'killed in action', 'died', 'fallen', 'survived by', 'is survived',
+              'afghanistan', 'iraq', 'operation', 'combat', 'enemy', 'explosive device',
+              'was a member of', 'graduate of', 'air force', 'navy seal', 'marine',
+              'u.s. army', 'special forces', 'year-old', 'years old', 'born in',
+              'native of', 'deployed to', 'assigned to'],
+    junk=['newsletter', 'facebook', 'instagram', 'find a gym',
+          'privacy', 'copyright', 'crossfit games', 'skip to', 'in the app'],
+)
+# Whole-line kinds checked before the keyword sets: a "Details" heading stands before a name
+# that is not Title Case ("DT", "McGhee", "CHAD1000x") – the next line is the name; "Then,"
+# joins the parts of one workout and is not a new hero.
+HERO_LABEL_RE = re.compile(r'^details:?$', re.I)
+HERO_JOIN_RE = re.compile(r'^(?:then|and then|followed by)[,:]?$', re.I)
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR.parent / 'data'
 SPECIAL_CACHE = DATA_DIR / 'special_cache.json'
@@ -43,133 +61,148 @@ def _save_cache(data):
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
+CLEANUP = CleanupRules(tags=frozenset({'script', 'style', 'img', 'picture'}))
+# Hero objects in __NEXT_DATA__ / JSON-LD: name + workout (and memorial) text. Workout fields
+# only – a generic content/body/description would turn any titled list (nav, SEO cards) into heroes
+EMBEDDED_TITLE_KEYS = ('title', 'name', 'headline')
+EMBEDDED_BODY_KEYS = ('workout', 'workoutBody', 'wod', 'wodBody', 'wodContent')
+MAX_WORKOUT_LINES = 25
+MAX_STORY_LINES = 30
+
+# Parser states: looking for a hero name → collecting its workout → collecting the memorial text
+# (NAME: a "Details" heading was seen, the next line is the name)
+SEEK, WORKOUT, STORY, NAME = 0, 1, 2, 3
+
+
+def _is_title(line):
+    """Workout name: short (< 30 chars), ALL CAPS or Title Case, no colons, no leading digits."""
+    return (
+        2 < len(line) < 30 and
+        ':' not in line and
+        not line.islower() and
+        (line.isupper() or line.istitle()) and
+        not any(c.isdigit() for c in line[:3])
+    )
+
+
+def _kind(line, first=HERO_LINE_KEYWORDS.first):
+    if HERO_LABEL_RE.match(line):
+        return 'label'
+    if HERO_JOIN_RE.match(line):
+        return 'join'
+    return first(line.lower())
+
+
+def _tokenize(text):
+    """Page text → [(line, is_title, kind)] – kind = 'label' / 'join' / 'footer' / 'memorial' / 'junk' / None."""
+    return [(line, _is_title(line), _kind(line))
+            for line in map(str.strip, text.split('\n')) if line]
+
+
+def _parse_hero_lines(tokens):
+    """
+    Single pass over the tokens: SEEK → (title, or "Details" → NAME → any line) → WORKOUT →
+    (memorial line) → STORY. A line that ends a workout/story without belonging to it (next
+    title, footer in a workout) is handed straight to SEEK, so it can open the next hero.
+    "Then," inside a workout stays in it.
+    """
+    heroes = []
+    state = SEEK
+    name, workout_lines, story_lines = None, [], []
+
+    def finish():
+        if len(workout_lines) >= 3:
+            entry = {'name': name, 'lines': workout_lines[:MAX_WORKOUT_LINES]}
+            hero_story = '\n'.join(story_lines).strip()
+            if hero_story:
+                entry['hero_story'] = hero_story
+            heroes.append(entry)
+
+    for line, is_title, kind in tokens:
+        if state == NAME:
+            state = SEEK
+            if kind is None:
+                name, workout_lines, story_lines = line, [], []
+                state = WORKOUT
+                continue
+
+        if state == STORY:
+            if kind == 'footer':
+                finish()
+                state = SEEK
+                continue
+            if not is_title:
+                story_lines.append(line)
+                if len(story_lines) >= MAX_STORY_LINES:
+                    finish()
+                    state = SEEK
+                continue
+            finish()
+            state = SEEK
+
+        elif state == WORKOUT:
+            if kind == 'memorial':
+                story_lines = [line]
+                state = STORY
+                continue
+            if (not is_title or kind == 'join') and kind not in ('footer', 'label'):
+                workout_lines.append(line)
+                if len(workout_lines) >= MAX_WORKOUT_LINES:
+                    finish()
+                    state = SEEK
+                continue
+            finish()
+            state = SEEK
+
+        # SEEK (also reached by the line that closed the previous hero)
+        if kind == 'label':
+            state = NAME
+        elif is_title and kind not in ('junk', 'join'):
+            name, workout_lines, story_lines = line, [], []
+            state = WORKOUT
+
+    if state != SEEK:
+        finish()
+    return heroes
+
+
+def _embedded_text(r):
+    """
+    Page text rebuilt from the embedded hero list (name line, then its workout text) –
+    same shape as the DOM text, so the same parser runs on it. None when the page has none.
+    """
+    found, records = find_records(response_text(r), EMBEDDED_TITLE_KEYS, EMBEDDED_BODY_KEYS)
+    if not records:
+        return None
+    print(f"    → Found via {found}: {len(records)} hero records (no page DOM)")
+    return fix_mojibake('\n'.join(f"{title}\n{fragment_text(body)}" for title, body in records))
+
+
 def _scrape_all_heroes():
     """שואב את כל אימוני הגיבורים מאתר CrossFit.com (מחסן מלא)."""
     url = 'https://www.crossfit.com/heroes'
     heroes = []
     try:
         print(f"    → Fetching {url}")
-        r = requests.get(url, timeout=15, headers=HEADERS)
+        r = http_get(url)
         if r.status_code != 200:
             print(f"    → HTTP {r.status_code}")
             return []
 
-        soup = BeautifulSoup(r.text, 'html.parser')
+        text = _embedded_text(r)
+        if text is not None:
+            heroes = _parse_hero_lines(_tokenize(text))
+            if not heroes:
+                print(f"    → Embedded data gave no heroes – using the DOM")
 
-        # Remove scripts, styles, images
-        for tag in soup.find_all(['script', 'style', 'img', 'picture']):
-            tag.decompose()
+        if not heroes:
+            soup = make_soup(r)
 
-        text = soup.get_text(separator='\n')
-        lines = []
-        for l in text.split('\n'):
-            l = l.strip()
-            if not l:
-                continue
-            # Fix encoding issues
-            l = l.replace('â\x80\x93', '–')
-            l = l.replace('â\x80\x94', '—')
-            l = l.replace('â\x80\x99', "'")
-            l = l.replace('â\x80\x9c', '"')
-            l = l.replace('â\x80\x9d', '"')
-            l = l.replace('â\x80¢', '•')
-            l = l.replace('â\x99\x80', '♀')
-            l = l.replace('â\x99\x82', '♂')
-            l = l.replace('â', '')
-            lines.append(l)
-
-        # Parse: Each workout = short title + workout description
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-
-            # Skip navigation/footer junk
-            if any(skip in line.lower() for skip in [
-                'newsletter', 'facebook', 'instagram', 'find a gym',
-                'privacy', 'copyright', 'crossfit games', 'skip to'
-            ]):
-                i += 1
-                continue
+            # Remove scripts, styles, images
+            clean(soup, CLEANUP)
 
-            # Detect workout name: short (< 30 chars), ALL CAPS or Title Case, no colons
-            is_title = (
-                len(line) < 30 and
-                len(line) > 2 and
-                ':' not in line and
-                not line.islower() and
-                (line.isupper() or line.istitle()) and
-                not any(c.isdigit() for c in line[:3])
-            )
-
-            if is_title:
-                name = line
-                workout_lines = []
-                hero_story = None
-
-                # Collect workout lines until next name or memorial text
-                i += 1
-                while i < len(lines):
-                    next_line = lines[i]
-
-                    # Stop at memorial/biographical text – collect as hero_story
-                    memorial_keywords = [
-                        'in honor', 'killed in action', 'died', 'fallen', 'survived by', 'is survived',
-                        'afghanistan', 'iraq', 'operation', 'combat', 'enemy', 'explosive device',
-                        'was a member of', 'graduate of', 'air force', 'navy seal', 'marine',
-                        'u.s. army', 'special forces', 'year-old', 'years old', 'born in',
-                        'native of', 'deployed to', 'assigned to'
-                    ]
-                    if any(keyword in next_line.lower() for keyword in memorial_keywords):
-                        hero_story_lines = [next_line]
-                        i += 1
-                        while i < len(lines):
-                            stop_line = lines[i]
-                            if any(stop in stop_line.lower() for stop in ['share this', 'posted by', 'learn more about']):
-                                i += 1
-                                break
-                            next_is_title = (
-                                len(stop_line) < 30 and len(stop_line) > 2 and ':' not in stop_line
-                                and not stop_line.islower() and (stop_line.isupper() or stop_line.istitle())
-                                and not any(c.isdigit() for c in stop_line[:3])
-                            )
-                            if next_is_title:
-                                break
-                            hero_story_lines.append(stop_line)
-                            i += 1
-                            if len(hero_story_lines) >= 30:
-                                break
-                        hero_story = '\n'.join(hero_story_lines).strip()
-                        break
-
-                    # Stop at next workout name (same criteria as title detection)
-                    next_is_title = (
-                        len(next_line) < 30 and
-                        len(next_line) > 2 and
-                        ':' not in next_line and
-                        not next_line.islower() and
-                        (next_line.isupper() or next_line.istitle()) and
-                        not any(c.isdigit() for c in next_line[:3])
-                    )
-                    if next_is_title:
-                        break
-
-                    # Stop at footer
-                    if any(stop in next_line.lower() for stop in ['share this', 'posted by', 'learn more about']):
-                        break
-
-                    workout_lines.append(next_line)
-                    i += 1
-
-                    if len(workout_lines) >= 25:
-                        break
-
-                if len(workout_lines) >= 3:
-                    entry = {'name': name, 'lines': workout_lines[:25]}
-                    if hero_story:
-                        entry['hero_story'] = hero_story
-                    heroes.append(entry)
-            else:
-                i += 1
+            text = fix_mojibake(soup.get_text(separator='\n'))
+            heroes = _parse_hero_lines(_tokenize(text))
 
         print(f"    → Total parsed: {len(heroes)} hero workouts")
         return heroes
@@ -223,38 +256,8 @@ def fetch_all_heroes():
     return _HERO_CACHE
 
 
-def fetch_hero(date):
-    """
-    בוחר אימון גיבור יומי מהמחסן, עם רנדומציה דטרמיניסטית וחלון אי-חזרה של 14 יום.
-    """
-    heroes = fetch_all_heroes()
-    if not heroes:
-        print("    → No heroes available")
-        return None
-
-    date_str = date.strftime('%Y-%m-%d')
-    print(f"  ⬇ CrossFit Hero Workouts...")
-
-    date_hash = int(hashlib.md5(date_str.encode()).hexdigest(), 16)
-
-    excluded_indices = set()
-    for days_ago in range(1, 15):
-        past_date = date - timedelta(days=days_ago)
-        past_str = past_date.strftime('%Y-%m-%d')
-        past_hash = int(hashlib.md5(past_str.encode()).hexdigest(), 16)
-        excluded_idx = past_hash % len(heroes)
-        excluded_indices.add(excluded_idx)
-
-    base_idx = date_hash % len(heroes)
-    chosen_idx = base_idx
-    attempts = 0
-    while chosen_idx in excluded_indices and attempts < len(heroes):
-        chosen_idx = (chosen_idx + 1) % len(heroes)
-        attempts += 1
-
-    hero = heroes[chosen_idx]
-    print(f"    → Selected: {hero['name']} (#{chosen_idx + 1}/{len(heroes)})")
-
+def _make_hero_wod(hero, date_str):
+    """Build one hero workout dict for a given warehouse entry and date."""
     processed_lines = []
     for line in hero['lines']:
         if re.search(r'[♀♂].*\d+\s*(lb|kg)', line):
@@ -280,8 +283,11 @@ def fetch_hero(date):
 
 
 if __name__ == '__main__':
-    # Test
-    result = fetch_hero(datetime.now())
+    # Test: today's pick from the rotation calendar (the same path fetch_all takes)
+    from scrapers.special_calendar import calendar_wod, ensure_calendar
+    today = datetime.now().strftime('%Y-%m-%d')
+    calendar, _ = ensure_calendar(today)
+    result = calendar_wod('hero', today, calendar)
     if result:
         print(f"\n✅ Success!")
         print(f"Title: {result['sections'][0]['title']}")
@@ -0,0 +1,76 @@
+"""
+Precompiled keyword matchers shared by the scrapers.
+
+Replaces `any(kw in lo for kw in LIST)` in per-line loops: each keyword set is compiled
+once (at import) into a single alternation regex, and a matcher with several sets tells
+which one fired. Callers pass already-lowercased text, exactly like the old `lo` checks.
+
+    LINE_FILTER = KeywordSets(stop=STOP_WORDS, skip=SKIP_WORDS)
+    hit = LINE_FILTER.first(lo)        # 'stop' / 'skip' / None (declaration order = priority)
+    LINE_FILTER.matches(lo)            # ('stop', 'skip') / () – every set that fires
+    LINE_FILTER.has('skip', lo)        # one set only
+"""
+import re
+
+
+def _trie_pattern(node):
+    """Regex for a character trie: shared prefixes matched once, longest word preferred (as sorted alternation)."""
+    alts = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not alts:
+        return ''
+    body = alts[0] if len(alts) == 1 else '(?:%s)' % '|'.join(alts)
+    return '(?:%s)?' % body if '' in node else body
+
+
+def compile_keywords(words, prefix=False):
+    """
+    One regex for a keyword list: substring match (default) or startswith (prefix=True).
+    The words are folded into a trie, so a position that starts no keyword fails on one
+    character class instead of trying every alternative.
+    """
+    words = {w for w in words if w}
+    if not words:
+        return re.compile(r'(?!)')  # matches nothing
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    return re.compile(('^(?:%s)' if prefix else '(?:%s)') % _trie_pattern(trie))
+
+
+class KeywordSets:
+    """Named keyword sets, each compiled once; `prefix=True` = line must start with a keyword."""
+
+    __slots__ = ('_sets', '_any', 'words')
+
+    def __init__(self, prefix=False, **sets):
+        self.words = {name: tuple(words) for name, words in sets.items()}
+        self._sets = [(name, compile_keywords(words, prefix)) for name, words in sets.items()]
+        self._any = compile_keywords([w for words in sets.values() for w in words], prefix)
+
+    def first(self, text):
+        """Name of the first set (in declaration order) with a keyword in `text`, else None."""
+        if len(self._sets) > 1 and not self._any.search(text):
+            return None
+        for name, rx in self._sets:
+            if rx.search(text):
+                return name
+        return None
+
+    def matches(self, text):
+        """Names of every set with a keyword in `text` (one union scan for the common no-hit case)."""
+        if not self._any.search(text):
+            return ()
+        return tuple(name for name, rx in self._sets if rx.search(text))
+
+    def has(self, name, text):
+        for set_name, rx in self._sets:
+            if set_name == name:
+                return rx.search(text) is not None
+        raise KeyError(name)
+
+    def __call__(self, text):
+        """True if any set matches."""
+        return self.first(text) is not None
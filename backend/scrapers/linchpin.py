@@ -3,9 +3,14 @@ CrossFit Linchpin — לא בשימוש ב-fetch (הוסר מהאפליקציה)
 """
 
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 
+from scrapers.cleanup import CleanupRules, clean
+from scrapers.extract import best_block
+from scrapers.net import http_get, make_soup
+
+CLEANUP = CleanupRules(tags=frozenset({'script', 'style', 'nav', 'footer', 'header', 'img', 'iframe'}))
+
 
 def fetch_workout(date):
     """CrossFit Linchpin - today only (no archive)"""
@@ -18,19 +23,16 @@ def fetch_workout(date):
     
     try:
         print(f"    → Fetching {url}")
-        response = requests.get(url, timeout=15, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        response = http_get(url)
         
         if response.status_code != 200:
             print(f"    → Status {response.status_code}")
             return None
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response)
         
         # Remove noise
-        for tag in soup.find_all(['script', 'style', 'nav', 'footer', 'header', 'img', 'iframe']):
-            tag.decompose()
+        clean(soup, CLEANUP)
         
         # Find blog article (Shopify structure)
         content = None
@@ -61,6 +63,12 @@ def fetch_workout(date):
             if article:
                 content = article
                 print(f"    → Found via article (fallback)")
+
+        # Fallback: densest text block
+        if not content:
+            content = best_block(soup)
+            if content:
+                print(f"    → Found via content density")
         
         if not content:
             print(f"    → No content found")
@@ -0,0 +1,68 @@
+"""
+Streaming line extraction – the page text as a generator of Line tokens.
+
+Replaces content.get_text(separator='\\n').split('\\n') + "__BOLD__" / "__SUBHEADER__"
+string markers: iter_lines() walks the tree in document order and yields one Line per
+text line (same lines get_text would give), with the formatting as attributes:
+
+    Line('Back Squat', bold=True)            ← <strong>/<b>, its text joined with spaces
+    Line('Tempo Pause Bench Press', subheader=True)   ← produced by a `blocks` hook
+
+The caller stops iterating at its stop rule or line cap, and the walk stops with it –
+comments, footers and related-post blocks after the workout are never visited.
+"""
+from dataclasses import dataclass
+
+from bs4 import CData, NavigableString, Tag
+
+from scrapers.net import fix_mojibake
+
+TEXT_TYPES = (NavigableString, CData)  # what get_text() yields (no comments / scripts / doctype)
+BOLD_TAGS = frozenset({'strong', 'b'})
+
+
+@dataclass(slots=True)
+class Line:
+    text: str
+    bold: bool = False
+    subheader: bool = False
+
+
+def _split(text, bold=False):
+    first = True
+    for part in text.split('\n'):
+        part = fix_mojibake(part).strip()
+        if part:
+            yield Line(part, bold=bold and first)
+            first = False
+
+
+def _joined(tag):
+    """get_text(' ', strip=True) of a tag."""
+    return ' '.join(s.strip() for s in tag.descendants if type(s) in TEXT_TYPES and s.strip())
+
+
+def iter_lines(root, bold_tags=BOLD_TAGS, blocks=None):
+    """
+    Yield the non-empty, stripped (and mojibake-repaired) text lines under `root` lazily.
+    bold_tags – tags whose whole text becomes one bold Line (only its first line if it spans several)
+    blocks    – optional hook(tag) → iterable of Lines to emit instead of walking that tag, or None
+    """
+    stack = [iter(root.contents)]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            continue
+        if isinstance(node, Tag):
+            if blocks:
+                emitted = blocks(node)
+                if emitted is not None:
+                    yield from emitted
+                    continue
+            if node.name in bold_tags:
+                yield from _split(_joined(node), bold=True)
+                continue
+            stack.append(iter(node.contents))
+        elif type(node) in TEXT_TYPES:
+            yield from _split(node)
@@ -0,0 +1,124 @@
+"""
+Date → article index for list-style sources (one page = many dated posts).
+
+Instead of building a date string per requested day and substring-scanning every article
+title (or re-parsing every article on every page), ListingIndex parses each article header
+once, normalizes it to an ISO date and answers lookups from a dict:
+
+    index = ListingIndex('tonbridge', header=lambda a: a.find('h2').get_text(' ', strip=True))
+    index.add_page(soup.find_all('article'))
+    article = index.get('2026-02-16')          # "Monday 16th February" → 2026-02-16
+
+parse_date() is tolerant: "Monday 16th February", "16 Feb 2026", "February 13th, 2026",
+"Wednesday 03/04/2026" (month first unless numeric='dmy'), "2026-02-14". A missing year is
+the one that puts the date nearest to today (a stated weekday decides between candidates).
+Headers without a date are logged, so a layout change shows up in the fetch log.
+"""
+import re
+from datetime import date as _date, datetime
+
+MONTHS = {m: i + 1 for i, m in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'])}
+WEEKDAYS = {d: i for i, d in enumerate(['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'])}
+
+_MONTH = (r'(?P<mon>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|'
+          r'sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b\.?')
+_DAY = r'(?P<day>\d{1,2})(?:st|nd|rd|th)?'
+_YEAR = r'(?:,?\s+(?P<year>\d{4}))?'
+DATE_RES = (
+    re.compile(r'\b(?P<y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})\b'),
+    re.compile(r'\b(?P<a>\d{1,2})[/.-](?P<b>\d{1,2})[/.-](?P<y>\d{2,4})\b'),
+    re.compile(rf'\b{_DAY}\s+(?:of\s+)?{_MONTH}{_YEAR}', re.I),
+    re.compile(rf'\b{_MONTH}\s+{_DAY}\b{_YEAR}', re.I),
+)
+WEEKDAY_RE = re.compile(r'\b(mon|tue|wed|thu|fri|sat|sun)[a-z]*\b', re.I)
+
+
+def _safe_date(y, m, d):
+    try:
+        return _date(y, m, d)
+    except ValueError:
+        return None
+
+
+def _nearest_year(month, day, weekday, today):
+    candidates = [c for c in (_safe_date(today.year + k, month, day) for k in (0, -1, 1)) if c]
+    if weekday is not None:
+        candidates = [c for c in candidates if c.weekday() == weekday] or candidates
+    return min(candidates, key=lambda c: abs((c - today).days), default=None)
+
+
+def parse_date(text, numeric='mdy', today=None):
+    """Header text → 'YYYY-MM-DD', or None when it holds no recognizable date."""
+    if not text:
+        return None
+    today = today or datetime.now().date()
+    for rx in DATE_RES:
+        m = rx.search(text)
+        if not m:
+            continue
+        g = m.groupdict()
+        if g.get('y') and g.get('m'):
+            d = _safe_date(int(g['y']), int(g['m']), int(g['d']))
+        elif g.get('a'):
+            a, b, y = int(g['a']), int(g['b']), int(g['y'])
+            y += 2000 if y < 100 else 0
+            d = _safe_date(y, a, b) if numeric == 'mdy' else _safe_date(y, b, a)
+        else:
+            month, day = MONTHS[g['mon'][:3].lower()], int(g['day'])
+            if g.get('year'):
+                d = _safe_date(int(g['year']), month, day)
+            else:
+                wd = WEEKDAY_RE.search(text)
+                d = _nearest_year(month, day, WEEKDAYS[wd.group(1)[:3].lower()] if wd else None, today)
+        if d:
+            return d.isoformat()
+    return None
+
+
+class ListingIndex:
+    """ISO date → article, filled page by page; the first (newest) article wins a date."""
+
+    def __init__(self, label, header, numeric='mdy', today=None):
+        self.label = label
+        self.header = header        # article → header text (or None)
+        self.numeric = numeric
+        self.today = today
+        self.articles = {}
+        self.unmatched = []
+        self.pages = 0
+
+    def add_page(self, articles):
+        """Index the articles of one list page → number of new dates."""
+        self.pages += 1
+        added = 0
+        for article in articles:
+            text = self.header(article)
+            if not text:
+                continue
+            d = parse_date(text, self.numeric, self.today)
+            if not d:
+                self.unmatched.append(text)
+                print(f"    -> {self.label}: no date in article header '{text[:80]}'")
+                continue
+            if d not in self.articles:
+                self.articles[d] = article
+                added += 1
+        return added
+
+    def get(self, date_str):
+        return self.articles.get(date_str)
+
+    def __contains__(self, date_str):
+        return date_str in self.articles
+
+    def __len__(self):
+        return len(self.articles)
+
+    @property
+    def oldest(self):
+        return min(self.articles) if self.articles else None
+
+    @property
+    def newest(self):
+        return max(self.articles) if self.articles else None
@@ -0,0 +1,150 @@
+"""
+Load / unit normalization shared by all sources.
+
+One precompiled regex finds every load expression in a line – "135 lb", "135lbs", "55#",
+"55#/35#", "95/65 lb", "@100/70 kg", "16/24kg KB", "143kg/93kg", "1.5 pood", "1-1/2 pood",
+"50-lb.", "24-32 kg", "♀ 65 lb ♂ 95 lb" – and parse_loads() turns each into canonical numbers
+in both units:
+
+    {"text": "95/65 lb", "lb": [95, 65], "kg": [43, 29.5]}
+    {"text": "65 lb", "lb": [65], "kg": [29.5], "sex": "f"}      ← ♀ / women / female marker
+    {"text": "24-32 kg", "kg": [24, 32], "lb": [53, 71], "range": true}
+
+A dash between two numbers is a range only when no "/" follows ("1-1/2 pood" is 1.5 pood).
+A comma followed by exactly three digits groups thousands ("1,500 lb"); otherwise it is a
+decimal mark ("24,5 kg").
+
+Stored kg are rounded to 0.5, lb to whole pounds. rewrite_loads() optionally rewrites the
+display line ('kg' / 'lb' / 'both'); it rounds to whole units, like the cf1013 # → kg
+conversion always did.
+"""
+import re
+
+LB_PER_KG = 2.20462
+KG_PER_POOD = 16
+
+_NUM = r'\d{1,3}(?:,\d{3})+(?:\.\d+)?(?![\d,])|\d+(?:[.,]\d+)?'   # 1,500 | 24.5 | 24,5
+_MIXED = r'\d+(?:(?:\s+|\s*[-–]\s*)[1-3]/[234](?![\d/])|\s*½)'    # 1-1/2, 1 1/2, 1½
+_UNIT = r'(?:kgs?|kilos?|lbs?|pounds?|#|pood)(?![a-z])'
+LOAD_RE = re.compile(
+    rf'(?P<a>{_MIXED}|{_NUM})(?:\s*[-–]\s*(?P<r>{_NUM})(?![\d.,]|\s*/))?(?:\s*(?P<ua>{_UNIT}))?'
+    rf'(?:\s*/\s*(?P<b>{_NUM}))?(?:[\s-]*(?P<ub>{_UNIT}))?',
+    re.I,
+)
+MIXED_RE = re.compile(r'(\d+)(?:\s*[-–]?\s*(\d)/(\d)|\s*½)')
+THOUSANDS_RE = re.compile(r'\d{1,3}(?:,\d{3})+(?:\.\d+)?')
+SEX_RE = re.compile(r'(♀|\bwomen\b|\bfemale\b|\bw:)|(♂|\bmen\b|\bmale\b|\bm:)', re.I)
+UNIT_NORM = {
+    'kg': 'kg', 'kgs': 'kg', 'kilo': 'kg', 'kilos': 'kg',
+    'lb': 'lb', 'lbs': 'lb', 'pound': 'lb', 'pounds': 'lb', '#': 'lb',
+    'pood': 'pood',
+}
+
+
+def _num(s):
+    m = MIXED_RE.fullmatch(s)
+    if m:
+        return int(m.group(1)) + (int(m.group(2)) / int(m.group(3)) if m.group(2) else 0.5)
+    if THOUSANDS_RE.fullmatch(s):
+        return float(s.replace(',', ''))
+    return float(s.replace(',', '.'))
+
+
+def _tidy(x):
+    return int(x) if x == int(x) else x
+
+
+def _to_kg(value, unit):
+    if unit == 'lb':
+        return value / LB_PER_KG
+    if unit == 'pood':
+        return value * KG_PER_POOD
+    return value
+
+
+def find_loads(line):
+    """(match, values, unit) for every load expression in `line` – numbers without a unit are skipped."""
+    for m in LOAD_RE.finditer(line):
+        raw_unit = m.group('ub') or m.group('ua')
+        if not raw_unit:
+            continue
+        unit = UNIT_NORM[raw_unit.lower()]
+        values = [_num(m.group('a'))]
+        if m.group('r'):
+            values.append(_num(m.group('r')))
+        elif m.group('b'):
+            values.append(_num(m.group('b')))
+        yield m, values, unit
+
+
+def parse_loads(line):
+    """Every load in a display line → [{text, kg, lb[, sex]}]."""
+    if not line or not any(c.isdigit() for c in line):
+        return []
+    loads = []
+    for m, values, unit in find_loads(line):
+        kg = [_to_kg(v, unit) for v in values]
+        load = {
+            'text': m.group(0).strip(),
+            'kg': [_tidy(round(x * 2) / 2) for x in kg],
+            'lb': [_tidy(round(v)) if unit == 'lb' else _tidy(round(x * LB_PER_KG)) for v, x in zip(values, kg)],
+        }
+        if m.group('r'):
+            load['range'] = True
+        if len(values) == 1:
+            sex = None
+            for s in SEX_RE.finditer(line, max(0, m.start() - 12), m.start()):
+                sex = 'f' if s.group(1) else 'm'
+            if sex:
+                load['sex'] = sex
+        loads.append(load)
+    return loads
+
+
+def strip_loads(text):
+    """`text` without its load expressions ("Deadlift 143kg/93kg" → "Deadlift ")."""
+    if not text or not any(c.isdigit() for c in text):
+        return text
+    out, pos = [], 0
+    for m, _, _ in find_loads(text):
+        out.append(text[pos:m.start()])
+        pos = m.end()
+    out.append(text[pos:])
+    return ''.join(out)
+
+
+def rewrite_loads(line, to='kg', only=None):
+    """
+    Rewrite the loads in a display line: to='kg' / 'lb', or 'both' (kg appended to pounds).
+    `only` = set of raw unit tokens to touch (e.g. {'#'}); default = every load.
+    Keeps the source spacing ("55#" → "25kg", "135 lb" → "61 kg").
+    """
+    if not line or not any(c.isdigit() for c in line):
+        return line
+
+    out, pos = [], 0
+    for m, values, unit in find_loads(line):
+        raw_a, raw_b = m.group('ua'), m.group('ub')
+        if only and not ({(raw_a or '').lower(), (raw_b or '').lower()} & only):
+            continue
+        target = 'kg' if to == 'both' else to
+        if unit == target or (to == 'both' and unit != 'lb'):
+            continue
+        conv = [_to_kg(v, unit) if target == 'kg' else _to_kg(v, unit) * LB_PER_KG for v in values]
+        conv = [str(round(x)) for x in conv]
+        gap = ' ' if re.search(r'[\d½]\s+[^\d½]*$', m.group(0)) else ''
+        if m.group('r'):
+            text = f"{conv[0]}-{conv[1]}" + gap + target
+        elif raw_a and len(values) == 2:
+            text = f"{conv[0]}{target}/{conv[1]}{target}"
+        else:
+            text = '/'.join(conv) + gap + target
+        if to == 'both':
+            text = f"{m.group(0)} ({'/'.join(conv)} kg)"
+        out.append(line[pos:m.start()])
+        out.append(text)
+        pos = m.end()
+    if not out:
+        return line
+    out.append(line[pos:])
+    return ''.join(out)
@@ -0,0 +1,104 @@
+"""
+Shared HTTP helpers for the scrapers.
+
+Decoding: `requests` guesses r.text from the Content-Type header and falls back to
+ISO-8859-1 for text/html without a charset – that is where "â\\x80\\x93"-style mojibake
+comes from (UTF-8 bytes read as Latin-1). We hand r.content bytes to the parser with
+the declared charset, else the <meta charset> sniffed from the first bytes, else UTF-8.
+fix_mojibake() is the one-pass repair table for text that arrives already broken.
+
+http_get() is the shared client: one requests.Session per thread (keep-alive to the same
+host across days; scheduler.py runs each source on its own worker thread) with the
+browser-like HEADERS every scraper used to define for itself.
+"""
+import re
+import threading
+
+import requests
+from bs4 import BeautifulSoup
+
+HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+        'AppleWebKit/537.36 (KHTML, like Gecko) '
+        'Chrome/120.0.0.0 Safari/537.36'
+    ),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+}
+TIMEOUT = 15
+
+CHARSET_HEADER_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+CHARSET_META_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.I)
+SNIFF_BYTES = 4096
+
+# UTF-8 punctuation decoded as Latin-1 (â\x80\x93) or as cp1252 (â€“) → the real character
+MOJIBAKE = {
+    'â\x80\x93': '–', 'â€“': '–',   # en-dash
+    'â\x80\x94': '—', 'â€”': '—',   # em-dash
+    'â\x80\x98': "'", 'â€˜': "'",   # left single quote
+    'â\x80\x99': "'", 'â€™': "'",   # right single quote
+    'â\x80\x9c': '"', 'â€œ': '"',   # left double quote
+    'â\x80\x9d': '"', 'â€\x9d': '"',  # right double quote
+    'â\x80¢': '•', 'â€¢': '•',      # bullet
+    'â\x80¦': '…', 'â€¦': '…',      # ellipsis
+    'â\x99\x80': '♀', 'â™€': '♀',   # female
+    'â\x99\x82': '♂', 'â™‚': '♂',   # male
+    'Â\xa0': ' ',                   # non-breaking space
+}
+# Longest sequences first, then any leftover "â" + C1 control junk is dropped
+MOJIBAKE_RE = re.compile(
+    '|'.join(re.escape(k) for k in sorted(MOJIBAKE, key=len, reverse=True))
+    + '|â[\x80-\x9f][\x80-\xbf]?'
+)
+
+
+def _fix(m):
+    return MOJIBAKE.get(m.group(0), '')
+
+
+def fix_mojibake(text):
+    """Repair mis-decoded punctuation in one regex pass (no-op on clean text)."""
+    if not text or ('â' not in text and 'Â' not in text):
+        return text
+    return MOJIBAKE_RE.sub(_fix, text)
+
+
+_local = threading.local()
+
+
+def session():
+    """This thread's requests.Session (created on first use)."""
+    s = getattr(_local, 'session', None)
+    if s is None:
+        s = _local.session = requests.Session()
+        s.headers.update(HEADERS)
+    return s
+
+
+def http_get(url, timeout=TIMEOUT, headers=None, **kwargs):
+    """GET through the thread's shared session; `headers` are added to / override HEADERS."""
+    return session().get(url, timeout=timeout, headers=headers, **kwargs)
+
+
+def response_charset(r):
+    """Declared charset (Content-Type header), else <meta charset> in the first bytes, else UTF-8."""
+    m = CHARSET_HEADER_RE.search(r.headers.get('Content-Type', '') or '')
+    if m:
+        return m.group(1).lower()
+    m = CHARSET_META_RE.search(r.content[:SNIFF_BYTES])
+    if m:
+        return m.group(1).decode('ascii', 'ignore').lower()
+    return 'utf-8'
+
+
+def response_text(r):
+    """Response body decoded with response_charset() (for regex work on the raw page)."""
+    try:
+        return r.content.decode(response_charset(r), errors='replace')
+    except LookupError:
+        return r.content.decode('utf-8', errors='replace')
+
+
+def make_soup(r, parser='html.parser'):
+    """BeautifulSoup straight from the response bytes – no r.text, no full-body charset detection."""
+    return BeautifulSoup(r.content, parser, from_encoding=response_charset(r))
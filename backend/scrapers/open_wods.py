@@ -8,18 +8,32 @@ Source: https://games.crossfit.com/workouts/open/YEAR
 """
 import json
 import re
-import hashlib
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
+from datetime import datetime
 from pathlib import Path
 
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-}
+from scrapers.cleanup import CleanupRules, clean
+from scrapers.keywords import compile_keywords
+from scrapers.net import http_get, make_soup
 
 _OPEN_CACHE = None
 
+# תחילת בלוק האימון / עצירה כשמתחילים הסברים (Movement Standards וכו')
+BLOCK_START_RE = compile_keywords(['for time', 'amrap', 'complete as many', 'for total', 'rounds for time'])
+BLOCK_STOP_RE = compile_keywords([
+    'movement standards',
+    'video submission standards',
+    'notes',
+    'tiebreak',
+    'equipment',
+    'download the workout description',
+    'workout description & scorecard',
+])
+
+# קוד אימון בעמוד ('16.1'); lookahead כדי לתפוס גם קודים חופפים
+CODE_RE = re.compile(r'(?=(\d{2}\.\d))')
+CLEANUP = CleanupRules(tags=frozenset({'script', 'style', 'img', 'picture', 'video', 'iframe'}))
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR.parent / 'data'
 SPECIAL_CACHE = DATA_DIR / 'special_cache.json'
@@ -45,6 +59,55 @@ def _save_cache(data):
         json.dump(data, f, ensure_ascii=False, indent=2)
 
 
+def _page_lines(text):
+    return [l.strip() for l in text.split('\n') if l.strip()]
+
+
+def _index_page(lines):
+    """
+    סריקה אחת של העמוד: השורה הראשונה של כל קוד אימון ('16.1', '17.2'...)
+    + כל השורות שפותחות בלוק אימון ('For time', 'AMRAP'...).
+    שתי סריקות regex על הטקסט המחובר; מיקום → מספר שורה דרך bisect.
+    """
+    joined = '\n'.join(lines)
+    offsets = []
+    pos = 0
+    for l in lines:
+        offsets.append(pos)
+        pos += len(l) + 1
+
+    code_lines = {}
+    for m in CODE_RE.finditer(joined):
+        code_lines.setdefault(m.group(1), bisect_right(offsets, m.start()) - 1)
+    lowered = joined.lower()
+    if len(lowered) == len(joined):
+        block_starts = sorted({bisect_right(offsets, m.start()) - 1 for m in BLOCK_START_RE.finditer(lowered)})
+    else:  # lower() שינה אורך (תווי Unicode נדירים) – המיקומים לא תואמים, סורקים שורה-שורה
+        block_starts = [i for i, l in enumerate(lines) if BLOCK_START_RE.search(l.lower())]
+    return code_lines, block_starts
+
+
+def _slice_block(lines, start_idx, block_starts):
+    """
+    מהשורה start_idx: קופצים לתחילת הבלוק הבאה ('For time' / 'AMRAP'...), אוספים עד 25 שורות
+    ועוצרים כשמתחילים הסברים (Movement Standards / Notes / Video Submission Standards וכו').
+    """
+    k = bisect_left(block_starts, start_idx)
+    if k < len(block_starts):
+        start_idx = block_starts[k]
+
+    block = []
+    for l in lines[start_idx:start_idx + 40]:
+        if BLOCK_STOP_RE.search(l.lower()):
+            break
+        block.append(l)
+        if len(block) >= 25:
+            break
+
+    # מסנן שורות סופר-ארוכות / טקסט רציף
+    return [l for l in block if len(l) <= 160]
+
+
 def _extract_workout_block_from_text(text, name_hint=None):
     """
     קבלת טקסט מלא של עמוד → ניסיון לחלץ ממנו בלוק קצר של האימון עצמו,
@@ -54,74 +117,45 @@ def _extract_workout_block_from_text(text, name_hint=None):
     - נחפש שורה שמכילה את מספר האימון (למשל '17.1', '16.2' וכו').
     - משם נגלול קדימה ונעצור כשאנחנו נתקלים בכותרות הסבר ארוכות.
     """
-    lines = [l.strip() for l in text.split('\n') if l.strip()]
+    lines = _page_lines(text)
     if not lines:
         return []
+    code_lines, block_starts = _index_page(lines)
 
-    # אם יש רמז לשם (למשל "Open 17.1"), ננסה למצוא שורה דומה
+    # אם יש רמז לשם (למשל "Open 17.1"), מתחילים מהשורה הראשונה שמכילה אותו
     start_idx = 0
     if name_hint:
-        pattern = re.escape(name_hint.split()[-1])  # למשל 17.1
-        for i, l in enumerate(lines):
-            if re.search(pattern, l):
-                start_idx = i
-                break
-
-    # fallback: חפש 'For time', 'AMRAP', 'Complete as many', 'For total time' וכו'
-    keywords = ['for time', 'amrap', 'complete as many', 'for total', 'rounds for time']
-    for i in range(start_idx, len(lines)):
-        low = lines[i].lower()
-        if any(k in low for k in keywords):
-            start_idx = i
-            break
-
-    # אוספים עד 25 שורות קדימה, ועוצרים כשמתחילים הסברים
-    stop_keywords = [
-        'movement standards',
-        'video submission standards',
-        'notes',
-        'tiebreak',
-        'equipment',
-        'download the workout description',
-        'workout description & scorecard',
-    ]
-    block = []
-    for l in lines[start_idx:start_idx + 40]:
-        low = l.lower()
-        if any(k in low for k in stop_keywords):
-            break
-        block.append(l)
-        if len(block) >= 25:
-            break
+        hint = name_hint.split()[-1]
+        start_idx = code_lines.get(hint)
+        if start_idx is None:
+            start_idx = next((i for i, l in enumerate(lines) if hint in l), 0)
 
-    # מסנן שורות סופר-ארוכות / טקסט רציף
-    clean = []
-    for l in block:
-        if len(l) > 160:
-            continue
-        clean.append(l)
-    return clean
+    return _slice_block(lines, start_idx, block_starts)
 
 
 def _scrape_year_2011_2016(year):
     """
     שנים 2011–2016: כל האימונים מופיעים בדף השנה.
-    נחלץ את כל הבלוקים שמתחילים ב'Workout XX.X' או 'XX.X'.
+    נחלץ את כל הבלוקים שמתחילים ב'Workout XX.X' או 'XX.X' – אינדקס אחד לכל העמוד,
+    וכל בלוק נחתך ממנו (בלי לפצל את העמוד מחדש לכל אימון).
     """
     url = f'https://games.crossfit.com/workouts/open/{year}'
     print(f"    → Fetching Open year page {year}: {url}")
-    r = requests.get(url, timeout=20, headers=HEADERS)
+    r = http_get(url, timeout=20)
     if r.status_code != 200:
         print(f"    → HTTP {r.status_code} for year {year}")
         return []
 
-    soup = BeautifulSoup(r.text, 'html.parser')
+    soup = make_soup(r)
     # מסירים רעש
-    for tag in soup.find_all(['script', 'style', 'img', 'picture', 'video', 'iframe']):
-        tag.decompose()
+    clean(soup, CLEANUP)
+
+    return _parse_year_page(soup.get_text(separator='\n'), year)
+
 
-    text = soup.get_text(separator='\n')
-    lines = [l.strip() for l in text.split('\n') if l.strip()]
+def _parse_year_page(text, year):
+    lines = _page_lines(text)
+    code_lines, block_starts = _index_page(lines)
 
     workouts = []
     # עבור כל אימון שנהוג שיהיו 5 אימונים בשנים אלה
@@ -129,12 +163,11 @@ def _scrape_year_2011_2016(year):
         code = f"{str(year)[-2:]}.{n}"  # למשל '16.1'
         title = f"Open {code}"
 
-        # חפש אינדקס של בלוק האימון לפי הקוד
-        joined = "\n".join(lines)
-        if code not in joined:
+        start_idx = code_lines.get(code)
+        if start_idx is None:
             continue
 
-        block = _extract_workout_block_from_text(text, name_hint=code)
+        block = _slice_block(lines, start_idx, block_starts)
         if len(block) < 2:
             continue
 
@@ -161,15 +194,14 @@ def _scrape_year_2017_plus(year, count):
         title = f"Open {code}"
 
         print(f"    → Fetching Open {code}: {url}")
-        r = requests.get(url, timeout=20, headers=HEADERS)
+        r = http_get(url, timeout=20)
         if r.status_code != 200:
             print(f"      → HTTP {r.status_code} for {code}")
             continue
 
-        soup = BeautifulSoup(r.text, 'html.parser')
+        soup = make_soup(r)
         # מסירים רעש
-        for tag in soup.find_all(['script', 'style', 'img', 'picture', 'video', 'iframe']):
-            tag.decompose()
+        clean(soup, CLEANUP)
 
         text = soup.get_text(separator='\n')
         block = _extract_workout_block_from_text(text, name_hint=code)
@@ -265,39 +297,8 @@ def fetch_all_open():
     return _OPEN_CACHE
 
 
-def fetch_open(date):
-    """
-    בוחר אימון Open יומי מהמחסן, עם רנדומציה דטרמיניסטית וחלון אי-חזרה של 14 יום.
-    (עדכון מקור ל-games.crossfit.com יהיה בשלב הבא.)
-    """
-    workouts = fetch_all_open()
-    if not workouts:
-        print("    → No Open workouts available")
-        return None
-
-    date_str = date.strftime('%Y-%m-%d')
-    print(f"  ⬇ CrossFit Open Workouts...")
-
-    date_hash = int(hashlib.md5(date_str.encode()).hexdigest(), 16)
-
-    excluded_indices = set()
-    for days_ago in range(1, 15):
-        past_date = date - timedelta(days=days_ago)
-        past_str = past_date.strftime('%Y-%m-%d')
-        past_hash = int(hashlib.md5(past_str.encode()).hexdigest(), 16)
-        excluded_idx = past_hash % len(workouts)
-        excluded_indices.add(excluded_idx)
-
-    base_idx = date_hash % len(workouts)
-    chosen_idx = base_idx
-    attempts = 0
-    while chosen_idx in excluded_indices and attempts < len(workouts):
-        chosen_idx = (chosen_idx + 1) % len(workouts)
-        attempts += 1
-
-    workout = workouts[chosen_idx]
-    print(f"    → Selected: {workout['name']} (#{chosen_idx + 1}/{len(workouts)})")
-
+def _make_open_wod(workout, date_str):
+    """Build one Open workout dict for a given warehouse entry and date."""
     processed_lines = []
     for line in workout['lines']:
         low = line.lower()
@@ -320,8 +321,11 @@ def fetch_open(date):
 
 
 if __name__ == '__main__':
-    # Test
-    result = fetch_open(datetime.now())
+    # Test: today's pick from the rotation calendar (the same path fetch_all takes)
+    from scrapers.special_calendar import calendar_wod, ensure_calendar
+    today = datetime.now().strftime('%Y-%m-%d')
+    calendar, _ = ensure_calendar(today)
+    result = calendar_wod('open', today, calendar)
     if result:
         print(f"\n✅ Success!")
         print(f"Title: {result['sections'][0]['title']}")
@@ -1,20 +1,14 @@
 """
 CrossFit Postal & CrossFit Green Beach
 
-POSTAL: Minimal cleanup - don't kill content divs!
+POSTAL: Minimal cleanup - don't kill content divs! (SourceSpec run by engine.py)
 """
 import re
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
 
-HEADERS = {
-    'User-Agent': (
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-        'AppleWebKit/537.36 (KHTML, like Gecko) '
-        'Chrome/120.0.0.0 Safari/537.36'
-    ),
-}
+from scrapers.cleanup import MEDIA_TAGS, NAV_FOOTER_RE, NOISE_TAGS, SAFE_JUNK_RE, CleanupRules
+from scrapers.engine import SourceSpec, make_fetcher
+from scrapers.keywords import compile_keywords
+from scrapers.sectionize import SectionRules, Sectionizer
 
 DATE_HDR = re.compile(
     r'crossfit\s*[–\-—]\s*(mon|tue|wed|thu|fri|sat|sun)',
@@ -27,151 +21,52 @@ SECTION_HINTS = [
     'accessory', 'cool down', 'power', 'endurance', 'barbell',
 ]
 
+# Contact/booking block after the WOD
+CONTACT_STOP_RE = compile_keywords([
+    'book a drop-in', 'click here to pay', 'sign your waiver',
+    'postal street', 'outlook.com', 'hours', 'mon ', 'tue ', 'wed ',
+])
+INTERMEDIATE_RE = re.compile(r'^intermediate(?: |$)')
+
 NAV_WORDS = {
     'home', 'about', 'contact', 'schedule', 'membership', 'memberships',
     'coaches', 'crossfit', 'postal', 'shop', 'login', 'register',
     'search', 'wod', 'daily wod', 'blog', 'skip to content',
     'drop-in', 'foundations', 'gear store', 'contact us',
 }
+MAX_LINES = 50
 
+# Page-level header/footer only (not content headers!) + obvious junk
+CLEANUP = CleanupRules(
+    tags=NOISE_TAGS | MEDIA_TAGS,
+    class_re=re.compile(f'{NAV_FOOTER_RE.pattern}|{SAFE_JUNK_RE.pattern}', re.I),
+    id_re=NAV_FOOTER_RE,
+)
 
-def parse_sections(lines):
-    sections = []
-    cur = {'title': 'WORKOUT', 'lines': []}
-    for line in lines:
-        lo = line.lower()
-        is_hdr = False
-        if line.isupper() and 3 <= len(line) <= 60 and not re.search(r'\d', line):
-            is_hdr = True
-        elif (any(kw in lo for kw in SECTION_HINTS)
-              and len(line) < 60
-              and not re.search(r'\d+\s*(min|rep|round|x\b)', lo)):
-            is_hdr = True
-        if is_hdr:
-            if cur['lines']:
-                sections.append(cur)
-            cur = {'title': line.upper(), 'lines': []}
-        else:
-            cur['lines'].append(line)
-    if cur['lines']:
-        sections.append(cur)
-    return sections or [{'title': 'WORKOUT', 'lines': lines}]
-
-
-def fetch_postal(date):
-    """Today-only source."""
-    today_str = datetime.now().strftime('%Y-%m-%d')
-    date_str  = date.strftime('%Y-%m-%d')
-
-    if date_str != today_str:
-        return None
-
-    url = 'https://crossfitpostal.com/dailywod'
-
-    try:
-        print(f"    → Fetching {url}")
-        r = requests.get(url, timeout=15, headers=HEADERS)
-
-        if r.status_code != 200:
-            print(f"    → HTTP {r.status_code}")
-            return None
-
-        soup = BeautifulSoup(r.text, 'html.parser')
-
-        # MINIMAL cleanup
-        for tag in soup.find_all(['script', 'style', 'iframe', 'noscript', 'form']):
-            tag.decompose()
-        for img in soup.find_all(['img', 'picture', 'figure']):
-            img.decompose()
-        
-        # Remove ONLY page-level header/footer (not content headers!)
-        NAV_FOOTER_RE = re.compile(
-            r'site-header|page-header|main-header|site-navigation|'
-            r'primary-navigation|site-footer|page-footer|main-footer', re.I
-        )
-        for tag in soup.find_all(class_=NAV_FOOTER_RE):
-            tag.decompose()
-        for tag in soup.find_all(id=NAV_FOOTER_RE):
-            tag.decompose()
-        
-        # Remove only obvious junk
-        SAFE_JUNK_RE = re.compile(
-            r'^(sidebar|comment-|widget-|share-buttons|social-share|'
-            r'breadcrumb|cookie-notice|popup-|modal-)', re.I
-        )
-        for tag in soup.find_all(class_=SAFE_JUNK_RE):
-            tag.decompose()
-
-        body = soup.find('body') or soup
-        raw_lines = [
-            l.strip()
-            for l in body.get_text(separator='\n').split('\n')
-            if l.strip() and len(l.strip()) > 1
-        ]
-
-        print(f"    → {len(raw_lines)} raw lines after cleanup")
-
-        # Find date marker
-        start_idx = 0
-        for i, line in enumerate(raw_lines):
-            if DATE_HDR.search(line):
-                start_idx = i + 1
-                print(f"    → Date marker at line {i}: '{line}'")
-                break
-        else:
-            print(f"    → No date marker – starting from top")
-
-        # Collect workout lines - STOP at contact/navigation
-        workout_lines = []
-        for line in raw_lines[start_idx:]:
-            lo = line.lower().strip()
-
-            # STOP conditions (in order of priority)
-            # 1. Stop at Intermediate section
-            if lo == 'intermediate' or lo.startswith('intermediate '):
-                print(f"    → Stopped at 'Intermediate'")
-                break
-            
-            # 2. Stop at contact/booking info
-            if any(stop in lo for stop in [
-                'book a drop-in', 'click here to pay', 'sign your waiver',
-                'postal street', 'outlook.com', 'hours', 'mon ', 'tue ', 'wed '
-            ]):
-                print(f"    → Stopped at contact info")
-                break
-
-            # Skip navigation links
-            if lo in NAV_WORDS:
-                continue
-            if len(line) > 200:
-                continue
-
-            workout_lines.append(line)
-
-        workout_lines = workout_lines[:50]
-
-        if not workout_lines:
-            print(f"    → No workout lines found")
-            return None
-
-        sections = parse_sections(workout_lines)
-        total = sum(len(s['lines']) for s in sections)
-        print(f"    → SUCCESS: {len(sections)} sections, {total} lines")
-
-        return {
-            'date':        date_str,
-            'source':      'postal',
-            'source_name': 'CrossFit Postal',
-            'url':         url,
-            'sections':    sections,
-        }
 
-    except requests.Timeout:
-        print(f"    → Timeout")
-        return None
-    except Exception as e:
-        print(f"    → Error: {e}")
-        return None
+parse_sections = Sectionizer(SectionRules(
+    caps=(3, 60), caps_digits=False,
+    hints=tuple(SECTION_HINTS), hint_max_len=60, hint_exclude=r'\d+\s*(min|rep|round|x\b)',
+    title=str.upper,
+))
+
+
+# Today-only source
+POSTAL = SourceSpec(
+    id='postal',
+    name='CrossFit Postal',
+    url='https://crossfitpostal.com/dailywod',
+    sectionize=parse_sections,
+    cleanup=CLEANUP,
+    start_re=DATE_HDR,
+    # STOP at the Intermediate section, then at contact/booking info
+    stop=(INTERMEDIATE_RE, CONTACT_STOP_RE),
+    skip_words=frozenset(NAV_WORDS),
+    max_len=200,
+    max_lines=MAX_LINES,
+    today_only=True,
+)
+fetch_postal = make_fetcher(POSTAL)
 
 
 def fetch_greenbeach(date):
@@ -13,15 +13,13 @@ Ghost blog URL pattern is typically:
   https://crossfitpanda-ghost.fly.dev/YYYY/MM/DD/post-slug/
   OR just /post-slug/
 """
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import re
 
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-}
+from scrapers.cleanup import NOISE_TAGS, CleanupRules, clean
+from scrapers.keywords import compile_keywords
+from scrapers.net import http_get, make_soup
+from scrapers.sectionize import SectionRules, Sectionizer
 
 BASE_URL = 'https://crossfitpanda-ghost.fly.dev'
 
@@ -32,36 +30,27 @@ SECTION_HINTS = ['warm', 'strength', 'skill', 'wod', 'metcon', 'conditioning',
 STOP_WORDS = ['leave a comment', 'leave a reply', 'post comment', 'subscribe',
               'newsletter', 'copyright', 'privacy', 'share this', 'you may also like']
 
+STOP_WORDS_RE = compile_keywords(STOP_WORDS)
+CLEANUP = CleanupRules(
+    tags=NOISE_TAGS | {'nav', 'footer', 'img'},
+    class_re=re.compile(r'sidebar|comment|widget|share|social|related|footer|nav|cookie', re.I),
+)
 
-def parse_sections(lines):
-    sections = []
-    cur = {'title': 'WORKOUT', 'lines': []}
-    for line in lines:
-        lo = line.lower()
-        is_hdr = False
-        if line.isupper() and 3 <= len(line) <= 60 and not re.search(r'\d', line):
-            is_hdr = True
-        elif (any(kw in lo for kw in SECTION_HINTS) and len(line) < 60
-              and not re.search(r'\d+\s*(min|rep|round|x\b)', lo)):
-            is_hdr = True
-        if is_hdr:
-            if cur['lines']:
-                sections.append(cur)
-            cur = {'title': line.upper(), 'lines': []}
-        else:
-            cur['lines'].append(line)
-    if cur['lines']:
-        sections.append(cur)
-    return sections or [{'title': 'WORKOUT', 'lines': lines}]
+
+parse_sections = Sectionizer(SectionRules(
+    caps=(3, 60), caps_digits=False,
+    hints=tuple(SECTION_HINTS), hint_max_len=60, hint_exclude=r'\d+\s*(min|rep|round|x\b)',
+    title=str.upper,
+))
 
 
 def get_post_links(page_url):
     """Fetch an index page and return (post_url, post_title, post_date_str) tuples."""
     try:
-        r = requests.get(page_url, timeout=12, headers=HEADERS)
+        r = http_get(page_url, timeout=12)
         if r.status_code != 200:
             return []
-        soup = BeautifulSoup(r.text, 'html.parser')
+        soup = make_soup(r)
 
         posts = []
 
@@ -130,19 +119,13 @@ def date_in_title(title, date):
 def fetch_post(post_url, date_str):
     """Fetch a single post page and extract the workout."""
     try:
-        r = requests.get(post_url, timeout=12, headers=HEADERS)
+        r = http_get(post_url, timeout=12)
         if r.status_code != 200:
             return None
 
-        soup = BeautifulSoup(r.text, 'html.parser')
+        soup = make_soup(r)
 
-        for tag in soup.find_all(['script', 'style', 'iframe', 'noscript', 'form', 'nav', 'footer']):
-            tag.decompose()
-        for img in soup.find_all('img'):
-            img.decompose()
-        for tag in soup.find_all(class_=re.compile(
-                r'sidebar|comment|widget|share|social|related|footer|nav|cookie', re.I)):
-            tag.decompose()
+        clean(soup, CLEANUP)
 
         # Ghost content div
         content = (soup.find(class_='gh-content') or
@@ -160,7 +143,7 @@ def fetch_post(post_url, date_str):
         workout_lines = []
         for line in raw_lines:
             lo = line.lower()
-            if any(s in lo for s in STOP_WORDS):
+            if STOP_WORDS_RE.search(lo):
                 break
             if len(line) > 200:
                 continue
@@ -4,19 +4,17 @@ URL: crossfitrestoration.com/wod-{month}-{day}-{year}/
 
 CRITICAL FIX: Don't remove ALL <header> tags - only site-header/page-header.
 Content is often inside <header class="entry-header"> in WordPress!
+Declarative SourceSpec run by engine.py.
 """
 import re
-import requests
-from bs4 import BeautifulSoup, NavigableString
-from datetime import datetime
+from dataclasses import replace
 
-HEADERS = {
-    'User-Agent': (
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-        'AppleWebKit/537.36 (KHTML, like Gecko) '
-        'Chrome/120.0.0.0 Safari/537.36'
-    ),
-}
+from scrapers.cleanup import MEDIA_TAGS, NAV_FOOTER_RE, NOISE_TAGS, SAFE_JUNK_RE, CleanupRules
+from scrapers.endpoints import Endpoint
+from scrapers.engine import SourceSpec, extract_lines, make_fetcher
+from scrapers.keywords import compile_keywords
+from scrapers.sectionize import SectionRules, Sectionizer
+from scrapers.lines import BOLD_TAGS, Line, iter_lines
 
 MONTHS = {
     1:'january',  2:'february', 3:'march',    4:'april',
@@ -35,11 +33,55 @@ SECTION_HINTS = [
     'accessory', 'cool down', 'power', 'endurance', 'barbell',
 ]
 
+# Hint lines that start like this are headers even with "10 min"/"x 5" in them
+HEADER_PREFIXES = (
+    'warm', 'strength', 'skill', 'for time', 'power clean', 'back squat',
+    'deadlift', 'snatch', 'clean and jerk',
+)
+WORKOUT_LINE = r'\d+\s*(min|rep|round|x\b|second|meter|cal)'
+
 NAV_WORDS = {
     'home', 'about', 'contact', 'wod', 'schedule', 'membership',
     'coaches', 'crossfit', 'restoration', 'blog', 'gallery',
     'register', 'login', 'shop', 'search', 'skip to content',
 }
+WOD_LINK_RE = re.compile(r'^wod[-–]')
+
+# End of the workout: "Intermediate" version, "Prev" (navigation footer)
+INTERMEDIATE_RE = re.compile(r'^intermediate(?: |$)')
+PREV_RE = re.compile(r'^prev(?:ious)?$')
+
+# End of the post: comments, share/footer widgets
+STOP_PREFIX_RE = compile_keywords([
+    'leave a reply', 'leave a comment', 'post comment',
+    'logged in', 'your email', 'required fields',
+    'subscribe', 'newsletter', 'copyright', 'privacy',
+    'share this', 'filed under', 'tagged',
+    'related posts', 'quick links', 'get in touch',
+], prefix=True)
+MAX_LINES = 60
+
+
+# Scripts, images, page-level nav/footer (NOT all <nav>/<header> – content might be inside
+# them!) and obvious junk containers (see cleanup.py)
+CLEANUP = CleanupRules(
+    tags=NOISE_TAGS | MEDIA_TAGS,
+    class_re=re.compile(f'{NAV_FOOTER_RE.pattern}|{SAFE_JUNK_RE.pattern}', re.I),
+    id_re=NAV_FOOTER_RE,
+)
+
+
+# WordPress: REST posts for the whole window, then the RSS feed; WOD date from the slug (wod-february-16-2026)
+ENDPOINTS = (
+    Endpoint('wp', 'https://crossfitrestoration.com', key='slug'),
+    Endpoint('feed', 'https://crossfitrestoration.com/feed/', key='slug'),
+)
+
+
+# Sitemap discovery (sitemap.py) – Yoast index, then the WordPress core sitemap.
+# PARSER_VERSION: bump when the parsing changes so every day is fetched again.
+SITEMAPS = ('https://crossfitrestoration.com/sitemap_index.xml', 'https://crossfitrestoration.com/wp-sitemap.xml')
+PARSER_VERSION = 1
 
 
 def make_url(date):
@@ -49,221 +91,69 @@ def make_url(date):
     )
 
 
-def parse_sections(lines):
-    """
-    Restoration uses bold text for section headers.
-    We preserve bold lines by injecting a marker "__BOLD__" before their text.
-    """
-    sections = []
-    cur = {'title': 'WORKOUT', 'lines': []}
-
-    for line in lines:
-        # Subheader from Wodify (div.soswodify_component_name) – always a section title
-        is_subheader = line.startswith("__SUBHEADER__")
-        if is_subheader:
-            line = line.replace("__SUBHEADER__", "", 1).strip()
-        # Bold markers coming from HTML (<strong>/<b>)
-        is_bold = False
-        if line.startswith("__BOLD__"):
-            is_bold = True
-            line = line.replace("__BOLD__", "", 1).strip()
-
-        lo = line.lower()
-        is_hdr = False
-
-        if is_subheader and line:
-            is_hdr = True
-        # Any bold line = subheader (so we don't miss any)
-        elif is_bold and line:
-            is_hdr = True
-        # ALL-CAPS short text (e.g., "STRENGTH")
-        elif line.isupper() and 3 <= len(line) <= 60 and not re.search(r'\d', line):
-            is_hdr = True
-        
-        # Contains section keywords AND is reasonably short (< 80 chars)
-        #    AND doesn't look like a workout line (no "x 10 reps" pattern)
-        elif len(line) < 80 and any(kw in lo for kw in SECTION_HINTS):
-            # Exclude lines that are clearly workout instructions
-            # (e.g., "10 min AMRAP" vs "Power Clean")
-            if not re.search(r'\d+\s*(min|rep|round|x\b|second|meter|cal)', lo):
-                is_hdr = True
-            # BUT: "For time (Time)" or "Power Clean (In 15-20 minutes...)" ARE headers
-            # Pattern: starts with keyword, may have parentheses
-            elif any(lo.startswith(kw) for kw in ['warm', 'strength', 'skill', 'for time',
-                                                     'power clean', 'back squat', 'deadlift',
-                                                     'snatch', 'clean and jerk']):
-                is_hdr = True
-        
-        if is_hdr:
-            if cur['lines']:
-                sections.append(cur)
-            cur = {'title': line.strip(), 'lines': []}  # Keep original case
-        else:
-            cur['lines'].append(line)
-    
-    if cur['lines']:
-        sections.append(cur)
-    
-    return sections or [{'title': 'WORKOUT', 'lines': lines}]
-
-
-def fetch_workout(date):
-    date_str = date.strftime('%Y-%m-%d')
-    url = make_url(date)
-
-    try:
-        print(f"    → Fetching {url}")
-        r = requests.get(url, timeout=15, headers=HEADERS)
-
-        if r.status_code == 404:
-            print(f"    → 404 – no WOD for {date_str}")
-            return None
-        if r.status_code != 200:
-            print(f"    → HTTP {r.status_code}")
-            return None
-
-        soup = BeautifulSoup(r.text, 'html.parser')
-
-        # ── MINIMAL cleanup - remove ONLY obvious noise ───────────────────────
-        # Remove scripts, styles, iframes
-        for tag in soup.find_all(['script', 'style', 'iframe', 'noscript', 'form']):
-            tag.decompose()
-        
-        # Remove ALL images
-        for img in soup.find_all(['img', 'picture', 'figure']):
-            img.decompose()
-        
-        # Remove ONLY page-level nav/footer (with specific classes)
-        # NOT all <nav>/<header> tags (content might be inside them!)
-        NAV_FOOTER_RE = re.compile(
-            r'site-header|page-header|main-header|site-navigation|'
-            r'primary-navigation|site-footer|page-footer|main-footer', re.I
-        )
-        for tag in soup.find_all(class_=NAV_FOOTER_RE):
-            tag.decompose()
-        for tag in soup.find_all(id=NAV_FOOTER_RE):
-            tag.decompose()
-        
-        # Remove only OBVIOUS junk divs
-        SAFE_JUNK_RE = re.compile(
-            r'^(sidebar|comment-|widget-|share-buttons|social-share|'
-            r'breadcrumb|cookie-notice|popup-|modal-)', re.I
-        )
-        for tag in soup.find_all(class_=SAFE_JUNK_RE):
-            tag.decompose()
+# Restoration uses bold text for section headers. `lines` are lines.Line tokens:
+#  - bold (<strong>/<b>) and Wodify subheader lines are always titles (original case kept)
+#  - ALL-CAPS short text without digits (e.g. "STRENGTH")
+#  - section keyword and < 80 chars, unless it looks like a workout line ("10 min AMRAP") –
+#    but "For time (Time)" / "Power Clean (In 15-20 minutes...)" ARE headers
+parse_sections = Sectionizer(SectionRules(
+    formatted=True,
+    caps=(3, 60), caps_digits=False,
+    hints=tuple(SECTION_HINTS), hint_max_len=80, hint_exclude=WORKOUT_LINE, hint_rescue=HEADER_PREFIXES,
+))
 
-        body = soup.find('body') or soup
 
-        # Subheaders from Wodify plugin: div.soswodify_component_name (first line = title, rest = content)
-        for tag in body.find_all(class_=lambda c: c and 'soswodify_component_name' in c):
-            for br in tag.find_all('br'):
-                br.replace_with('\n')
-            # Preserve bold inside this div so "8 rounds for time (Time)" etc. become section headers
-            for bold_tag in tag.find_all(['strong', 'b']):
-                txt = bold_tag.get_text(" ", strip=True)
-                if txt:
-                    bold_tag.replace_with(NavigableString("\n__BOLD__" + txt + "\n"))
-            raw = tag.get_text(separator='\n', strip=False)
-            lines = [l.strip() for l in raw.split('\n') if l.strip()]
-            if not lines:
-                tag.decompose()
-                continue
-            first = lines[0]
-            # Prefer subtitle in parentheses e.g. "Bench Press ("Tempo Pause Bench Press" -> "Tempo Pause Bench Press"
-            if ' ("' in first:
-                parts = first.split(' ("', 1)
-                if len(parts) > 1:
-                    after = parts[1].split('"')[0].strip()
-                    if after:
-                        first = after
-            if first and ' (' in first:
-                first = (first.split(' (')[0].strip() or first)
-            if first and first.endswith(' ('):
-                first = first[:-2].strip()
-            subheader = "\n__SUBHEADER__" + first + "\n"
-            rest = "\n".join(lines[1:]) + "\n" if len(lines) > 1 else ""
-            tag.replace_with(NavigableString(subheader + rest))
-
-        # Preserve bold headings: inject marker so parse_sections can treat them as subheaders.
-        for tag in body.find_all(['strong', 'b']):
-            txt = tag.get_text(" ", strip=True)
-            if not txt:
-                continue
-            tag.replace_with("\n__BOLD__" + txt + "\n")
-
-        raw_lines = [
-            l.strip()
-            for l in body.get_text(separator='\n').split('\n')
-            if l.strip() and len(l.strip()) > 1
-        ]
-
-        print(f"    → {len(raw_lines)} raw lines after cleanup")
-
-        # Find date marker
-        start_idx = 0
-        for i, line in enumerate(raw_lines):
-            if DATE_HDR.search(line):
-                start_idx = i + 1
-                print(f"    → Date marker at line {i}: '{line}'")
-                break
-        else:
-            print(f"    → No date marker – using full body")
-
-        # Collect; STOP at "Intermediate"
-        workout_lines = []
-        for line in raw_lines[start_idx:]:
-            lo = line.lower().strip()
-
-            if lo == 'intermediate' or lo.startswith('intermediate '):
-                print(f"    → Stopped at 'Intermediate'")
-                break
-            
-            # STOP at "Prev" (navigation footer starts here)
-            if lo == 'prev' or lo == 'previous':
-                print(f"    → Stopped at navigation footer")
-                break
-
-            if any(lo.startswith(s) for s in [
-                'leave a reply', 'leave a comment', 'post comment',
-                'logged in', 'your email', 'required fields',
-                'subscribe', 'newsletter', 'copyright', 'privacy',
-                'share this', 'filed under', 'tagged',
-                'related posts', 'quick links', 'get in touch',
-            ]):
-                print(f"    → Stopped at: '{line[:60]}'")
-                break
-
-            if lo in NAV_WORDS:
-                continue
-            if re.match(r'^wod[-–]', lo):
-                continue
-            if len(line) > 200:
-                continue
-
-            workout_lines.append(line)
-
-        workout_lines = workout_lines[:60]
-
-        if not workout_lines:
-            print(f"    → No workout content after filtering")
-            return None
-
-        sections = parse_sections(workout_lines)
-        total = sum(len(s['lines']) for s in sections)
-        print(f"    → SUCCESS: {len(sections)} sections, {total} lines")
+def _wodify_block(tag):
+    """
+    lines.iter_lines hook – Wodify plugin div.soswodify_component_name: first line = section
+    title (subheader), rest = content (bold kept so "8 rounds for time (Time)" etc. become headers).
+    """
+    classes = tag.get('class')
+    if not classes or 'soswodify_component_name' not in classes:
+        return None
+    lines = list(iter_lines(tag))
+    if not lines:
+        return []
+    first = lines[0].text
+    # Prefer subtitle in parentheses e.g. "Bench Press ("Tempo Pause Bench Press" -> "Tempo Pause Bench Press"
+    if ' ("' in first:
+        parts = first.split(' ("', 1)
+        if len(parts) > 1:
+            after = parts[1].split('"')[0].strip()
+            if after:
+                first = after
+    if first and ' (' in first:
+        first = (first.split(' (')[0].strip() or first)
+    if first and first.endswith(' ('):
+        first = first[:-2].strip()
+    return [Line(first, subheader=True)] + lines[1:]
+
+
+SPEC = SourceSpec(
+    id='restoration',
+    name='CrossFit Restoration',
+    url=make_url,
+    sectionize=parse_sections,
+    cleanup=CLEANUP,
+    start_re=DATE_HDR,
+    stop=(INTERMEDIATE_RE, PREV_RE, STOP_PREFIX_RE),
+    skip_words=frozenset(NAV_WORDS),
+    skip=(WOD_LINK_RE,),
+    max_len=200,
+    max_lines=MAX_LINES,
+    bold_tags=BOLD_TAGS,
+    blocks=_wodify_block,
+    formatted_exempt=True,  # bold / subheader lines are section titles
+    line_tokens=True,
+    endpoints=ENDPOINTS,
+)
+fetch_workout = make_fetcher(SPEC)
 
-        return {
-            'date':        date_str,
-            'source':      'restoration',
-            'source_name': 'CrossFit Restoration',
-            'url':         url,
-            'sections':    sections,
-        }
 
-    except requests.Timeout:
-        print(f"    → Timeout")
-        return None
-    except Exception as e:
-        print(f"    → Error: {e}")
-        import traceback; traceback.print_exc()
-        return None
+def extract_workout_lines(body, max_lines=MAX_LINES):
+    """
+    Stream the body's lines: skip to the date marker, collect until "Intermediate" / "Prev" /
+    STOP_PREFIX_RE or max_lines – the walk ends there (comments and footer are never read).
+    """
+    spec = SPEC if max_lines == SPEC.max_lines else replace(SPEC, max_lines=max_lines)
+    return extract_lines(spec, body)
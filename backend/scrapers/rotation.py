@@ -0,0 +1,112 @@
+"""
+Window-aware rotation for the special warehouses (hero / benchmark / open).
+
+One selector for all three: every date gets a deterministic pick (MD5 of the date),
+linear-probed past anything already used in the previous `window` days.
+The whole window is built in a single pass (one hash per date), and dates that
+were already published can be pinned so their pick never changes.
+"""
+import hashlib
+import re
+from collections import deque
+from datetime import date as _date, datetime
+
+WINDOW = 14  # days without a repeat (any 15 consecutive days are unique)
+
+
+def entry_id(entry):
+    """Stable warehouse id: slug of the workout name ("ANNIE\\" - Benchmark" → "annie-benchmark")."""
+    name = (entry.get('name') if isinstance(entry, dict) else entry) or ''
+    slug = re.sub(r'[^a-z0-9]+', '-', str(name).lower()).strip('-')
+    return slug or str(name).strip().lower()
+
+
+def entry_ids(entries):
+    """
+    Unique warehouse ids, in order: the name slug, with "-2", "-3" … on later entries whose
+    slug is already taken (two heroes parsed with the same name stay two picks).
+    """
+    ids, used = [], set()
+    for e in entries:
+        base = eid = entry_id(e)
+        n = 1
+        while eid in used:
+            n += 1
+            eid = f"{base}-{n}"
+        used.add(eid)
+        ids.append(eid)
+    return ids
+
+
+def _as_date(d):
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, _date):
+        return d
+    return datetime.strptime(str(d)[:10], '%Y-%m-%d').date()
+
+
+def _date_hash(date_str):
+    return int(hashlib.md5(date_str.encode()).hexdigest(), 16)
+
+
+def select_window(entries, dates, window=WINDOW, pinned=None):
+    """
+    Pick one entry index per date, in the order of `dates`.
+
+    - No entry id repeats within `window` days (as long as the warehouse has more than `window` ids).
+    - Ids are entry_ids(entries) (unique even when names repeat).
+    - `pinned` = {date_str: entry id} for already-published days; those keep their pick
+      (if the id still exists) and also block repeats for the days after them.
+    Returns a list of indices (None for every date when `entries` is empty).
+    """
+    if not entries:
+        return [None] * len(dates)
+    n = len(entries)
+    ids = entry_ids(entries)
+    index = {eid: i for i, eid in enumerate(ids)}
+    pinned = {k: v for k, v in (pinned or {}).items() if v in index}
+
+    days = sorted({_as_date(d) for d in dates})
+    if not days:
+        return []
+
+    # Seed the exclusion window with pins just before the first requested day
+    recent = deque()   # (ordinal, entry_id), oldest first
+    in_window = {}     # entry_id -> count inside the window
+    start = days[0].toordinal()
+    for back in range(window, 0, -1):
+        ds = _date.fromordinal(start - back).strftime('%Y-%m-%d')
+        eid = pinned.get(ds)
+        if eid is not None:
+            recent.append((start - back, eid))
+            in_window[eid] = in_window.get(eid, 0) + 1
+
+    chosen = {}
+    for day in days:
+        ordinal = day.toordinal()
+        while recent and recent[0][0] < ordinal - window:
+            _, old = recent.popleft()
+            in_window[old] -= 1
+            if not in_window[old]:
+                del in_window[old]
+
+        date_str = day.strftime('%Y-%m-%d')
+        if date_str in pinned:
+            idx = index[pinned[date_str]]
+        else:
+            base = _date_hash(date_str) % n
+            idx = base
+            attempts = 0
+            while ids[idx] in in_window and attempts < n:
+                idx = (idx + 1) % n
+                attempts += 1
+            if attempts >= n:  # warehouse smaller than the window – allow a repeat
+                idx = base
+
+        chosen[date_str] = idx
+        recent.append((ordinal, ids[idx]))
+        in_window[ids[idx]] = in_window.get(ids[idx], 0) + 1
+
+    return [chosen[_as_date(d).strftime('%Y-%m-%d')] for d in dates]
+
@@ -0,0 +1,92 @@
+"""
+Concurrent fetch scheduler – sources in parallel, each source's days in order.
+
+Every fetch used to wait for the previous one (14 days × 8 sources, one socket at a time).
+run_jobs() gives each source its own worker thread: a source still sees its days one by one,
+newest first (cf1013 / tonbridge page through their listings in that order and keep per-run
+caches), while different hosts are fetched at the same time. MAX_WORKERS bounds the
+open connections.
+
+Each job's print() output is captured (thread-local stdout) and handed back with its result,
+so the caller prints the logs and applies the results in the original date / source order
+on the main thread – the fetch log reads exactly like the sequential one.
+
+    jobs = [Job(key=(date_str, src_id), source=src_id, fn=lambda: fetch(date)), ...]
+    for key, (result, log, error) in run_jobs(jobs).items(): ...
+"""
+import io
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+MAX_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class Job:
+    key: Hashable          # e.g. (date_str, src_id)
+    source: str            # jobs of one source run sequentially, in list order
+    fn: Callable[[], object]
+
+
+class _ThreadStdout:
+    """sys.stdout stand-in: writes go to the current thread's capture buffer, else to the real stream."""
+
+    def __init__(self, real):
+        self.real = real
+        self.local = threading.local()
+
+    def write(self, text):
+        buf = getattr(self.local, 'buf', None)
+        return (buf or self.real).write(text)
+
+    def flush(self):
+        if getattr(self.local, 'buf', None) is None:
+            self.real.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.real, name)
+
+
+def _run_source(jobs, out):
+    results = {}
+    for job in jobs:
+        out.local.buf = io.StringIO()
+        try:
+            result, error = job.fn(), None
+        except Exception as e:
+            result, error = None, e
+        finally:
+            log = out.local.buf.getvalue()
+            out.local.buf = None
+        results[job.key] = (result, log, error)
+    return results
+
+
+def run_jobs(jobs, max_workers=MAX_WORKERS):
+    """
+    Run `jobs` (one thread per source, up to max_workers at a time) →
+    {key: (result, captured log, exception or None)} in the order of `jobs`.
+    """
+    by_source = {}
+    for job in jobs:
+        by_source.setdefault(job.source, []).append(job)
+    if not by_source:
+        return {}
+    t0 = time.perf_counter()
+    real = sys.stdout
+    out = _ThreadStdout(real)
+    sys.stdout = out
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(by_source))) as pool:
+            futures = [pool.submit(_run_source, src_jobs, out) for src_jobs in by_source.values()]
+            done = {}
+            for f in futures:
+                done.update(f.result())
+    finally:
+        sys.stdout = real
+    print(f"⚡ {len(jobs)} fetches from {len(by_source)} sources in {time.perf_counter() - t0:.1f}s")
+    return {job.key: done[job.key] for job in jobs}
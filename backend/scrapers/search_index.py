@@ -0,0 +1,105 @@
+"""
+Inverted index for Find Workout – data/search_index.json, rebuilt on every save.
+
+Token → posting list of document numbers over the whole corpus (14 days + hero /
+benchmark / open warehouses), so the app picks candidates from a few short lists
+instead of scoring every workout:
+
+    {
+      "version": 1, "eq_sig": "7b085a84", "workouts_updated": "<workouts.json last_updated>",
+      "warehouse_sizes": {"heroes": 256, "benchmarks": 72, "open": 41},
+      "docs": ["2026-08-08/myleo", "2026-08-08/open", …, "heroes/0", …],   ← date/source or warehouse/index
+      "postings": {"eq:BARBELL": [0, 4, 9, …], "mv:thruster": [4, 17, …], …}
+    }
+
+Equipment tokens come from eq_mask (taxonomy.py), movement tokens from the parsed
+`structure` (structure.py). Postings are sorted ascending, so lists can be merged or
+intersected linearly. Reference days ('ref' storage) are not indexed – the app scores
+whatever the index does not cover, so results never depend on the index being complete.
+"""
+import json
+import re
+from pathlib import Path
+
+from scrapers.structure import workout_structure
+from scrapers.taxonomy import EQ_KEYS, EQ_SIG, eq_mask, warehouse_wod
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR.parent / 'data'
+SPECIAL_CACHE = DATA_DIR / 'special_cache.json'
+SEARCH_INDEX = DATA_DIR / 'search_index.json'
+
+INDEX_VERSION = 1
+WAREHOUSES = (('hero', 'heroes'), ('benchmark', 'benchmarks'), ('open', 'open'))
+STOP_TOKENS = {'and', 'the', 'for', 'with', 'then', 'max'}
+
+
+def movement_token(name):
+    """'Dumbbell Snatches' → 'dumbbell snatch' (lowercase, letters only, simple singular)."""
+    words = re.sub(r'[^a-z]+', ' ', (name or '').lower()).split()
+    if not words:
+        return None
+    last = words[-1]
+    if len(last) > 3 and last.endswith('es') and last[-3] in 'hsx':
+        words[-1] = last[:-2]
+    elif len(last) > 3 and last.endswith('s') and not last.endswith('ss'):
+        words[-1] = last[:-1]
+    return ' '.join(words)
+
+
+def _tokens(mask, structure):
+    tokens = {f"eq:{key}" for i, key in enumerate(EQ_KEYS) if mask & (1 << i)}
+    for st in structure or []:
+        for mv in st.get('movements') or []:
+            token = movement_token(mv.get('name'))
+            if token and len(token) >= 3 and token not in STOP_TOKENS:
+                tokens.add(f"mv:{token}")
+    return tokens
+
+
+def build_index(data, special):
+    """workouts.json data + special_cache.json data → index dict."""
+    docs, postings = [], {}
+
+    def add(doc, tokens):
+        n = len(docs)
+        docs.append(doc)
+        for t in tokens:
+            postings.setdefault(t, []).append(n)
+
+    for date_str in sorted(data.get('workouts') or {}):
+        for w in data['workouts'][date_str]:
+            if not w.get('sections'):
+                continue  # reference entries
+            mask = w['eq_mask'] if 'eq_mask' in w else eq_mask(w)
+            structure = w['structure'] if 'structure' in w else workout_structure(w)
+            add(f"{date_str}/{w['source']}", _tokens(mask, structure))
+
+    for src_id, key in WAREHOUSES:
+        for i, entry in enumerate(special.get(key) or []):
+            ww = warehouse_wod(src_id, entry)
+            mask = entry['eq_mask'] if 'eq_mask' in entry else eq_mask(ww)
+            add(f"{key}/{i}", _tokens(mask, workout_structure(ww)))
+
+    return {
+        'version': INDEX_VERSION,
+        'eq_sig': EQ_SIG,
+        'workouts_updated': data.get('last_updated'),
+        'warehouse_sizes': {key: len(special.get(key) or []) for _, key in WAREHOUSES},
+        'docs': docs,
+        'postings': dict(sorted(postings.items())),
+    }
+
+
+def save_index(data):
+    """Build from `data` (just saved) + special_cache.json on disk and write data/search_index.json."""
+    try:
+        with open(SPECIAL_CACHE, encoding='utf-8') as f:
+            special = json.load(f)
+    except Exception:
+        special = {}
+    index = build_index(data, special)
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(SEARCH_INDEX, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    return index
@@ -0,0 +1,182 @@
+"""
+One sectionizer for the flat-line sources – flat lines → [{'title', 'sub_title'?, 'lines'}].
+
+crossfit.com, Restoration, Postal, Panda, Ton Bridge and myleo each had their own
+parse_sections (myleo's helpers were even re-defined inside fetch_workout on every call),
+re-running isupper() / keyword any() scans / uncompiled re.search per line. A source now
+declares its rules once and gets a compiled callable:
+
+    parse_sections = Sectionizer(SectionRules(
+        caps=(3, 60), caps_digits=False,           # "STRENGTH" – ALL-CAPS, no digits
+        hints=SECTION_HINTS, hint_max_len=60,      # "Warm up" – keyword line shorter than 60
+        hint_exclude=r'\\d+\\s*(min|rep|round|x\\b)',  # …unless it reads like a workout line
+        title=str.upper,
+    ))
+    sections = parse_sections(lines)
+
+Each line is classified once, in this order: blank → skip → header → sub-title → note → line.
+Lines are kept as given; sub-titles and notes are stored stripped.
+Header rules (any one makes a header): formatted token (bold / subheader Line), ALL-CAPS,
+keyword hint, or the `header` regex (its `title` group, if any, is the title). Sub-titles are
+either the first line under a `sub_title_after` title (Ton Bridge METCON / WOD) or the first
+line matching `sub_title` in a section (myleo). Notes get a "* " prefix.
+
+Lines before the first header form a 'WORKOUT' section; no sections at all → one 'WORKOUT'
+section with every line (the old fallback, unless fallback=False).
+"""
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+from scrapers.keywords import compile_keywords
+
+DIGIT_RE = re.compile(r'\d')
+
+
+@dataclass(frozen=True)
+class SectionRules:
+    # Headers
+    formatted: bool = False            # lines are lines.Line tokens; bold / subheader ones are headers
+    caps: tuple | None = None          # (min_len, max_len): ALL-CAPS line is a header
+    caps_digits: bool = True           # False → an ALL-CAPS header has no digit
+    hints: tuple = ()                  # keywords (substring of the lowercased line)
+    hint_max_len: int = 0              # hint header: len(line) < hint_max_len
+    hint_colon: bool = False           # hint header also needs a ':'
+    hint_exclude: str | None = None    # regex (lowercased line): looks like a workout line → not a header…
+    hint_rescue: tuple = ()            # …unless it starts with one of these keywords
+    header: str | None = None          # regex matched (case-insensitive) at the start of the line
+    header_max_len: int = 0            # `header` only for lines up to this length (0 = any)
+    title: Callable = str.strip        # header line (or its `title` group) → section title
+    # Sub-titles
+    sub_title_after: frozenset = frozenset()  # titles whose first line is the sub_title
+    sub_title: str | None = None       # regex (lowercased line): first match in a section → sub_title
+    # Notes ("* " prefix)
+    notes: str | None = None           # regex (lowercased line)
+    note_max_len: int = 0              # notes only up to this length (0 = any)
+    notes_from: str | None = None      # regex (lowercased line): from the first match on, every line is a note
+    prelude_notes: bool = True         # notes also in the header-less leading 'WORKOUT' section
+    # Layout
+    skip: str | None = None            # regex (lowercased line): dropped
+    blank_lines: bool = False          # keep lines shorter than 2 chars as '' spacers
+    spacer_after: str | None = None    # regex (lowercased line): add a '' spacer after such a line
+    keep_empty: bool = False           # keep header sections without lines
+    fallback: bool = True              # no sections → one 'WORKOUT' section with every line (else [])
+
+
+class _Section:
+    __slots__ = ('title', 'lines', 'sub_title', 'sub_first', 'headed')
+
+    def __init__(self, title, headed):
+        self.title = title
+        self.lines = []
+        self.sub_title = None
+        self.sub_first = False      # sub_title before lines in the dict (sub_title_after)
+        self.headed = headed
+
+    def as_dict(self):
+        if self.sub_title is None:
+            return {'title': self.title, 'lines': self.lines}
+        if self.sub_first:
+            return {'title': self.title, 'sub_title': self.sub_title, 'lines': self.lines}
+        return {'title': self.title, 'lines': self.lines, 'sub_title': self.sub_title}
+
+
+def _rx(pattern, flags=0):
+    return re.compile(pattern, flags) if pattern else None
+
+
+class Sectionizer:
+    """Compiled SectionRules; call it with the source's lines (str, or Line tokens when rules.formatted)."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.hint_re = compile_keywords(rules.hints) if rules.hints else None
+        self.hint_exclude_re = _rx(rules.hint_exclude)
+        self.hint_rescue_re = compile_keywords(rules.hint_rescue, prefix=True) if rules.hint_rescue else None
+        self.header_re = _rx(rules.header, re.I)
+        self.title_group = bool(self.header_re and 'title' in self.header_re.groupindex)
+        self.sub_title_re = _rx(rules.sub_title)
+        self.notes_re = _rx(rules.notes)
+        self.notes_from_re = _rx(rules.notes_from)
+        self.skip_re = _rx(rules.skip)
+        self.spacer_re = _rx(rules.spacer_after)
+
+    def header_title(self, raw, raw_lo, line, formatted=False):
+        """
+        Section title if the line is a header, else None. Formatted / caps / hint rules see the
+        line as given (`raw`, `raw_lo` lowercased), the `header` regex sees it stripped (`line`).
+        """
+        r = self.rules
+        if formatted and raw:
+            return r.title(raw)
+        if r.caps and raw.isupper() and r.caps[0] <= len(raw) <= r.caps[1] and (
+                r.caps_digits or not DIGIT_RE.search(raw)):
+            return r.title(raw)
+        if self.hint_re and len(raw) < r.hint_max_len and (not r.hint_colon or ':' in raw) \
+                and self.hint_re.search(raw_lo):
+            if not (self.hint_exclude_re and self.hint_exclude_re.search(raw_lo)) or (
+                    self.hint_rescue_re and self.hint_rescue_re.match(raw_lo)):
+                return r.title(raw)
+        if self.header_re and (not r.header_max_len or len(line) <= r.header_max_len):
+            m = self.header_re.match(line)
+            if m:
+                return r.title(m.group('title') if self.title_group else raw)
+        return None
+
+    def _is_note(self, line, lo):
+        return bool(self.notes_re and (not self.rules.note_max_len or len(line) <= self.rules.note_max_len)
+                    and self.notes_re.search(lo))
+
+    def _spacer(self, last):
+        return len(last) >= 2 and self.spacer_re.search(last.strip().lower())
+
+    def __call__(self, lines):
+        r = self.rules
+        sections = []
+        cur = None
+        note_zone = False
+
+        def close(final=False):
+            if cur is not None and (cur.lines or (cur.sub_title and not final) or (r.keep_empty and cur.headed)):
+                sections.append(cur.as_dict())
+
+        for item in lines:
+            formatted = r.formatted and (item.bold or item.subheader)
+            raw = item.text if r.formatted else item
+            line = raw.strip()
+            if r.blank_lines and len(line) < 2:
+                if cur is not None:
+                    cur.lines.append('')
+                continue
+            lo = line.lower()
+            if self.skip_re and self.skip_re.search(lo):
+                continue
+            if self.notes_from_re and not note_zone and self.notes_from_re.search(lo):
+                note_zone = True
+
+            title = self.header_title(raw, lo if len(line) == len(raw) else raw.lower(), line, formatted)
+            if title is not None:
+                close()
+                cur = _Section(title, headed=True)
+                continue
+            if cur is None:
+                cur = _Section('WORKOUT', headed=False)
+
+            if cur.sub_title is None:
+                if self.sub_title_re and self.sub_title_re.search(lo):
+                    cur.sub_title = line
+                    continue
+                if cur.headed and not cur.lines and cur.title in r.sub_title_after:
+                    cur.sub_title, cur.sub_first = line, True
+                    continue
+
+            if note_zone or ((cur.headed or r.prelude_notes) and self._is_note(line, lo)):
+                raw = '* ' + line
+            if self.spacer_re and cur.lines and self._spacer(cur.lines[-1]):
+                cur.lines.append('')
+            cur.lines.append(raw)
+        close(final=True)
+
+        if not sections and r.fallback:
+            return [{'title': 'WORKOUT', 'lines': [t.text for t in lines] if r.formatted else lines}]
+        return sections
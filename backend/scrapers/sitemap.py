@@ -0,0 +1,128 @@
+"""
+Sitemap discovery for date-URL sources – which WOD pages exist and which changed, from one
+sitemap read per run instead of a GET per day.
+
+myleo (/en/wods/{date}/) and Restoration (/wod-{month}-{day}-{year}/) used to request every
+day of the window just to find out. A source declares its sitemap(s) and URL builder:
+
+    SITEMAPS = ('https://myleo.de/sitemap_index.xml', 'https://myleo.de/sitemap.xml')
+    status = discover('myleo', SITEMAPS, make_url, dates, version=PARSER_VERSION)
+    # → {'2026-02-16': ('changed', '2026-02-16T07:12:00+00:00'), '2026-02-15': ('missing', None), …}
+    remember('myleo', {'2026-02-16': '2026-02-16T07:12:00+00:00', …}, version=PARSER_VERSION)
+
+Status per date:
+    missing   – not in the sitemap (no post that day) → not requested; never the FRESH_DAYS newest
+    unchanged – <lastmod> equals the one stored when it was fetched → stored workout kept
+    changed   – <lastmod> differs → re-fetched
+    unknown   – listed, but nothing to compare (first run, new parser version, no <lastmod>)
+
+Lastmods are kept in scraper_state.json (state.py). A sitemap index is followed into its child
+sitemaps newest first, skipping taxonomy ones and those last modified before the window, until
+every date URL is found. discover() → None (no sitemap, or none of the window's URLs listed)
+means fetch as before.
+"""
+import re
+import xml.etree.ElementTree as ET
+
+from scrapers import state
+from scrapers.net import http_get
+
+MAX_CHILDREN = 8   # child sitemaps read per run
+FRESH_DAYS = 2     # newest days never count as missing (sitemap caches lag behind new posts)
+CHILD_SKIP_RE = re.compile(r'(category|tag|author|attachment|product)[-_]?\w*sitemap', re.I)
+URL_NORM_RE = re.compile(r'^https?://(www\.)?')
+
+
+def _norm(url):
+    return URL_NORM_RE.sub('', url.strip().lower()).rstrip('/')
+
+
+def _entries(root, tag):
+    """[(loc, lastmod)] of the <url> / <sitemap> entries (any namespace)."""
+    out = []
+    for node in root.iter():
+        if node.tag.rsplit('}', 1)[-1] != tag:
+            continue
+        loc = node.findtext('{*}loc')
+        if loc:
+            out.append((loc.strip(), (node.findtext('{*}lastmod') or '').strip()))
+    return out
+
+
+def _read(url):
+    """Parsed sitemap XML, or None."""
+    r = http_get(url, headers={'Accept': 'application/xml,text/xml;q=0.9,*/*;q=0.8'})
+    if r.status_code != 200:
+        return None
+    try:
+        return ET.fromstring(r.content)
+    except ET.ParseError:
+        return None
+
+
+def read_sitemap(urls, wanted, since):
+    """
+    {normalized loc: lastmod} from the first sitemap in `urls` that answers – following an
+    index into its children (modified on/after `since`) until every `wanted` loc is seen.
+    None when no sitemap answers.
+    """
+    for url in urls:
+        try:
+            root = _read(url)
+        except Exception as e:
+            print(f"    → Sitemap {url} failed: {e}")
+            continue
+        if root is None:
+            continue
+        locs = {_norm(loc): lastmod for loc, lastmod in _entries(root, 'url')}
+        children = [(loc, lastmod) for loc, lastmod in _entries(root, 'sitemap')
+                    if not CHILD_SKIP_RE.search(loc) and (not lastmod or lastmod[:10] >= since)]
+        children.sort(key=lambda c: c[1], reverse=True)
+        read = 0
+        for loc, _ in children[:MAX_CHILDREN]:
+            if wanted <= locs.keys():
+                break
+            try:
+                child = _read(loc)
+            except Exception as e:
+                print(f"    → Sitemap {loc} failed: {e}")
+                continue
+            if child is not None:
+                locs.update((_norm(l), m) for l, m in _entries(child, 'url'))
+                read += 1
+        print(f"    → Sitemap {url}: {len(locs)} URLs" + (f" ({read} child sitemaps)" if read else ""))
+        return locs
+    return None
+
+
+def discover(source, sitemaps, make_url, dates, version=1):
+    """{date_str: (status, lastmod)} for `dates` (see module doc), or None → fetch every day."""
+    urls = {d.strftime('%Y-%m-%d'): _norm(make_url(d)) for d in dates}
+    locs = read_sitemap(sitemaps, set(urls.values()), min(urls))
+    if not locs or not any(u in locs for u in urls.values()):
+        print(f"    → {source}: sitemap lists none of the window's pages – fetching every day")
+        return None
+    saved = state.get(source)
+    known = (saved.get('lastmod') or {}) if saved.get('version') == version else {}
+    fresh = set(sorted(urls, reverse=True)[:FRESH_DAYS])
+    status = {}
+    for date_str, url in urls.items():
+        if url not in locs:
+            status[date_str] = ('unknown', None) if date_str in fresh else ('missing', None)
+            continue
+        lastmod = locs[url]
+        if not lastmod or date_str not in known:
+            status[date_str] = ('unknown', lastmod or None)
+        elif known[date_str] == lastmod:
+            status[date_str] = ('unchanged', lastmod)
+        else:
+            status[date_str] = ('changed', lastmod)
+    return status
+
+
+def remember(source, lastmods, version=1):
+    """Store the lastmods of the days now held in workouts.json (replaces the previous set)."""
+    lastmods = dict(sorted(lastmods.items()))
+    saved = state.get(source)
+    if saved.get('lastmod') != lastmods or saved.get('version') != version:
+        state.update(source, lastmod=lastmods, version=version)
@@ -0,0 +1,315 @@
+"""
+Rotation calendar for the special sources (hero / benchmark / open).
+
+The daily pick is fully determined by the date and the warehouse contents, so we
+precompute date → warehouse entry id for the last 14 days and the next CALENDAR_AHEAD
+days and store it in data/special_cache.json under "calendar":
+
+    "calendar": {
+      "start": "2026-08-09", "end": "2026-09-21", "window": 14,
+      "fingerprints": {"hero": "…", "benchmark": "…", "open": "…"},
+      "hero": {"2026-08-09": "tully", …}, "benchmark": {…}, "open": {…}
+    }
+
+It is rebuilt only when a warehouse changes (fingerprint) or the calendar runs short.
+Published days (≤ today) keep their pick; the app can read tomorrow's special from it.
+
+ensure_calendar() reads special_cache.json once per run: the warehouse loaders
+(fetch_all_heroes / …) are called only when their monthly refresh is due, entries are
+tagged in the same pass and the file is written once. It also builds an id → entry dict
+per source, so calendar_wod / calendar_ref are one lookup per day.
+
+Warehouse entries carry only small derived tags (role, eq_mask, duration). With
+resolve=True (fetch_all.SPECIAL_STORAGE = 'ref') the finished workouts (builder + postprocess,
+no date) of the ids the calendar picks for [today-13, today+1] are stored under "resolved":
+
+    "resolved": {"hero": {"tully": {source, sections, structure, …}, …}, "benchmark": {…}, …}
+
+Reference days in workouts.json ({ref, rotation}) are that object plus the date – the app
+merges, it does not build; the rest of the warehouse ships without a built copy.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from scrapers.benchmarks import fetch_all_benchmarks, _make_benchmark_wod
+from scrapers.duration import DURATION_VERSION, estimate_duration
+from scrapers.heroes import fetch_all_heroes, _make_hero_wod
+from scrapers.open_wods import fetch_all_open, _make_open_wod
+from scrapers.rotation import WINDOW, entry_id, entry_ids, select_window
+from scrapers.structure import STRUCTURE_VERSION, postprocess, workout_structure
+from scrapers.taxonomy import EQ_SIG, eq_mask, section_role, warehouse_wod
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR.parent / 'data'
+SPECIAL_CACHE = DATA_DIR / 'special_cache.json'
+
+CALENDAR_BACK = 14    # published days kept (same as the 14-day window in workouts.json)
+CALENDAR_AHEAD = 30   # future days precomputed; extended when fewer than half remain
+RESOLVED_AHEAD = 1    # resolved workouts (resolve=True) cover the published days + tomorrow
+DERIVED_KEYS = ('eq_mask', 'duration', 'role')  # computed from the entry itself – not part of its contents
+
+_BY_ID = {}   # source id → {entry id: warehouse entry}, built by ensure_calendar (else lazily)
+
+SPECIALS = {
+    # source id: (warehouse key in special_cache.json, warehouse loader, workout builder)
+    'hero':      ('heroes',     fetch_all_heroes,     _make_hero_wod),
+    'benchmark': ('benchmarks', fetch_all_benchmarks, _make_benchmark_wod),
+    'open':      ('open',       fetch_all_open,       _make_open_wod),
+}
+
+
+def _load_cache():
+    if SPECIAL_CACHE.exists():
+        try:
+            with open(SPECIAL_CACHE, encoding='utf-8') as f:
+                data = json.load(f)
+                data.setdefault('heroes', [])
+                data.setdefault('benchmarks', [])
+                data.setdefault('open', [])
+                return data
+        except Exception:
+            pass
+    return {'heroes': [], 'benchmarks': [], 'open': []}
+
+
+def _save_cache(data):
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(SPECIAL_CACHE, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def _fingerprint(entries):
+    """Short hash of the warehouse contents (any edit → new calendar + re-serialized days)."""
+    entries = [{k: v for k, v in e.items() if k not in DERIVED_KEYS} for e in entries]
+    raw = json.dumps(entries, ensure_ascii=False, sort_keys=True)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def _day(d):
+    if isinstance(d, str):
+        return datetime.strptime(d[:10], '%Y-%m-%d').date()
+    return d.date() if isinstance(d, datetime) else d
+
+
+def _calendar_dates(today):
+    """[today-13 … today+CALENDAR_AHEAD] – the days a calendar covers."""
+    start = today - timedelta(days=CALENDAR_BACK - 1)
+    return [start + timedelta(days=i) for i in range(CALENDAR_BACK + CALENDAR_AHEAD)]
+
+
+def _picks(entries, dates, seed):
+    """{date_str: entry id} – one select_window pass over the calendar days, `seed` pinned."""
+    ids = entry_ids(entries)
+    indices = select_window(entries, dates, pinned=seed)
+    return {d.strftime('%Y-%m-%d'): ids[idx] for d, idx in zip(dates, indices)}
+
+
+def _refresh_due(data, key):
+    """Same monthly rule as fetch_all_heroes / …: empty warehouse, or last update in an earlier month."""
+    if not data.get(key):
+        return True
+    last_str = data.get(f'last_{key}_update')
+    if not last_str:
+        return False
+    try:
+        last_dt = datetime.strptime(last_str, '%Y-%m-%d').date()
+    except ValueError:
+        return True
+    today = datetime.now().date()
+    return last_dt.year != today.year or last_dt.month != today.month
+
+
+def _entries_by_id(src_id):
+    """{entry id: entry} for a source – from ensure_calendar, else built once from the loader."""
+    by_id = _BY_ID.get(src_id)
+    if by_id is None:
+        _, load_fn, _ = SPECIALS[src_id]
+        entries = load_fn()
+        by_id = _BY_ID[src_id] = dict(zip(entry_ids(entries), entries))
+    return by_id
+
+
+def ensure_calendar(today, pinned=None, resolve=False):
+    """
+    Make sure the calendar covers [today-13, today+CALENDAR_AHEAD] for the current warehouses
+    (refreshing and tagging them first – see module doc).
+    `pinned` = {source id: {date_str: entry_id}} already published in workouts.json
+    (only used when a calendar is (re)built).
+    `resolve` = store the finished workouts of the window's picks under "resolved" (ref storage).
+    Returns (calendar, changed) – `changed` = source ids whose warehouse contents changed.
+    """
+    today = _day(today)
+    today_str = today.strftime('%Y-%m-%d')
+    dates = _calendar_dates(today)
+    start, end = dates[0], dates[-1]
+    min_end = (today + timedelta(days=CALENDAR_AHEAD // 2)).strftime('%Y-%m-%d')
+
+    data = _load_cache()
+    due = [src_id for src_id, (key, _, _) in SPECIALS.items() if _refresh_due(data, key)]
+    for src_id in due:
+        SPECIALS[src_id][1]()  # scrapes + saves the warehouse
+    if due:
+        data = _load_cache()
+    else:
+        print("    → Warehouses current (monthly refresh not due)")
+    dirty = tag_warehouses(data)
+
+    calendar = data.get('calendar') or {}
+    fingerprints = calendar.setdefault('fingerprints', {})
+    changed = set()
+    recalendared = False
+
+    for src_id, (key, _, _) in SPECIALS.items():
+        entries = data.get(key) or []
+        _BY_ID[src_id] = dict(zip(entry_ids(entries), entries))
+        if not entries:
+            continue
+        fp = _fingerprint(entries)
+        picks = calendar.get(src_id) or {}
+        same = fingerprints.get(src_id) == fp
+        if same and picks and max(picks) >= min_end and min(picks) <= start.strftime('%Y-%m-%d'):
+            continue
+        if not same:
+            changed.add(src_id)
+
+        # Published days never move; future days too, unless the warehouse itself changed
+        seed = dict((pinned or {}).get(src_id) or {})
+        seed.update({d: eid for d, eid in picks.items() if same or d <= today_str})
+        calendar[src_id] = _picks(entries, dates, seed)
+        fingerprints[src_id] = fp
+        recalendared = True
+        print(f"    → Calendar {src_id}: {len(dates)} days ({'warehouse changed' if not same else 'extended'})")
+
+    if recalendared:
+        calendar['start'] = start.strftime('%Y-%m-%d')
+        calendar['end'] = end.strftime('%Y-%m-%d')
+        calendar['window'] = WINDOW
+        data['calendar'] = calendar
+    resolved = resolve_window(calendar, today) if resolve else None
+    if resolved != data.get('resolved'):
+        if resolved is None:
+            data.pop('resolved', None)
+        else:
+            data['resolved'] = resolved
+        dirty = True
+    if dirty or recalendared:
+        _save_cache(data)
+    return calendar, changed
+
+
+def entry_wod(src_id, entry):
+    """The finished workout of a warehouse entry (same builder + postprocess as an inline day), no date."""
+    _, _, build = SPECIALS[src_id]
+    wod = postprocess(build(entry, None))
+    wod.pop('date', None)
+    return wod
+
+
+def resolve_window(calendar, today):
+    """{source id: {entry id: finished workout}} for the calendar picks of [today-13, today+RESOLVED_AHEAD]."""
+    today = _day(today)
+    days = {(today + timedelta(days=i)).strftime('%Y-%m-%d')
+            for i in range(1 - CALENDAR_BACK, RESOLVED_AHEAD + 1)}
+    resolved = {}
+    for src_id in SPECIALS:
+        by_id = _entries_by_id(src_id)
+        picks = calendar.get(src_id) or {}
+        ids = sorted({eid for d, eid in picks.items() if d in days and eid in by_id})
+        if ids:
+            resolved[src_id] = {eid: entry_wod(src_id, by_id[eid]) for eid in ids}
+    return resolved
+
+
+def fallback_calendar(today, pinned=None):
+    """
+    In-memory calendar (not saved) for when ensure_calendar failed: the same select_window
+    pass over the same days and pins a freshly built calendar gets, so the days it fills
+    match what the calendar will pick once it works again.
+    """
+    dates = _calendar_dates(_day(today))
+    calendar = {'window': WINDOW}
+    for src_id, (_, load_fn, _) in SPECIALS.items():
+        entries = load_fn()
+        if entries:
+            _BY_ID[src_id] = dict(zip(entry_ids(entries), entries))
+            calendar[src_id] = _picks(entries, dates, dict((pinned or {}).get(src_id) or {}))
+    return calendar
+
+
+def tag_warehouses(data):
+    """
+    Write `role` + `eq_mask` + `duration` on every warehouse entry of the loaded special_cache
+    `data` (+ eq_sig / duration_version / structure_version) – only when something is missing
+    or EQ, the duration rules or the structure parser changed.
+    Returns True when `data` changed (the caller saves).
+    """
+    stale = (data.get('eq_sig') != EQ_SIG or data.get('duration_version') != DURATION_VERSION
+             or data.get('structure_version') != STRUCTURE_VERSION)
+    tagged = 0
+    for src_id, (key, _, _) in SPECIALS.items():
+        for entry in data.get(key) or []:
+            if entry.pop('wod', None) is not None:   # built copy stored by earlier versions
+                tagged += 1
+            if stale or 'eq_mask' not in entry:
+                entry['role'] = section_role(entry.get('name') or 'WORKOUT', src_id)
+                ww = warehouse_wod(src_id, entry)
+                entry['eq_mask'] = eq_mask(ww)
+                duration = estimate_duration(ww, workout_structure(ww))
+                if duration:
+                    entry['duration'] = duration
+                else:
+                    entry.pop('duration', None)
+                tagged += 1
+    if tagged or stale:
+        data['eq_sig'] = EQ_SIG
+        data['duration_version'] = DURATION_VERSION
+        data['structure_version'] = STRUCTURE_VERSION
+        print(f"    → Role / equipment / duration tags: {tagged} warehouse entries")
+    return bool(tagged) or stale
+
+
+def published_id(w):
+    """
+    Warehouse entry id of a special day in workouts.json (reference or inline entry).
+    Inline days written before entry_id was stored fall back to the title slug.
+    """
+    if w.get('ref') or w.get('entry_id'):
+        return w.get('ref') or w.get('entry_id')
+    if w.get('sections'):
+        return entry_id(w['sections'][0].get('title') or '')
+    return None
+
+
+def calendar_ref(src_id, date_str, calendar):
+    """
+    Reference entry for a special source on `date_str`: warehouse id + rotation metadata only.
+    The app resolves it from special_cache.json "resolved" (ensure_calendar(resolve=True)),
+    which it downloads anyway.
+    """
+    eid = (calendar.get(src_id) or {}).get(date_str)
+    entry = _entries_by_id(src_id).get(eid) if eid else None
+    if entry is None:
+        return None
+    key, _, build = SPECIALS[src_id]
+    return {
+        'date':        date_str,
+        'source':      src_id,
+        'source_name': build(entry, date_str)['source_name'],
+        'ref':         eid,
+        'rotation':    {'warehouse': key, 'window': calendar.get('window', WINDOW)},
+    }
+
+
+def calendar_wod(src_id, date_str, calendar):
+    """
+    Workout dict for a special source on `date_str`, straight from the calendar (None if not
+    covered). Carries its warehouse `entry_id`, so the next run's pins name the same entry.
+    """
+    eid = (calendar.get(src_id) or {}).get(date_str)
+    entry = _entries_by_id(src_id).get(eid) if eid else None
+    if entry is None:
+        return None
+    _, _, build = SPECIALS[src_id]
+    return dict(build(entry, date_str), entry_id=eid)
@@ -0,0 +1,71 @@
+"""
+Scraper state kept between runs – data/scraper_state.json (committed by the daily-fetch workflow).
+
+One small dict per source, e.g. the cf1013 pagination watermark:
+
+    state.get('cf1013')                          # → {} when unknown
+    state.update('cf1013', newest='2026-03-04', version=1)
+    state.save()                                 # fetch_all, once per run; no-op when unchanged
+
+Sources run on scheduler threads, so reads and writes go through one lock.
+"""
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+STATE_FILE = Path(__file__).parent.parent.parent / 'data' / 'scraper_state.json'
+
+_lock = threading.Lock()
+_state = None
+_dirty = False
+
+
+def _load():
+    global _state
+    if _state is None:
+        try:
+            with open(STATE_FILE, encoding='utf-8') as f:
+                _state = json.load(f)
+        except FileNotFoundError:
+            _state = {}
+        except Exception as e:
+            print(f"⚠️  {STATE_FILE.name} unreadable, starting fresh: {e}")
+            _state = {}
+    return _state
+
+
+def get(source):
+    """Copy of the source's state ({} when none)."""
+    with _lock:
+        return dict(_load().get(source) or {})
+
+
+def update(source, **values):
+    """Merge `values` into the source's state (stamped with the update time)."""
+    global _dirty
+    with _lock:
+        entry = _load().setdefault(source, {})
+        entry.update(values, updated=datetime.now().isoformat(timespec='seconds'))
+        _dirty = True
+
+
+def reset(source):
+    """Forget the source's state."""
+    global _dirty
+    with _lock:
+        if _load().pop(source, None) is not None:
+            _dirty = True
+
+
+def save():
+    """Write the state file if anything changed this run."""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return False
+        STATE_FILE.parent.mkdir(exist_ok=True, parents=True)
+        with open(STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(_state, f, indent=2, ensure_ascii=False, sort_keys=True)
+        _dirty = False
+        return True
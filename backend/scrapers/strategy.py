@@ -0,0 +1,79 @@
+"""
+Learned extraction strategy – try the container selector that worked last time first.
+
+crossfit.com tries article → main → five class patterns → densest block on every page, myleo
+.entry-content → article → main; each miss is a search of the whole tree. A source now
+hands its selectors in order (plus an optional fallback) and the winning selector is
+remembered in scraper_state.json (state.py) with a fingerprint of the page it won on:
+
+    content, found = pick('myleo', soup, (
+        ('.entry-content', lambda s: s.find('div', class_='entry-content')),
+        ('article', _article),
+        ('main', lambda s: s.find('main')),
+    ), fallback=('content-density', best_block))
+
+The fingerprint is the set of (tag, class attribute) shapes of the container tags (div,
+article, main, section) – digits folded to '#', so post ids don't change it. The selectors
+only look at those tags' names and class substrings, so on a page with the same fingerprint
+the same selectors match. The earlier ones still miss, and the remembered one returns what
+the full chain would. It runs alone. Any other page (or a remembered selector that finds
+nothing) goes through the chain in order. The fallback (densest
+block always finds something) is never remembered. A different winner is logged as an early
+warning that the site changed its layout.
+"""
+import hashlib
+import re
+
+from scrapers import state
+
+DIGITS_RE = re.compile(r'\d+')
+CONTAINER_TAGS = ('div', 'article', 'main', 'section')   # what the container selectors look at
+
+
+def fingerprint(soup):
+    """Hash of the distinct (tag, class) shapes of the page's container tags, digits folded to '#'."""
+    shapes = {f"{tag.name}.{DIGITS_RE.sub('#', ' '.join(tag.get('class') or ()))}"
+              for tag in soup.find_all(CONTAINER_TAGS)}
+    return hashlib.md5('|'.join(sorted(shapes)).encode()).hexdigest()[:10]
+
+
+def _learn(source, memo, name, fp, label):
+    """Remember the winning selector (None when only the fallback / nothing worked)."""
+    old = memo.get('strategy')
+    if name == old and (name is None or fp == memo.get('fingerprint')):
+        return
+    if old and name != old:
+        print(f"    ⚠️  {source} layout changed? strategy {old} → {label}")
+    state.update(source, strategy=name, fingerprint=fp if name else None)
+
+
+def pick(source, soup, selectors, fallback=None):
+    """
+    (node, strategy name) – the remembered selector when the fingerprint matches, else the first
+    selector that finds a node, else the fallback – or (None, None).
+    """
+    memo = state.get(source)
+    fp = fingerprint(soup)
+    remembered = memo.get('strategy') if memo.get('fingerprint') == fp else None
+
+    if remembered:
+        for name, find in selectors:
+            if name == remembered:
+                node = find(soup)
+                if node is not None:
+                    return node, name
+                break
+
+    for name, find in selectors:
+        node = find(soup)
+        if node is not None:
+            _learn(source, memo, name, fp, name)
+            return node, name
+
+    _learn(source, memo, None, fp, fallback[0] if fallback else 'none')
+    if fallback:
+        name, find = fallback
+        node = find(soup)
+        if node is not None:
+            return node, name
+    return None, None
@@ -0,0 +1,96 @@
+"""
+Streaming fetch – parse the page while it downloads and hang up once the scraper has enough.
+
+The Ton Bridge WOD page lists every post ever, newest first, but a run needs only the last
+14 days. stream_elements() feeds iter_content chunks into an lxml HTMLPullParser and hands
+each finished element of interest to a callback; when the callback says it is done, the
+connection is closed there. The rest of the page is neither downloaded nor parsed:
+
+    def on_article(el):                      # lxml element, released after the call
+        articles.append(to_soup(el))
+        return article_date < oldest_needed  # True → stop
+    stats = stream_elements(WOD_URL, 'article', on_article)
+    # → StreamStats(status=200, bytes=81920, elements=17, stopped=True)
+
+Elements are cleared once handled (and their earlier siblings dropped), so memory stays at
+one element plus the open ancestors no matter how long the page is.
+"""
+from dataclasses import dataclass
+
+from lxml import etree
+
+from scrapers.net import CHARSET_HEADER_RE, CHARSET_META_RE, SNIFF_BYTES, http_get
+
+CHUNK_SIZE = 16 * 1024
+
+
+@dataclass
+class StreamStats:
+    status: int
+    bytes: int = 0          # body bytes read (decompressed)
+    elements: int = 0       # elements handed to the callback
+    stopped: bool = False   # the callback ended the download early
+
+
+def _release(el):
+    el.clear(keep_tail=True)
+    parent = el.getparent()
+    if parent is not None:
+        while el.getprevious() is not None:
+            del parent[0]
+
+
+def _sniff(first_chunk):
+    """<meta charset> in the first bytes, else UTF-8 (as net.response_charset; libxml2 would assume Latin-1)."""
+    m = CHARSET_META_RE.search(first_chunk[:SNIFF_BYTES])
+    return m.group(1).decode('ascii', 'ignore').lower() if m else 'utf-8'
+
+
+def iter_elements(chunks, tag, on_element, encoding=None, stats=None):
+    """
+    Feed byte chunks to an HTMLPullParser; on_element(el) per finished `tag` → True stops.
+    `encoding` is the declared charset, else sniffed from the first chunk. Returns stats.
+    """
+    stats = stats or StreamStats(status=200)
+    parser = None
+
+    def handle():
+        for _, el in parser.read_events():
+            stats.elements += 1
+            done = on_element(el)
+            _release(el)
+            if done:
+                return True
+        return False
+
+    for chunk in chunks:
+        if parser is None:
+            parser = etree.HTMLPullParser(events=('end',), tag=tag, encoding=encoding or _sniff(chunk))
+        stats.bytes += len(chunk)
+        parser.feed(chunk)
+        if handle():
+            stats.stopped = True
+            return stats
+    if parser is not None:
+        parser.close()
+        stats.stopped = handle()
+    return stats
+
+
+def to_html(el):
+    """Element → its HTML (for handing one element to BeautifulSoup)."""
+    return etree.tostring(el, encoding='unicode', method='html', with_tail=False)
+
+
+def stream_elements(url, tag, on_element, headers=None, chunk_size=CHUNK_SIZE):
+    """GET `url` streamed through iter_elements(); the connection is closed as soon as it returns."""
+    r = http_get(url, headers=headers, stream=True)
+    try:
+        stats = StreamStats(status=r.status_code)
+        if r.status_code != 200:
+            return stats
+        m = CHARSET_HEADER_RE.search(r.headers.get('Content-Type', '') or '')
+        return iter_elements(r.iter_content(chunk_size), tag, on_element,
+                             encoding=m.group(1) if m else None, stats=stats)
+    finally:
+        r.close()
@@ -0,0 +1,223 @@
+"""
+Structured workout model – parsed once at ingest, stored next to `sections`.
+
+Every scraper returns free-text `sections` (title + lines). postprocess() runs after each
+scraper (fetch_all) and adds a `structure` list aligned with `sections`, so the app,
+the exercise report and the coach tools read format / rounds / movements instead of
+re-running regexes over the lines on every view:
+
+    "structure": [
+      {},                                                   ← warm-up with nothing to parse
+      {"format": "For Time", "rep_scheme": [21, 15, 9], "time_cap": 12,
+       "movements": [{"name": "Thrusters", "load": {"text": "95/65 lb", "kg": [43, 29.5], "lb": [95, 65]}},
+                     {"name": "Pull-ups"}]}
+    ]
+
+Loads are the canonical {text, kg, lb[, sex]} records from loads.parse_loads().
+Empty fields are omitted. Bump STRUCTURE_VERSION when the parser changes – fetch_all
+re-derives every stored workout once when the version in workouts.json differs.
+"""
+import re
+from dataclasses import dataclass, field
+
+from scrapers.duration import estimate_duration
+from scrapers.loads import find_loads, parse_loads, rewrite_loads, strip_loads
+from scrapers.taxonomy import eq_mask, section_role
+
+STRUCTURE_VERSION = 5
+
+FORMAT_RES = (
+    ('AMRAP',    re.compile(r'\bamrap\b|as many (?:rounds|reps)(?: and reps)? as possible', re.I)),
+    ('EMOM',     re.compile(r'\be\d*mom\b|every minute on the minute|\bevery \d+(?::\d\d)? ?(?:min|for \d|x ?\d)', re.I)),
+    ('For Time', re.compile(r'\bfor (?:total )?time\b|\brft\b', re.I)),
+)
+AMRAP_MIN_RE = re.compile(
+    r'amrap\s*(?:in\s*|of\s*|x\s*)?(\d+)|(\d+)\s*[-\s]?\s*(?:min(?:ute)?s?|\')\s*amrap'
+    r'|as possible in (\d+)\s*min', re.I)
+EMOM_MIN_RE = re.compile(
+    r'e\d*mom\s*(?:for\s*|x\s*)?(\d+)|(\d+)\s*[-\s]?\s*min(?:ute)?s?\s*e\d*mom'
+    r'|every minute on the minute for (\d+)', re.I)
+# "Every 2 min for 20 min" → 20; "Every 1:30 x 8 rounds" → 12 (interval × rounds)
+EVERY_FOR_RE = re.compile(
+    r'\bevery\s+(\d+)(?::(\d\d))?\s*(?:min(?:ute)?s?\b|\')?\s*,?\s*(for|x)\s*(\d+)\s*'
+    r'(min(?:ute)?s?\b|\'|rounds?\b|sets?\b)?', re.I)
+TIME_CAP_RE = re.compile(
+    r'(?:time\s*)?cap(?:ped)?\s*(?:of|at|:|-)?\s*(\d+)|(\d+)\s*[-\s]?\s*min(?:ute)?s?\s*(?:time\s*)?cap', re.I)
+ROUNDS_RE = re.compile(r'\b(\d+)\s*(?:rounds?|rft)\b', re.I)
+REP_SCHEME_RE = re.compile(r'(?<![\d.:/–-])(\d{1,3}(?:\s*[-–]\s*\d{1,3}){2,})(?![\d.:/–-])')
+
+# "21 Thrusters", "500m Row", "15 cal Bike", "80/64cal row", "200-ft. lunge", "21-15-9 Thrusters"
+LEAD_QTY_RE = re.compile(
+    r'^(\d+)(?:/\d+|(?:\s*[-–]\s*\d+){2,})?[\s-]*(?:x\s+)?'
+    r'(cal(?:orie)?s?\b|m\b|meters?\b|km\b|ft\b|′|\'|mi(?:les?)?\b)?\.?\s*([^\d:].*)$', re.I)
+TIME_LEAD_RE = re.compile(r'^\d*:\d\d|^\d+\s*[-–]\s*\d+\s+(?:sets?|reps?|rounds?)\b', re.I)
+# "Row 500m", "Bike 20 cal"
+TRAIL_QTY_RE = re.compile(r'^([a-z][a-z\s/\'-]+?)\s+(\d+)\s*(cal(?:orie)?s?\b|m\b|meters?\b|km\b|ft\b|′)', re.I)
+HEADER_RE = re.compile(
+    r'\b(?:rounds?|for (?:total )?time|amrap|e\d*mom|every|rest|cap|then|score|pace|feel|target|notes?|'
+    r'minutes?|sets?|each|strength|skill|for load|weight|build|partner|switch|swap|record)\b|:\s*$', re.I)
+NAME_NOISE_RE = re.compile(r'\([^)]*\)|@.*$|\*', re.I)
+BULLET_RE = re.compile(r'^[\s•·\-–—*]+')
+UNIT_NORM = {'cal': 'cal', 'cals': 'cal', 'calorie': 'cal', 'calories': 'cal', 'm': 'm', 'meter': 'm',
+             'meters': 'm', 'km': 'km', 'ft': 'ft', '′': 'ft', "'": 'ft', 'mi': 'mi', 'mile': 'mi', 'miles': 'mi'}
+
+
+@dataclass(slots=True)
+class Movement:
+    name: str
+    reps: int | None = None
+    unit: str | None = None     # 'cal' / 'm' / 'km' / 'ft' / 'mi' (reps = distance or calories)
+    load: dict | None = None    # canonical load (loads.parse_loads)
+
+    def to_dict(self):
+        return {k: v for k, v in (('name', self.name), ('reps', self.reps), ('unit', self.unit),
+                                  ('load', self.load)) if v is not None}
+
+
+@dataclass(slots=True)
+class SectionStructure:
+    format: str | None = None    # 'AMRAP' / 'EMOM' / 'For Time'
+    minutes: int | None = None   # AMRAP / EMOM length
+    rounds: int | None = None
+    time_cap: int | None = None  # minutes
+    rep_scheme: list = field(default_factory=list)   # [21, 15, 9]
+    loads: list = field(default_factory=list)        # canonical loads not tied to one movement ("*Men use 95 lb.*")
+    movements: list = field(default_factory=list)    # [Movement]
+
+    def to_dict(self):
+        d = {}
+        for key in ('format', 'minutes', 'rounds', 'time_cap'):
+            value = getattr(self, key)
+            if value is not None:
+                d[key] = value
+        if self.rep_scheme:
+            d['rep_scheme'] = self.rep_scheme
+        if self.loads:
+            d['loads'] = self.loads
+        if self.movements:
+            d['movements'] = [m.to_dict() for m in self.movements]
+        return d
+
+
+def _first_int(m):
+    if not m:
+        return None
+    value = next((g for g in m.groups() if g), None)
+    return int(value) if value else None
+
+
+def _every_minutes(text):
+    """Total minutes of an "every N min for M min" / "every N:SS x R rounds" clock, else None."""
+    m = EVERY_FOR_RE.search(text)
+    if not m:
+        return None
+    every, seconds, word, count, unit = m.groups()
+    unit = (unit or '').lower()
+    if unit.startswith(('round', 'set')) or (word.lower() == 'x' and not unit):
+        return round((int(every) + int(seconds or 0) / 60) * int(count)) or None
+    return int(count) or None
+
+
+def _clean_name(text):
+    text = strip_loads(text)
+    text = NAME_NOISE_RE.sub('', text)
+    text = re.sub(r'\s+', ' ', text).strip(' ,.;:-–')
+    return text if 2 <= len(text) <= 50 and re.search(r'[a-z]', text, re.I) else None
+
+
+def _parse_movement(line, names_only):
+    """One line → Movement, or None for headers / notes. `names_only` = bare names count (21-15-9 style)."""
+    first = next(find_loads(line), None)
+    if first and first[0].start() == 0 or TIME_LEAD_RE.match(line):
+        return None  # "50-lb. dumbbell, 24-in. box" / "1:00 each" – notes, not movements
+
+    load = parse_loads(line)[0] if first else None
+
+    m = LEAD_QTY_RE.match(line)
+    if m:
+        if HEADER_RE.search(m.group(3)) or ROUNDS_RE.match(line):
+            return None
+        name = _clean_name(m.group(3))
+        if not name:
+            return None
+        unit = UNIT_NORM.get((m.group(2) or '').lower()) if m.group(2) else None
+        return Movement(name, int(m.group(1)), unit, load)
+
+    m = TRAIL_QTY_RE.match(line)
+    if m and not HEADER_RE.search(m.group(1)):
+        name = _clean_name(m.group(1))
+        if name:
+            return Movement(name, int(m.group(2)), UNIT_NORM.get(m.group(3).lower()), load)
+
+    if names_only and len(line) < 40 and not HEADER_RE.search(line) and not re.match(r'^\d', line):
+        name = _clean_name(line)
+        if name:
+            return Movement(name, None, None, load)
+    return None
+
+
+def parse_section(title, lines, sub_title=None):
+    """Title (+ sub_title) + lines of one section → SectionStructure (single pass over the lines)."""
+    lines = [BULLET_RE.sub('', l).strip() for l in (lines or []) if isinstance(l, str)]
+    lines = [l for l in lines if l]
+    text = '\n'.join([title or '', sub_title or ''] + lines)
+
+    st = SectionStructure()
+    found = [(m.start(), name) for name, rx in FORMAT_RES for m in [rx.search(text)] if m]
+    if found:
+        st.format = min(found)[1]
+        if st.format == 'AMRAP':
+            st.minutes = _first_int(AMRAP_MIN_RE.search(text))
+        elif st.format == 'EMOM':
+            st.minutes = _first_int(EMOM_MIN_RE.search(text)) or _every_minutes(text)
+    st.time_cap = _first_int(TIME_CAP_RE.search(text))
+    st.rounds = _first_int(ROUNDS_RE.search(text))
+    scheme = REP_SCHEME_RE.search(text)
+    if scheme:
+        st.rep_scheme = [int(x) for x in re.split(r'\s*[-–]\s*', scheme.group(1))]
+
+    for line in lines:
+        mv = _parse_movement(line, names_only=bool(st.rep_scheme))
+        if mv:
+            st.movements.append(mv)
+        else:
+            for load in parse_loads(line):
+                if load not in st.loads:
+                    st.loads.append(load)
+    return st
+
+
+def workout_structure(wod):
+    """[section structure dict] aligned with wod['sections']."""
+    return [
+        parse_section(sec.get('title'), sec.get('lines'), sec.get('sub_title')).to_dict()
+        for sec in wod.get('sections') or []
+    ]
+
+
+def postprocess(wod, load_display=None):
+    """
+    Shared stage after every scraper (in place): optionally rewrite the loads in the display
+    lines (load_display = 'kg' / 'lb' / 'both', see loads.rewrite_loads), then classify each
+    section's `role` (taxonomy.py) and attach `structure` next to `sections`, the equipment
+    `eq_mask` and the `duration` estimate (duration.py).
+    Rewrite only freshly scraped workouts – 'both' is not idempotent.
+    """
+    if not wod or not wod.get('sections'):
+        return wod
+    if load_display:
+        for sec in wod['sections']:
+            sec['lines'] = [rewrite_loads(l, load_display) if isinstance(l, str) else l for l in sec.get('lines') or []]
+            if sec.get('sub_title'):
+                sec['sub_title'] = rewrite_loads(sec['sub_title'], load_display)
+    for sec in wod['sections']:
+        if sec:
+            sec['role'] = section_role(sec.get('title'), wod.get('source'))
+    wod['structure'] = workout_structure(wod)
+    wod['eq_mask'] = eq_mask(wod)
+    duration = estimate_duration(wod, wod['structure'])
+    if duration:
+        wod['duration'] = duration
+    else:
+        wod.pop('duration', None)
+    return wod
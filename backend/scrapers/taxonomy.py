@@ -0,0 +1,136 @@
+"""
+Equipment taxonomy for Find Workout – shared by the fetcher and scripts/extract_exercises_report.py.
+
+EQ mirrors `var EQ` in index.html key for key (same order → bit i = i-th key). Each workout
+and warehouse entry gets `eq_mask`: the categories whose keywords appear in its WOD sections,
+chosen exactly like the client's getWodOnlyText(). scoreWod then compares integers instead of
+scanning text per query.
+
+Section roles ('wod' / 'warmup' / 'strength' / 'rest' / 'other') are classified here once per
+section at ingest (`role`, stored in workouts.json and on warehouse entries); WOD-only text,
+eq_mask, duration, the app's scorer and the exercise report all select sections by role.
+sectionRole() in index.html is the same classifier for data written before roles existed.
+
+EQ_SIG is a djb2 hash of the compact JSON of EQ (same as JSON.stringify in the app) plus
+ROLE_VERSION. It is written next to the masks; the client ignores masks whose signature
+differs from its own, so an edit on one side only costs speed, never wrong results.
+"""
+import json
+import re
+
+EQ = {
+    "RUN": ["run", "running", "meter", "mile", "km", "400m", "800m", "200m", "400 m"],
+    "BARBELL": ["barbell", "overhead squat", "ohs", "deadlift", "sumo deadlift", "romanian deadlift", "rdl", "clean", "squat clean", "power clean", "snatch", "squat snatch", "power snatch", "clean & jerk", "clean and jerk", "push press", "split jerk", "push jerk", "shoulder to overhead", "s2oh", "strict press", "overhead press", "floor press", "bent over row", "barbell thruster", "barbell lunge", "front rack", "back rack", "good morning", "hang clean", "hang snatch", "muscle snatch", "muscle clean"],
+    "RIG RACK": ["back squat", "front squat", "overhead press", "strict press", "push press", "push jerk", "split jerk", "bench press", "rig", "rack", "squat rack"],
+    "PULLUP BAR": ["strict pull-up", "strict pull up", "pull-up", "pullup", "pull up", "kipping pull-up", "butterfly pull-up", "chest-to-bar", "chest to bar", "c2b", "chin-up", "chin up", "weighted pull-up", "mixed grip pull-up", "bar hang", "toes to bar", "toes-to-bar", "ttb", "t2b", "knees to elbows", "k2e", "l-sit hang", "around the world", "windshield wiper", "strict leg raise", "bar muscle-up", "bmu", "strict bar muscle-up", "one-arm pull-up", "pullover", "archer pull-up", "typewriter pull-up", "dead hang", "scapular pull-up", "negative pull-up", "commando pull-up", "burpee pull up", "burpee pull-up"],
+    "ROW": ["row", "rowing", "rower", "cal row", "erg", "concept2"],
+    "BIKE": ["bike", "assault bike", "echo bike", "bikeerg", "bike erg", "cal bike", "concept2 bike"],
+    "DUMBBELL": ["dumbbell", "dumbbells", " db ", "db.", "2x dumbbell", "2x db", "double dumbbell", "dumbbell snatch", "dumbbell clean", "dumbbell clean & jerk", "dumbbell thruster", "dumbbell jerk", "devil press", "man-maker", "renegade row", "dumbbell bench press", "dumbbell floor press", "goblet lunge", "dumbbell overhead squat", "goblet squat", "dumbbell box step-up", "farmer walk", "dumbbell strict press", "dumbbell push press", "dumbbell deadlift", "dumbbell shoulder to overhead", "dumbbell burpee", "overhead lunge"],
+    "KETTLEBELL": ["kettlebell", "kettlebells", " kb ", "ktb", "2x kettlebell", "2x kb", "double kettlebell", "russian swing", "american swing", "kettlebell swing", "goblet squat", "kettlebell snatch", "kettlebell clean", "kettlebell clean & jerk", "turkish get-up", "tgu", "kettlebell jerk", "kettlebell thruster", "sdhp", "sumo deadlift high pull", "suitcase carry", "farmer carry", "kettlebell lunge", "kettlebell front squat", "kettlebell deadlift", "kettlebell shoulder to overhead", "kettlebell push press", "kettlebell press"],
+    "ROPE CLIMB": ["rope climb", "rope climbs"],
+    "SKIPPING ROPE": ["double under", "double unders", " du ", "triple under", "triple unders", "rope crossover", "rope crossovers", "skip", "jump rope"],
+    "WALL BALL": ["wall ball", "wallball", " wb ", "w.b", "wall ball shot", "wall ball clean", "wall ball thruster", "wall ball sit-up", "wall ball lunge", "wall ball chest pass", "wall ball lateral toss", "wall ball slam", "over-the-shoulder toss", "weighted wall ball"],
+    "WALL DRILLS": ["handstand push-up", "handstand push up", "hspu", "kipping hspu", "deficit handstand", "wall climb", "wall walk", "wallwalk", "strict handstand push-up", "wall facing handstand"],
+    "RINGS": ["ring row", "ring rows", "ring push-up", "ring push up", "ring support", "ring pull-up", "ring pull up", "ring dip", "ring dips", "l-sit on rings", "ring toes to bar", "ring rollout", "skin the cat", "ring muscle-up", "ring muscle up", "strict ring muscle-up", "ring chest-to-bar", "forward roll", "backward roll"],
+    "SKI": ["ski", "ski erg", "skierg", "ski erg"],
+    "SLED": ["sled push", "sled pull", "sled drag", "hand-over-hand", "sled sprint", "lateral sled", "sled row", "sled chest press", "sled bear crawl"],
+    "BOX": ["box jump", "box jumps", "box jump-over", "box step-up", "box step up", "box step-over", "weighted box step-up", "burpee box jump", "burpee box jump-over", "box dip", "box pike push-up", "seated box jump", "bjo"],
+    "D-BALL": ["d-ball", "dball", "slam ball", "atlas stone", "sandbag", " d-ball slam", "d-ball over", "d-ball clean", "bear hug squat", "bear hug carry", "d-ball front rack", "d-ball chest pass", "ground to overhead", "atlas stone clean", "atlas stone to shoulder", "atlas stone over bar", "platform load", "atlas stone extension"],
+}
+EQ_KEYS = list(EQ)
+EQ_BITS = {key: 1 << i for i, key in enumerate(EQ_KEYS)}
+
+# Section roles – titles are lowercased first (same regexes as index.html). Bump ROLE_VERSION
+# (here and in index.html) when the rules change: it is part of EQ_SIG.
+ROLE_VERSION = 1
+WOD_SECTION_RE = re.compile(r'wod|metcon|conditioning|amrap|emom|for\s*time|workout')
+# Open / Hero / Benchmark workouts are often titled by name
+NAMED_WOD_RE = re.compile(r'open\s*\d|hero|benchmark|nancy|diane|fran|grace|angie|barbara|chelsea|dallas|murph|hotshots|morrison')
+WARMUP_RE = re.compile(r'warm\s*up|warm-up|mobility|general warm')
+STRENGTH_RE = re.compile(r'^strength|^skill|^oly|^weightlifting|squat\s*$|press\s*$|deadlift\s*$')
+WAREHOUSE_SOURCES = ('hero', 'benchmark', 'open')
+
+
+def _djb2(text):
+    h = 5381
+    for ch in text:
+        h = (h * 33 + ord(ch)) & 0xFFFFFFFF
+    return format(h, '08x')
+
+
+EQ_SIG = _djb2(json.dumps(EQ, ensure_ascii=False, separators=(',', ':')) + f'|roles:{ROLE_VERSION}')
+
+
+def _join(lines):
+    return ' '.join('' if l is None else str(l) for l in lines) if isinstance(lines, list) else ''
+
+
+def section_role(title, source=None):
+    """Section title (+ workout source) → 'wod' / 'warmup' / 'strength' / 'rest' / 'other'."""
+    t = str(title or '').strip().lower()
+    if WOD_SECTION_RE.search(t) or NAMED_WOD_RE.search(t) or (source in WAREHOUSE_SOURCES and t):
+        return 'wod'
+    if WARMUP_RE.search(t):
+        return 'warmup'
+    if STRENGTH_RE.search(t):
+        return 'strength'
+    if t in ('rest day', 'rest'):
+        return 'rest'
+    return 'other'
+
+
+def _role(sec, source):
+    return sec.get('role') or section_role(sec.get('title'), source)
+
+
+def wod_section_indices(wod):
+    """Indices of the 'wod' role sections; all sections when there is none."""
+    secs = wod.get('sections') or []
+    picked = [i for i, s in enumerate(secs) if s and _role(s, wod.get('source')) == 'wod']
+    return picked or [i for i, s in enumerate(secs) if s]
+
+
+def wod_text(wod):
+    """Lowercased WOD-only text – same sections and spacing as getWodOnlyText() in index.html."""
+    secs = wod.get('sections') or []
+    parts = []
+    for s in secs:
+        title = str((s or {}).get('title') or '').lower()
+        if s and _role(s, wod.get('source')) == 'wod':
+            parts.append(title + ' ' + str(s.get('sub_title') or '') + ' ' + _join(s.get('lines')))
+    if parts:
+        return ' '.join(parts).lower()
+    full = ''
+    for s in secs:
+        if not s:
+            continue
+        full += (str(s.get('title') or '') + ' ' + str(s.get('sub_title') or '') + ' '
+                 + str(s.get('sub_title2') or '') + ' ' + _join(s.get('lines')) + ' ')
+    return full.lower()
+
+
+def eq_mask_of_text(text):
+    mask = 0
+    for key, kws in EQ.items():
+        if any(kw in text for kw in kws):
+            mask |= EQ_BITS[key]
+    return mask
+
+
+def eq_mask(wod):
+    """Bitmask of the EQ categories in a workout's WOD sections."""
+    return eq_mask_of_text(wod_text(wod))
+
+
+def warehouse_wod(source_id, entry):
+    """Warehouse entry → the workout shape Find Workout scores (bestFromWarehouse in index.html)."""
+    lines = entry.get('lines') or []
+    is_hero = source_id == 'hero'
+    section = {
+        'title': entry.get('name') or 'WORKOUT',
+        'sub_title': lines[0] if is_hero and lines else '',
+        'lines': lines[1:] if is_hero and len(lines) > 1 else lines,
+    }
+    if entry.get('role'):
+        section['role'] = entry['role']
+    return {'source': source_id, 'sections': [section]}
@@ -2,6 +2,7 @@
 CrossFit Ton Bridge Scraper - FIXED
 NEW: Uses centralized WOD page: https://crossfittonbridge.co.uk/wod/
 All workouts in one long list, easier to scrape.
+WordPress REST / RSS feed (endpoints.py) are tried first – post content only, one request per run.
 
 Logic:
 - Workout title = Date in bold (e.g., "Saturday 14th February")
@@ -13,14 +14,12 @@ import re
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
+from html import escape
 
-HEADERS = {
-    'User-Agent': (
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-        'AppleWebKit/537.36 (KHTML, like Gecko) '
-        'Chrome/120.0.0.0 Safari/537.36'
-    ),
-}
+from scrapers.endpoints import WINDOW_DAYS, Endpoint, window_posts
+from scrapers.listing import ListingIndex, parse_date
+from scrapers.sectionize import SectionRules, Sectionizer
+from scrapers.stream import stream_elements, to_html
 
 # Only these start a new top-level section (כותרת משנה). Do NOT use generic hints
 # like 'power' or 'barbell' so lines like "6 Power Snatch @ 60/42.5kg" stay content.
@@ -40,18 +39,6 @@ SUB_TITLE_ALSO = re.compile(
 )
 
 
-def _is_first_level_header(line):
-    """True only if line is exactly or starts with a known section title (e.g. Strength:, Met Con:)."""
-    s = (line or '').strip()
-    if not s or len(s) > 70:
-        return False
-    lo = s.lower()
-    for h in FIRST_LEVEL_HEADERS:
-        if lo == h or lo.startswith(h + ':') or lo.startswith(h + ' '):
-            return True
-    return False
-
-
 def _normalize_section_title(raw):
     """Display: Strength, METCON (חובר), WOD. Met Con → METCON."""
     lo = (raw or '').strip().lower()
@@ -75,149 +62,145 @@ def _is_sub_title_line(line):
     return bool(SUB_TITLE_PATTERN.match(s) or SUB_TITLE_ALSO.match(s))
 
 
-def _is_note_line(line):
-    """הערה: משקל/אופציה/הנחיה – למשל 16/24kg KB, so do 4 STOH..., rx+ option."""
-    s = (line or '').strip()
-    if not s or len(s) > 120:
-        return False
-    lo = s.lower()
-    if re.search(r'\d+/\d+\s*kg', lo) or re.search(r'\d+\s*kg\b', lo):
-        return True
-    if ' so do ' in lo or ' so do' in lo or 'option:' in lo or 'rx+' in lo or 'rx:' in lo:
-        return True
-    return False
+# הערה: משקל/אופציה/הנחיה – למשל 16/24kg KB, so do 4 STOH..., rx+ option
+NOTE_PATTERN = r'\d+/\d+\s*kg|\d+\s*kg\b| so do|option:|rx\+|rx:'
+
+# Parse flat lines into sections like 1013:
+# - A line that is exactly / starts with a FIRST_LEVEL_HEADERS title ("Strength", "Met Con:") starts
+#   a section; content until the next header. Never exercise lines ("6 Power Snatch @ 60/42.5kg").
+# - METCON/WOD: the first line after the title is always the sub_title (תת כותרת משנה).
+# - Lines before the first header (e.g. Open workout day) → one WORKOUT section.
+parse_sections = Sectionizer(SectionRules(
+    header=r'(?:%s)(?::| |\Z)' % '|'.join(re.escape(h) for h in FIRST_LEVEL_HEADERS),
+    header_max_len=70,
+    title=_normalize_section_title,
+    sub_title_after=frozenset({'METCON', 'WOD'}),
+    notes=NOTE_PATTERN, note_max_len=120, prelude_notes=False,
+    keep_empty=True,
+))
+
+
+WOD_URL = "https://crossfittonbridge.co.uk/wod/"
+# Stream stop: this many dated articles in a row older than the window (pinned posts sit on top)
+OLD_STREAK = 3
+# WordPress: REST posts for the window, then the RSS feed; post titles are the WOD dates
+ENDPOINTS = (
+    Endpoint('wp', 'https://crossfittonbridge.co.uk', key='title'),
+    Endpoint('feed', 'https://crossfittonbridge.co.uk/feed/', key='title'),
+)
+
+# Date → article index of the WOD list page; built once per run (see listing.py)
+_tonbridge_index = None
+
 
+def _article_title(article):
+    h2 = article.find('h2', class_='blog-shortcode-post-title')
+    return h2.get_text(' ', strip=True) if h2 else None
 
-def parse_sections(lines):
+
+def _post_article(post):
+    """Structured-endpoint post → the WOD page's <article> shape (title h2 + content container)."""
+    soup = BeautifulSoup(
+        f'<article class="fusion-post-medium"><h2 class="blog-shortcode-post-title">{escape(post.title)}</h2>'
+        f'<div class="fusion-post-content-container">{post.html}</div></article>', 'lxml')
+    return soup.article
+
+
+def ensure_index(date=None):
     """
-    Parse flat lines into sections like 1013:
-    - First line that looks like "Strength" or "Strength:" = section 1 title; content until next header.
-    - "Met Con" or "Met Con:" = section 2 title. If the first content line is "X Rounds For Time:" etc.
-      → that line is sub_title (תת כותרת משנה), rest are lines.
-    - Never treat exercise lines (e.g. "6 Power Snatch @ 60/42.5kg") as section headers.
+    Index the WOD posts by date once per run: WP REST / feed window first (endpoints.py),
+    else the centralized WOD page – streamed, up to the oldest day of the window. None on failure.
     """
-    sections = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        if not _is_first_level_header(line):
-            if not sections:
-                # First block with no header (e.g. Open workout day) → one section
-                section_lines = []
-                while i < len(lines) and not _is_first_level_header(lines[i]):
-                    section_lines.append(lines[i])
-                    i += 1
-                if section_lines:
-                    sections.append({'title': 'WORKOUT', 'lines': section_lines})
-                continue
-            i += 1
-            continue
-        title = _normalize_section_title(line)
-        i += 1
-        section_lines = []
-        sub_title = None
-        while i < len(lines) and not _is_first_level_header(lines[i]):
-            section_lines.append(lines[i])
-            i += 1
-        # METCON/WOD: השורה הראשונה אחרי הכותרת תמיד תת כותרת (תת כותרת משנה)
-        if title in ('METCON', 'WOD') and section_lines:
-            sub_title = section_lines[0].strip()
-            section_lines = section_lines[1:]
-        # הערות: שורות משקל/אופציה/הנחיה → מקדימים *
-        section_lines = [("* " + ln.strip()) if _is_note_line(ln) else ln for ln in section_lines]
-        if sub_title is not None:
-            sections.append({'title': title, 'sub_title': sub_title, 'lines': section_lines})
-        else:
-            sections.append({'title': title, 'lines': section_lines})
-    if not sections:
-        return [{'title': 'WORKOUT', 'lines': lines}]
-    return sections
+    global _tonbridge_index
+    if _tonbridge_index is not None:
+        return _tonbridge_index
+    posts = window_posts('tonbridge', ENDPOINTS, date or datetime.now())
+    if posts is not None:
+        index = ListingIndex('tonbridge', _article_title)
+        index.add_page(_post_article(p) for p in posts.values())
+        print(f"    -> Indexed {len(index)} dates from the structured endpoint")
+        _tonbridge_index = index
+        return index
+    # Newest first: stream the page and stop after OLD_STREAK dated articles in a row older than
+    # the window (a sticky / pinned old post at the top does not end it; undated ones don't count)
+    until = ((date or datetime.now()) - timedelta(days=WINDOW_DAYS - 1)).strftime('%Y-%m-%d')
+    articles = []
+    old = [0]
+
+    def on_article(el):
+        if 'fusion-post-medium' not in (el.get('class') or '').split():
+            return False
+        article = BeautifulSoup(to_html(el), 'lxml').article
+        articles.append(article)
+        d = parse_date(_article_title(article))
+        if d is not None:
+            old[0] = old[0] + 1 if d < until else 0
+        return old[0] >= OLD_STREAK
+
+    print(f"    -> Streaming {WOD_URL} (until {until})")
+    stats = stream_elements(WOD_URL, 'article', on_article)
+    if stats.status != 200:
+        print(f"    -> HTTP {stats.status}")
+        return None
+    index = ListingIndex('tonbridge', _article_title)
+    index.add_page(articles)
+    print(f"    -> Indexed {len(index)} dates from {len(articles)} articles"
+          + (f" ({len(index.unmatched)} without a date)" if index.unmatched else "")
+          + f"; read {stats.bytes // 1024} KB" + (", stopped early" if stats.stopped else ""))
+    _tonbridge_index = index
+    return index
 
 
 def fetch_workout(date):
     """
     Fetch workout from centralized WOD page.
-    Strategy: Find the article with matching date, then extract ONLY post-content div
+    Strategy: look the date up in the page's article index, then extract ONLY post-content div
     """
     date_str = date.strftime('%Y-%m-%d')
-    url = "https://crossfittonbridge.co.uk/wod/"
 
     try:
-        print(f"    -> Fetching {url}")
-        r = requests.get(url, timeout=15, headers=HEADERS)
+        index = ensure_index(date)
+        if index is None:
+            return None
 
-        if r.status_code != 200:
-            print(f"    -> HTTP {r.status_code}")
+        article = index.get(date_str)
+        if article is None:
+            print(f"    -> Date {date_str} not found")
             return None
+        print(f"    -> Matched article: {_article_title(article)}")
 
-        soup = BeautifulSoup(r.content, 'lxml')
-        
-        # Build target date pattern
-        day_name = date.strftime('%A')  # Monday, Tuesday, etc.
-        day_num = date.day
-        month_name = date.strftime('%B')  # February, March, etc.
-        
-        # Ordinal suffix
-        if 10 <= day_num % 100 <= 20:
-            suffix = 'th'
-        else:
-            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(day_num % 10, 'th')
-        
-        # Target: "Monday 16th February 2026"
-        target_pattern = f"{day_name} {day_num}{suffix} {month_name}"
-        print(f"    -> Looking for: '{target_pattern}'")
-        
-        # Find all articles
-        articles = soup.find_all('article', class_='fusion-post-medium')
-        print(f"    -> Found {len(articles)} articles")
-        
-        for article in articles:
-            # Check title - EXACT class
-            h2 = article.find('h2', class_='blog-shortcode-post-title')
-            if not h2:
-                continue
-            
-            title_text = h2.get_text(strip=True)
-            
-            # Match date
-            if target_pattern.lower() in title_text.lower():
-                print(f"    -> Matched article: {title_text}")
-                
-                # Extract ONLY fusion-post-content-container div
-                content_div = article.find('div', class_='fusion-post-content-container')
-                if not content_div:
-                    print(f"    -> No fusion-post-content-container div found")
-                    continue
-                
-                # Get all <p> tags
-                workout_lines = []
-                for p in content_div.find_all('p'):
-                    text = p.get_text(strip=True)
-                    # Skip empty or &nbsp;
-                    if text and text != '\xa0' and text != ' ':
-                        workout_lines.append(text)
-                
-                if not workout_lines:
-                    print(f"    -> No workout content")
-                    return None
-                
-                print(f"    -> Extracted {len(workout_lines)} lines")
-                
-                # Parse into sections
-                sections = parse_sections(workout_lines)
-                total = sum(len(s['lines']) for s in sections)
-                print(f"    -> SUCCESS: {len(sections)} sections, {total} lines")
-                
-                return {
-                    'date':        date_str,
-                    'source':      'tonbridge',
-                    'source_name': 'CrossFit TonBridge',
-                    'url':         url,
-                    'sections':    sections,
-                }
-        
-        print(f"    -> Date {date_str} not found")
-        return None
+        # Extract ONLY fusion-post-content-container div
+        content_div = article.find('div', class_='fusion-post-content-container')
+        if not content_div:
+            print(f"    -> No fusion-post-content-container div found")
+            return None
+
+        # Get all <p> tags
+        workout_lines = []
+        for p in content_div.find_all('p'):
+            text = p.get_text(strip=True)
+            # Skip empty or &nbsp;
+            if text and text != '\xa0' and text != ' ':
+                workout_lines.append(text)
+
+        if not workout_lines:
+            print(f"    -> No workout content")
+            return None
+
+        print(f"    -> Extracted {len(workout_lines)} lines")
+
+        # Parse into sections
+        sections = parse_sections(workout_lines)
+        total = sum(len(s['lines']) for s in sections)
+        print(f"    -> SUCCESS: {len(sections)} sections, {total} lines")
+
+        return {
+            'date':        date_str,
+            'source':      'tonbridge',
+            'source_name': 'CrossFit TonBridge',
+            'url':         WOD_URL,
+            'sections':    sections,
+        }
 
     except requests.Timeout:
         print(f"    -> Timeout")
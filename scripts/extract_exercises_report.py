@@ -6,8 +6,15 @@ Produces: EXERCISES_AND_SOURCES.md with categories, unknowns, and per-source WOD
 import json
 import re
 import os
+import sys
 from collections import defaultdict
 
+# Section roles: the classifier the fetcher stores as `role` (same rules as sectionRole in index.html)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+from scrapers.taxonomy import section_role  # noqa: E402
+
+# Report categories – finer than the app's EQ (backend/scrapers/taxonomy.py, used for eq_mask):
+# movement groups like LUNGE / HANDSTAND / TOES TO BAR / PUSH-UP are reported on their own.
 EQ = {
     "RUN": ["run", "running", "meter", "mile", "km"],
     "BARBELL": ["barbell", "clean", "snatch", "deadlift", "squat", "press", "jerk", "thruster", "overhead squat", "power clean", "squat clean", "shoulder to overhead", "s2oh"],
@@ -30,13 +37,6 @@ EQ = {
     "BOX": ["box", "box jump", "box step", "bjo", "box jump over", "burpee box jump", "bbjo", "step up", "step-up"],
 }
 
-# Section title patterns: WOD vs warm-up vs strength (same logic as index.html WOD_SECTION_RE + extras)
-WOD_RE = re.compile(r"wod|metcon|conditioning|amrap|emom|for\s*time|workout|for time", re.I)
-WARMUP_RE = re.compile(r"warm\s*up|warm-up|mobility|general warm", re.I)
-STRENGTH_RE = re.compile(r"^strength|^skill|^oly|^weightlifting|squat\s*$|press\s*$|deadlift\s*$", re.I)
-# Open/Hero/Benchmark often have workout name as title - treat as WOD
-OPEN_HERO_BENCH_RE = re.compile(r"open\s*\d|hero|benchmark|nancy|diane|fran|grace|angie|barbara|chelsea|dallas|murph|hotshots|morrison", re.I)
-
 
 def normalize_line(line):
     if not line or not isinstance(line, str):
@@ -64,21 +64,6 @@ def categorize_line(line):
     return matched
 
 
-def section_type(source, section_title):
-    title = (section_title or "").strip().lower()
-    if OPEN_HERO_BENCH_RE.search(title) or (source in ("hero", "benchmark", "open") and title):
-        return "wod"
-    if WOD_RE.search(title):
-        return "wod"
-    if WARMUP_RE.search(title):
-        return "warmup"
-    if STRENGTH_RE.search(title):
-        return "strength"
-    if title in ("rest day", "rest"):
-        return "rest"
-    return "other"
-
-
 def main():
     base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     data_dir = os.path.join(base, "data")
@@ -102,8 +87,9 @@ def main():
     source_has_wod_separate = {}
     all_sources = set()
 
-    def process_lines(source, section_title, lines, source_name):
-        stype = section_type(source, section_title)
+    def process_lines(source, section_title, lines, source_name, role=None):
+        # role is classified once at ingest (taxonomy.section_role); older data falls back to the same classifier
+        stype = role or section_role(section_title, source)
         source_section_types[source][stype] += 1
         all_sources.add(source)
         for line in (lines or []):
@@ -124,13 +110,13 @@ def main():
             source = w.get("source") or "unknown"
             for sec in w.get("sections") or []:
                 title = sec.get("title") or ""
-                process_lines(source, title, sec.get("lines"), w.get("source_name"))
+                process_lines(source, title, sec.get("lines"), w.get("source_name"), sec.get("role"))
 
     for key in ("heroes", "benchmarks", "open"):
         source_id = "hero" if key == "heroes" else ("benchmark" if key == "benchmarks" else "open")
         for it in special.get(key) or []:
             name = it.get("name") or "WORKOUT"
-            process_lines(source_id, name, it.get("lines"), None)
+            process_lines(source_id, name, it.get("lines"), None, it.get("role"))
 
     # Can we separate WOD from rest per source?
     for src in sorted(all_sources):
@@ -192,7 +178,7 @@ def main():
         f.write("\nהערות:\n")
         f.write("- **WOD** = לב האימון (METCON, AMRAP, For Time, וכו').\n")
         f.write("- **הפרדה** = יש במבנה המקור כותרות שמבחינות בין חימום/כוח ל־WOD (למשל Warm-up, Strength, Conditioning).\n")
-        f.write("- באפליקציה משתמשים ב־`WOD_SECTION_RE` ו־`getWodOnlyText()` כדי לחשב ניקוד התאמה רק מטקסט ה־WOD.\n")
+        f.write("- כל סקשן מסווג פעם אחת ב־fetch (שדה `role`, backend/scrapers/taxonomy.py); באפליקציה `getWodOnlyText()` משתמש בו כדי לחשב ניקוד התאמה רק מטקסט ה־WOD.\n")
 
     print("Wrote", out_path)
     return 0